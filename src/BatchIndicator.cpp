@@ -0,0 +1,385 @@
+#include "BatchIndicator.h"
+#include "Indicator.h"
+
+#include <algorithm>
+#include <cmath>
+#include <limits>
+#include <thread>
+#include <vector>
+
+namespace indicators {
+namespace batch {
+
+namespace {
+
+// Paths per tile. Sixteen floats fill one AVX-512 register or two AVX ones.
+constexpr int kLanes = 16;
+constexpr float kNaN = std::numeric_limits<float>::quiet_NaN();
+
+// kLanes paths stored day-major, so one time step of every lane is
+// contiguous and the per-lane loops below vectorize. The kernels mirror the
+// single-series code in Indicator.cpp operation for operation, which keeps
+// each lane bit-identical to it.
+struct Tile {
+    int days;
+    std::vector<float> data;
+
+    explicit Tile(int days, float value = kNaN)
+        : days(days), data(static_cast<size_t>(days) * kLanes, value) {}
+
+    float* at(int day) { return data.data() + static_cast<size_t>(day) * kLanes; }
+    const float* at(int day) const {
+        return data.data() + static_cast<size_t>(day) * kLanes;
+    }
+};
+
+// Transpose rows [first, first + count) into a tile; spare lanes are zero.
+Tile load(const float* src, int days, int first, int count) {
+    Tile tile(days, 0.0f);
+    for (int l = 0; l < count; l++) {
+        const float* row = src + static_cast<size_t>(first + l) * days;
+        for (int d = 0; d < days; d++) {
+            tile.data[static_cast<size_t>(d) * kLanes + l] = row[d];
+        }
+    }
+    return tile;
+}
+
+void store(const Tile& tile, int first, int count, float* dst) {
+    int days = tile.days;
+    for (int l = 0; l < count; l++) {
+        float* row = dst + static_cast<size_t>(first + l) * days;
+        for (int d = 0; d < days; d++) {
+            row[d] = tile.data[static_cast<size_t>(d) * kLanes + l];
+        }
+    }
+}
+
+// Call fn(first, count) for consecutive blocks of `block` rows, spread
+// round-robin over the worker threads.
+template <typename Fn>
+void parallel_for(int paths, int block, int threads, Fn fn) {
+    int jobs = (paths + block - 1) / block;
+    if (threads <= 0) {
+        threads = static_cast<int>(std::thread::hardware_concurrency());
+    }
+    int workers = std::max(1, std::min(threads, jobs));
+    auto run = [&](int worker) {
+        for (int j = worker; j < jobs; j += workers) {
+            int first = j * block;
+            fn(first, std::min(block, paths - first));
+        }
+    };
+    std::vector<std::thread> pool;
+    for (int w = 1; w < workers; w++) {
+        pool.emplace_back(run, w);
+    }
+    run(0);
+    for (auto& t : pool) {
+        t.join();
+    }
+}
+
+bool has_nan(const float* row, int days) {
+    for (int d = 0; d < days; d++) {
+        if (std::isnan(row[d])) return true;
+    }
+    return false;
+}
+
+// --- Tile kernels ---
+
+Tile sma_tile(const Tile& x, int period) {
+    Tile out(x.days);
+    int n = x.days;
+    if (period <= 0 || n < period) {
+        return out;
+    }
+    float sum[kLanes] = {};
+    for (int i = 0; i < period; i++) {
+        const float* xi = x.at(i);
+        for (int l = 0; l < kLanes; l++) sum[l] += xi[l];
+    }
+    float* first = out.at(period - 1);
+    for (int l = 0; l < kLanes; l++) first[l] = sum[l] / period;
+    for (int i = period; i < n; i++) {
+        const float* xi = x.at(i);
+        const float* old = x.at(i - period);
+        float* oi = out.at(i);
+        for (int l = 0; l < kLanes; l++) {
+            sum[l] += xi[l] - old[l];
+            oi[l] = sum[l] / period;
+        }
+    }
+    return out;
+}
+
+// EMA of days [begin, n), as the single-series ema of that suffix
+Tile ema_tile(const Tile& x, int period, int begin = 0) {
+    Tile out(x.days);
+    int n = x.days;
+    if (period <= 0 || n - begin < period) {
+        return out;
+    }
+    float value[kLanes] = {};
+    for (int i = begin; i < begin + period; i++) {
+        const float* xi = x.at(i);
+        for (int l = 0; l < kLanes; l++) value[l] += xi[l];
+    }
+    float* first = out.at(begin + period - 1);
+    for (int l = 0; l < kLanes; l++) {
+        value[l] = value[l] / period;
+        first[l] = value[l];
+    }
+    float multiplier = 2.0f / (period + 1);
+    for (int i = begin + period; i < n; i++) {
+        const float* xi = x.at(i);
+        float* oi = out.at(i);
+        for (int l = 0; l < kLanes; l++) {
+            value[l] = (xi[l] - value[l]) * multiplier + value[l];
+            oi[l] = value[l];
+        }
+    }
+    return out;
+}
+
+Tile rsi_tile(const Tile& x, int period) {
+    Tile out(x.days);
+    int n = x.days;
+    if (period <= 0 || n < period + 1) {
+        return out;
+    }
+    float avgGain[kLanes] = {};
+    float avgLoss[kLanes] = {};
+    for (int i = 1; i <= period; i++) {
+        const float* xi = x.at(i);
+        const float* prev = x.at(i - 1);
+        for (int l = 0; l < kLanes; l++) {
+            float change = xi[l] - prev[l];
+            avgGain[l] += change > 0 ? change : 0.0f;
+            avgLoss[l] -= change > 0 ? 0.0f : change;
+        }
+    }
+    float* first = out.at(period);
+    for (int l = 0; l < kLanes; l++) {
+        avgGain[l] /= period;
+        avgLoss[l] /= period;
+        first[l] = avgLoss[l] == 0.0f
+                       ? 100.0f
+                       : 100.0f - 100.0f / (1.0f + avgGain[l] / avgLoss[l]);
+    }
+    for (int i = period + 1; i < n; i++) {
+        const float* xi = x.at(i);
+        const float* prev = x.at(i - 1);
+        float* oi = out.at(i);
+        for (int l = 0; l < kLanes; l++) {
+            float change = xi[l] - prev[l];
+            float gain = change > 0 ? change : 0.0f;
+            float loss = change < 0 ? -change : 0.0f;
+            avgGain[l] = (avgGain[l] * (period - 1) + gain) / period;
+            avgLoss[l] = (avgLoss[l] * (period - 1) + loss) / period;
+            oi[l] = avgLoss[l] == 0.0f
+                        ? 100.0f
+                        : 100.0f - 100.0f / (1.0f + avgGain[l] / avgLoss[l]);
+        }
+    }
+    return out;
+}
+
+Tile atr_tile(const Tile& buy, const Tile& sell, int period) {
+    Tile out(buy.days);
+    int n = buy.days;
+    if (period <= 0 || n < period + 1) {
+        return out;
+    }
+    Tile tr(n, 0.0f);
+    for (int l = 0; l < kLanes; l++) tr.at(0)[l] = buy.at(0)[l] - sell.at(0)[l];
+    for (int i = 1; i < n; i++) {
+        const float* b = buy.at(i);
+        const float* s = sell.at(i);
+        const float* prevSell = sell.at(i - 1);
+        float* t = tr.at(i);
+        for (int l = 0; l < kLanes; l++) {
+            // Same tie and NaN behaviour as std::max({...})
+            float range = b[l] - s[l];
+            float highPrevClose = std::abs(b[l] - prevSell[l]);
+            float lowPrevClose = std::abs(s[l] - prevSell[l]);
+            if (range < highPrevClose) range = highPrevClose;
+            if (range < lowPrevClose) range = lowPrevClose;
+            t[l] = range;
+        }
+    }
+    float value[kLanes] = {};
+    for (int i = 0; i < period; i++) {
+        const float* t = tr.at(i);
+        for (int l = 0; l < kLanes; l++) value[l] += t[l];
+    }
+    float* first = out.at(period - 1);
+    for (int l = 0; l < kLanes; l++) {
+        value[l] /= period;
+        first[l] = value[l];
+    }
+    for (int i = period; i < n; i++) {
+        const float* t = tr.at(i);
+        float* oi = out.at(i);
+        for (int l = 0; l < kLanes; l++) {
+            value[l] = (value[l] * (period - 1) + t[l]) / period;
+            oi[l] = value[l];
+        }
+    }
+    return out;
+}
+
+// Apply a single-series indicator to each row; for the deque-based kernels
+// and for rows the lockstep path cannot reproduce exactly.
+template <typename Fn>
+void for_each_row(const float* src, int days, int first, int count, Fn fn) {
+    for (int p = first; p < first + count; p++) {
+        const float* row = src + static_cast<size_t>(p) * days;
+        fn(p, std::vector<float>(row, row + days));
+    }
+}
+
+void copy_row(const std::vector<float>& values, int path, float* dst) {
+    std::copy(values.begin(), values.end(),
+              dst + static_cast<size_t>(path) * values.size());
+}
+
+} // namespace
+
+void sma(const float* prices, int paths, int days, int period, float* out,
+         int threads) {
+    parallel_for(paths, kLanes, threads, [&](int first, int count) {
+        store(sma_tile(load(prices, days, first, count), period), first, count, out);
+    });
+}
+
+void ema(const float* prices, int paths, int days, int period, float* out,
+         int threads) {
+    parallel_for(paths, kLanes, threads, [&](int first, int count) {
+        store(ema_tile(load(prices, days, first, count), period), first, count, out);
+    });
+}
+
+void rsi(const float* prices, int paths, int days, int period, float* out,
+         int threads) {
+    parallel_for(paths, kLanes, threads, [&](int first, int count) {
+        store(rsi_tile(load(prices, days, first, count), period), first, count, out);
+    });
+}
+
+void macd(const float* prices, int paths, int days, int fast, int slow,
+          int signal, float* line, float* signal_line, float* histogram,
+          int threads) {
+    parallel_for(paths, kLanes, threads, [&](int first, int count) {
+        Tile x = load(prices, days, first, count);
+        Tile macdLine(days), signalLine(days), hist(days);
+        int warmup = std::max(fast, slow);
+        if (fast > 0 && slow > 0 && days >= warmup) {
+            Tile fastEma = ema_tile(x, fast);
+            Tile slowEma = ema_tile(x, slow);
+            for (int i = warmup - 1; i < days; i++) {
+                for (int l = 0; l < kLanes; l++) {
+                    macdLine.at(i)[l] = fastEma.at(i)[l] - slowEma.at(i)[l];
+                }
+            }
+            // The line has no gaps after warm-up, so its signal EMA is the
+            // EMA of the suffix starting there
+            signalLine = ema_tile(macdLine, signal, warmup - 1);
+            for (int i = 0; i < days; i++) {
+                for (int l = 0; l < kLanes; l++) {
+                    hist.at(i)[l] = macdLine.at(i)[l] - signalLine.at(i)[l];
+                }
+            }
+        }
+        store(macdLine, first, count, line);
+        store(signalLine, first, count, signal_line);
+        store(hist, first, count, histogram);
+        // NaN prices leave gaps in the line, which the single-series signal
+        // EMA skips over; defer to it for those rows
+        for_each_row(prices, days, first, count,
+                     [&](int p, const std::vector<float>& row) {
+            if (!has_nan(row.data(), days)) return;
+            auto result = indicators::macd(row, fast, slow, signal);
+            copy_row(result.macd_line, p, line);
+            copy_row(result.signal_line, p, signal_line);
+            copy_row(result.histogram, p, histogram);
+        });
+    });
+}
+
+void bollinger(const float* prices, int paths, int days, int period,
+               float std_dev, float* upper, float* middle, float* lower,
+               int threads) {
+    parallel_for(paths, kLanes, threads, [&](int first, int count) {
+        Tile x = load(prices, days, first, count);
+        Tile mid = sma_tile(x, period);
+        Tile up(days), low(days);
+        for (int i = period - 1; period > 0 && i < days; i++) {
+            float sum[kLanes] = {};
+            const float* m = mid.at(i);
+            for (int j = i - period + 1; j <= i; j++) {
+                const float* xj = x.at(j);
+                for (int l = 0; l < kLanes; l++) {
+                    float diff = xj[l] - m[l];
+                    sum[l] += diff * diff;
+                }
+            }
+            for (int l = 0; l < kLanes; l++) {
+                float sd = std::sqrt(sum[l] / period);
+                up.at(i)[l] = m[l] + std_dev * sd;
+                low.at(i)[l] = m[l] - std_dev * sd;
+            }
+        }
+        store(up, first, count, upper);
+        store(mid, first, count, middle);
+        store(low, first, count, lower);
+    });
+}
+
+void atr(const float* buy_prices, const float* sell_prices, int paths,
+         int days, int period, float* out, int threads) {
+    parallel_for(paths, kLanes, threads, [&](int first, int count) {
+        Tile buy = load(buy_prices, days, first, count);
+        Tile sell = load(sell_prices, days, first, count);
+        store(atr_tile(buy, sell, period), first, count, out);
+    });
+}
+
+void donchian(const float* prices, int paths, int days, int period,
+              float* upper, float* middle, float* lower, int threads) {
+    parallel_for(paths, kLanes, threads, [&](int first, int count) {
+        for_each_row(prices, days, first, count,
+                     [&](int p, const std::vector<float>& row) {
+            auto result = indicators::donchian(row, period);
+            copy_row(result.upper, p, upper);
+            copy_row(result.middle, p, middle);
+            copy_row(result.lower, p, lower);
+        });
+    });
+}
+
+void stochastic(const float* prices, int paths, int days, int k_period,
+                int d_period, float* k, float* d, int threads) {
+    parallel_for(paths, kLanes, threads, [&](int first, int count) {
+        for_each_row(prices, days, first, count,
+                     [&](int p, const std::vector<float>& row) {
+            auto result = indicators::stochastic(row, k_period, d_period);
+            copy_row(result.k, p, k);
+            copy_row(result.d, p, d);
+        });
+    });
+}
+
+void williams_r(const float* prices, int paths, int days, int period,
+                float* out, int threads) {
+    parallel_for(paths, kLanes, threads, [&](int first, int count) {
+        for_each_row(prices, days, first, count,
+                     [&](int p, const std::vector<float>& row) {
+            copy_row(indicators::williams_r(row, period), p, out);
+        });
+    });
+}
+
+} // namespace batch
+} // namespace indicators
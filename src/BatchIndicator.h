@@ -0,0 +1,39 @@
+#pragma once
+
+// Indicators over many paths at once. Inputs and outputs are row-major
+// (paths, days) matrices. The recurrences (SMA, EMA, RSI, MACD, Bollinger,
+// ATR) run in lockstep across paths: rows are transposed in tiles so that
+// each time step updates a contiguous block of lanes, which the compiler
+// vectorizes. The rolling-extremum indicators keep a deque per series and
+// are computed row by row instead. Tiles or rows are spread over `threads`
+// worker threads (0 means one per hardware thread).
+//
+// Every row of the output equals the single-series indicator from
+// Indicator.h applied to that row, including where warm-up NaNs fall.
+namespace indicators {
+namespace batch {
+
+void sma(const float* prices, int paths, int days, int period, float* out,
+         int threads = 0);
+void ema(const float* prices, int paths, int days, int period, float* out,
+         int threads = 0);
+void rsi(const float* prices, int paths, int days, int period, float* out,
+         int threads = 0);
+void macd(const float* prices, int paths, int days, int fast, int slow,
+          int signal, float* line, float* signal_line, float* histogram,
+          int threads = 0);
+void bollinger(const float* prices, int paths, int days, int period,
+               float std_dev, float* upper, float* middle, float* lower,
+               int threads = 0);
+void atr(const float* buy_prices, const float* sell_prices, int paths,
+         int days, int period, float* out, int threads = 0);
+
+void donchian(const float* prices, int paths, int days, int period,
+              float* upper, float* middle, float* lower, int threads = 0);
+void stochastic(const float* prices, int paths, int days, int k_period,
+                int d_period, float* k, float* d, int threads = 0);
+void williams_r(const float* prices, int paths, int days, int period,
+                float* out, int threads = 0);
+
+} // namespace batch
+} // namespace indicators
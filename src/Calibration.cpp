@@ -0,0 +1,176 @@
+#include "Calibration.h"
+#include <cmath>
+#include <limits>
+#include <stdexcept>
+
+namespace {
+
+double logReturn(float prev, float next) {
+  if (!(prev > 0.0f) || !(next > 0.0f)) {
+    throw std::invalid_argument("Prices must be positive to fit log returns");
+  }
+  return std::log(static_cast<double>(next) / prev);
+}
+
+// --- GBM ---
+
+struct GBMStats {
+  double n = 0, s1 = 0, s2 = 0;
+
+  void add(float prev, float next, double sign = 1.0) {
+    double r = logReturn(prev, next);
+    n += sign;
+    s1 += sign * r;
+    s2 += sign * r * r;
+  }
+  void remove(float prev, float next) { add(prev, next, -1.0); }
+
+  std::vector<float> fit() const {
+    double m = s1 / n;
+    double var = std::max(0.0, s2 / n - m * m);
+    return {static_cast<float>(m + 0.5 * var),
+            static_cast<float>(std::sqrt(var))};
+  }
+};
+
+// --- MeanReversion ---
+
+struct OUStats {
+  double n = 0, sx = 0, sy = 0, sxx = 0, sxy = 0, syy = 0;
+
+  void add(float prev, float next, double sign = 1.0) {
+    double x = prev, y = next;
+    n += sign;
+    sx += sign * x;
+    sy += sign * y;
+    sxx += sign * x * x;
+    sxy += sign * x * y;
+    syy += sign * y * y;
+  }
+  void remove(float prev, float next) { add(prev, next, -1.0); }
+
+  std::vector<float> fit() const {
+    double denom = n * sxx - sx * sx;
+    double slope = denom > 0.0 ? (n * sxy - sx * sy) / denom : 1.0;
+    double intercept = (sy - slope * sx) / n;
+    double sse = syy - 2.0 * intercept * sy - 2.0 * slope * sxy +
+                 n * intercept * intercept + 2.0 * intercept * slope * sx +
+                 slope * slope * sxx;
+    double theta = 1.0 - slope;
+    // Without reversion the level is unidentified; use the sample mean
+    double mu = std::abs(theta) > 1e-9 ? intercept / theta : sy / n;
+    return {static_cast<float>(mu), static_cast<float>(theta),
+            static_cast<float>(std::sqrt(std::max(0.0, sse / n)))};
+  }
+};
+
+// --- JumpDiffusion ---
+
+struct JumpStats {
+  double n = 0, s1 = 0, s2 = 0, s3 = 0, s4 = 0;
+
+  void add(float prev, float next, double sign = 1.0) {
+    double r = logReturn(prev, next);
+    double r2 = r * r;
+    n += sign;
+    s1 += sign * r;
+    s2 += sign * r2;
+    s3 += sign * r2 * r;
+    s4 += sign * r2 * r2;
+  }
+  void remove(float prev, float next) { add(prev, next, -1.0); }
+
+  std::vector<float> fit() const {
+    double m = s1 / n;
+    double e2 = s2 / n, e3 = s3 / n, e4 = s4 / n;
+    double k2 = std::max(0.0, e2 - m * m);
+    double k3 = e3 - 3.0 * m * e2 + 2.0 * m * m * m;
+    double m4 = e4 - 4.0 * m * e3 + 6.0 * m * m * e2 - 3.0 * m * m * m * m;
+    double k4 = m4 - 3.0 * k2 * k2;
+
+    // Jumps J ~ N(k, k^2) arriving at rate lambda contribute lambda * E[J^n]
+    // to the n-th cumulant: E[J^2] = 2k^2, E[J^3] = 4k^3, E[J^4] = 10k^4.
+    if (k4 > 0.0 && std::abs(k3) > 0.0) {
+      double k = 0.4 * k4 / k3;
+      double lambda = k3 / (4.0 * k * k * k);
+      double var = k2 - 2.0 * lambda * k * k;
+      if (lambda > 0.0 && lambda <= 1.0 && var > 0.0) {
+        double drift = m - lambda * k;
+        return {static_cast<float>(drift + 0.5 * var),
+                static_cast<float>(std::sqrt(var)),
+                static_cast<float>(lambda), static_cast<float>(k)};
+      }
+    }
+    float defaultJump = regimeParamDefs("JumpDiffusion")[3].defaultValue;
+    return {static_cast<float>(m + 0.5 * k2),
+            static_cast<float>(std::sqrt(k2)), 0.0f, defaultJump};
+  }
+};
+
+template <typename Stats> int minPrices();
+template <> int minPrices<GBMStats>() { return 3; }
+template <> int minPrices<OUStats>() { return 3; }
+template <> int minPrices<JumpStats>() { return 5; }
+
+template <typename Stats>
+RollingCalibration fitRolling(const std::vector<float> &prices, int window,
+                              int step) {
+  if (window < minPrices<Stats>()) {
+    throw std::invalid_argument("Window must hold at least " +
+                                std::to_string(minPrices<Stats>()) +
+                                " prices");
+  }
+  if (step <= 0) {
+    throw std::invalid_argument("step must be positive");
+  }
+  RollingCalibration result;
+  int n = static_cast<int>(prices.size());
+  if (n < window) {
+    return result;
+  }
+  // Stats cover the pairs (t - 1, t) for t in (end - window, end]
+  Stats stats;
+  for (int t = 1; t < window; t++) {
+    stats.add(prices[t - 1], prices[t]);
+  }
+  for (int end = window - 1;;) {
+    result.windowEnds.push_back(end);
+    std::vector<float> row = stats.fit();
+    result.params.insert(result.params.end(), row.begin(), row.end());
+    if (end + step >= n) {
+      break;
+    }
+    for (int s = 0; s < step; s++) {
+      end++;
+      stats.add(prices[end - 1], prices[end]);
+      stats.remove(prices[end - window], prices[end - window + 1]);
+    }
+  }
+  return result;
+}
+
+} // namespace
+
+RegimeSpec calibrate(const std::vector<float> &prices,
+                     const std::string &type) {
+  RollingCalibration fit =
+      calibrateRolling(prices, type, static_cast<int>(prices.size()));
+  if (fit.windowEnds.empty()) {
+    throw std::invalid_argument("Too few prices to calibrate " + type);
+  }
+  return {type, fit.params};
+}
+
+RollingCalibration calibrateRolling(const std::vector<float> &prices,
+                                    const std::string &type, int window,
+                                    int step) {
+  if (type == "GBM")
+    return fitRolling<GBMStats>(prices, window, step);
+  if (type == "MeanReversion")
+    return fitRolling<OUStats>(prices, window, step);
+  if (type == "JumpDiffusion")
+    return fitRolling<JumpStats>(prices, window, step);
+  throw std::invalid_argument(
+      "Calibration supports GBM, MeanReversion and JumpDiffusion, not " +
+      type);
+}
@@ -0,0 +1,33 @@
+#pragma once
+#include "Regime.h"
+#include <string>
+#include <vector>
+
+// Parameter estimation for regimes from an observed price series, with dt = 1
+// day as in the simulation. Each model keeps running sufficient statistics
+// over consecutive price pairs, so a rolling window is updated in O(1) per
+// step by adding the newest pair and removing the oldest.
+//
+//   GBM:           closed-form MLE from the mean and variance of log returns.
+//   MeanReversion: conditional MLE of the discrete OU update, i.e. OLS of
+//                  x[t+1] on x[t]: theta = 1 - slope, mu = intercept / theta.
+//   JumpDiffusion: method of moments on the first four cumulants of log
+//                  returns, treating jumps as compound Poisson with
+//                  log(1 + J) ~ J ~ N(k, k^2); falls back to pure diffusion
+//                  (jump_intensity = 0) when the sample shows no jump
+//                  signature.
+
+// Fit a regime of the given type ("GBM", "MeanReversion", "JumpDiffusion").
+// Throws std::invalid_argument for other types, too few prices, or
+// non-positive prices where log returns are needed.
+RegimeSpec calibrate(const std::vector<float> &prices, const std::string &type);
+
+struct RollingCalibration {
+  std::vector<int> windowEnds; // index of the last price in each window
+  std::vector<float> params;   // row-major (windows, regimeParamDefs(type))
+};
+
+// Fit every window of `window` consecutive prices, advancing by `step`.
+RollingCalibration calibrateRolling(const std::vector<float> &prices,
+                                    const std::string &type, int window,
+                                    int step = 1);
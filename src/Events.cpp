@@ -0,0 +1,79 @@
+#include "Events.h"
+
+#include <algorithm>
+#include <cmath>
+#include <vector>
+
+namespace events {
+
+namespace {
+
+// Crossings of the sign of diff(i), for days 1..count-1.
+template <typename Diff>
+std::vector<int> sign_changes(size_t count, Diff diff, Direction direction) {
+    std::vector<int> days;
+    if (count < 2) {
+        return days;
+    }
+    float prev = diff(0);
+    for (size_t i = 1; i < count; i++) {
+        float cur = diff(i);
+        if (!std::isnan(prev) && !std::isnan(cur)) {
+            bool up = prev <= 0.0f && cur > 0.0f;
+            bool down = prev >= 0.0f && cur < 0.0f;
+            if ((up && direction != Direction::Down) ||
+                (down && direction != Direction::Up)) {
+                days.push_back(static_cast<int>(i));
+            }
+        }
+        prev = cur;
+    }
+    return days;
+}
+
+} // namespace
+
+std::vector<int> crossings(const std::vector<float>& a,
+                           const std::vector<float>& b, Direction direction) {
+    size_t count = std::min(a.size(), b.size());
+    return sign_changes(count, [&](size_t i) { return a[i] - b[i]; },
+                        direction);
+}
+
+std::vector<int> crossings(const std::vector<float>& a, float level,
+                           Direction direction) {
+    return sign_changes(a.size(), [&](size_t i) { return a[i] - level; },
+                        direction);
+}
+
+std::vector<int> outside(const std::vector<float>& values,
+                         const std::vector<float>& upper,
+                         const std::vector<float>& lower, Direction direction) {
+    std::vector<int> days;
+    size_t count = std::min({values.size(), upper.size(), lower.size()});
+    for (size_t i = 0; i < count; i++) {
+        // Comparisons with NaN are false
+        bool above = direction != Direction::Down && values[i] > upper[i];
+        bool below = direction != Direction::Up && values[i] < lower[i];
+        if (above || below) {
+            days.push_back(static_cast<int>(i));
+        }
+    }
+    return days;
+}
+
+std::vector<int> between(const std::vector<int>& days, int start, int end) {
+    auto first = std::lower_bound(days.begin(), days.end(), start);
+    auto last = std::lower_bound(first, days.end(), end);
+    return std::vector<int>(first, last);
+}
+
+std::optional<int> next_after(const std::vector<int>& days, int day, int end) {
+    auto it = std::upper_bound(days.begin(), days.end(), day);
+    if (it == days.end() || *it >= end) {
+        return std::nullopt;
+    }
+    return *it;
+}
+
+} // namespace events
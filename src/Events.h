@@ -0,0 +1,32 @@
+#pragma once
+#include <optional>
+#include <vector>
+
+// Signal events on day-indexed series. Detectors scan full series once and
+// return the sorted days on which a condition holds; the queries then
+// binary-search that list, so a lookup costs O(log n + k) for k results.
+namespace events {
+
+enum class Direction { Up, Down, Either };
+
+// Days i on which `a` crosses `b`: Up when a[i-1] <= b[i-1] and a[i] > b[i],
+// Down when a[i-1] >= b[i-1] and a[i] < b[i]. Days where either series is
+// NaN on i-1 or i are skipped.
+std::vector<int> crossings(const std::vector<float>& a,
+                           const std::vector<float>& b, Direction direction);
+// Crossings of a constant level.
+std::vector<int> crossings(const std::vector<float>& a, float level,
+                           Direction direction);
+
+// Days on which values are above `upper` (Up), below `lower` (Down) or
+// either. NaN bands never match.
+std::vector<int> outside(const std::vector<float>& values,
+                         const std::vector<float>& upper,
+                         const std::vector<float>& lower, Direction direction);
+
+// Event days in [start, end), from a sorted list.
+std::vector<int> between(const std::vector<int>& days, int start, int end);
+// First event day strictly after `day` and before `end`, if any.
+std::optional<int> next_after(const std::vector<int>& days, int day, int end);
+
+} // namespace events
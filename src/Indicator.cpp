@@ -2,6 +2,7 @@
 
 #include <algorithm>
 #include <cmath>
+#include <deque>
 #include <limits>
 #include <vector>
 
@@ -148,4 +149,94 @@ std::vector<float> atr(const std::vector<float>& buy_prices,
     return result;
 }
 
+namespace {
+
+// Shared monotonic-deque sweep: `dominates(a, b)` is true when a value a
+// makes an older value b irrelevant (a <= b for minima, a >= b for maxima).
+template <typename Dominates>
+std::vector<float> rolling_extreme(const std::vector<float>& prices, int period,
+                                   Dominates dominates) {
+    int n = static_cast<int>(prices.size());
+    std::vector<float> result(n, std::numeric_limits<float>::quiet_NaN());
+    if (period <= 0 || n < period) {
+        return result;
+    }
+    std::deque<int> window;
+    for (int i = 0; i < n; i++) {
+        while (!window.empty() && dominates(prices[i], prices[window.back()])) {
+            window.pop_back();
+        }
+        window.push_back(i);
+        if (window.front() <= i - period) {
+            window.pop_front();
+        }
+        if (i >= period - 1) {
+            result[i] = prices[window.front()];
+        }
+    }
+    return result;
+}
+
+} // namespace
+
+std::vector<float> rolling_min(const std::vector<float>& prices, int period) {
+    return rolling_extreme(prices, period, [](float a, float b) { return a <= b; });
+}
+
+std::vector<float> rolling_max(const std::vector<float>& prices, int period) {
+    return rolling_extreme(prices, period, [](float a, float b) { return a >= b; });
+}
+
+DonchianResult donchian(const std::vector<float>& prices, int period) {
+    int n = static_cast<int>(prices.size());
+    auto upper = rolling_max(prices, period);
+    auto lower = rolling_min(prices, period);
+    std::vector<float> middle(n, std::numeric_limits<float>::quiet_NaN());
+    for (int i = 0; i < n; i++) {
+        if (!std::isnan(upper[i])) {
+            middle[i] = (upper[i] + lower[i]) / 2.0f;
+        }
+    }
+    return {upper, middle, lower};
+}
+
+StochasticResult stochastic(const std::vector<float>& prices, int k_period, int d_period) {
+    int n = static_cast<int>(prices.size());
+    auto highest = rolling_max(prices, k_period);
+    auto lowest = rolling_min(prices, k_period);
+    std::vector<float> k(n, std::numeric_limits<float>::quiet_NaN());
+    for (int i = 0; i < n; i++) {
+        if (std::isnan(highest[i])) continue;
+        float range = highest[i] - lowest[i];
+        // A flat window has no position within its range; report the midpoint
+        k[i] = range > 0.0f ? 100.0f * ((prices[i] - lowest[i]) / range) : 50.0f;
+    }
+    // %D is the SMA of the valid %K values
+    std::vector<float> d(n, std::numeric_limits<float>::quiet_NaN());
+    if (k_period > 0 && n >= k_period) {
+        std::vector<float> kValid(k.begin() + (k_period - 1), k.end());
+        auto dValid = sma(kValid, d_period);
+        for (size_t i = 0; i < dValid.size(); i++) {
+            // The running-sum SMA can drift a hair outside [0, 100]
+            if (!std::isnan(dValid[i])) {
+                d[k_period - 1 + i] = std::clamp(dValid[i], 0.0f, 100.0f);
+            }
+        }
+    }
+    return {k, d};
+}
+
+std::vector<float> williams_r(const std::vector<float>& prices, int period) {
+    int n = static_cast<int>(prices.size());
+    auto highest = rolling_max(prices, period);
+    auto lowest = rolling_min(prices, period);
+    std::vector<float> result(n, std::numeric_limits<float>::quiet_NaN());
+    for (int i = 0; i < n; i++) {
+        if (std::isnan(highest[i])) continue;
+        float range = highest[i] - lowest[i];
+        result[i] = range > 0.0f ? -100.0f * ((highest[i] - prices[i]) / range) : -50.0f;
+    }
+    return result;
+}
+
 } // namespace indicators
@@ -26,4 +26,23 @@ BollingerResult bollinger(const std::vector<float>& prices, int period, float st
 std::vector<float> atr(const std::vector<float>& buy_prices,
                        const std::vector<float>& sell_prices, int period);
 
+// Rolling extrema over the trailing `period` values, O(n) via monotonic deques
+std::vector<float> rolling_min(const std::vector<float>& prices, int period);
+std::vector<float> rolling_max(const std::vector<float>& prices, int period);
+
+struct DonchianResult {
+    std::vector<float> upper;
+    std::vector<float> middle;
+    std::vector<float> lower;
+};
+DonchianResult donchian(const std::vector<float>& prices, int period);
+
+struct StochasticResult {
+    std::vector<float> k;
+    std::vector<float> d;
+};
+StochasticResult stochastic(const std::vector<float>& prices, int k_period, int d_period);
+
+std::vector<float> williams_r(const std::vector<float>& prices, int period);
+
 } // namespace indicators
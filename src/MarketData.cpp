@@ -1,6 +1,7 @@
 #include "MarketData.h"
+#include "Events.h"
+#include "Simulation.h"
 #include <algorithm>
-#include <chrono>
 #include <cmath>
 #include <cstdio>
 #include <functional>
@@ -8,113 +9,181 @@
 
 MarketData::MarketData(float startBuyPrice, float startSellPrice,
                        std::vector<RegimeAssignment> regimes,
-                       std::optional<unsigned int> seed) {
-  if (seed.has_value()) {
-    rng.seed(seed.value());
-  } else {
-    rng.seed(static_cast<unsigned int>(
-        std::chrono::steady_clock::now().time_since_epoch().count()));
-  }
-
-  totalDays = 0;
-  for (const auto &assignment : regimes) {
-    if (assignment.endDay > totalDays) {
-      totalDays = assignment.endDay;
-    }
-  }
+                       std::optional<unsigned int> seed,
+                       std::optional<SpreadModel> spread, bool lean)
+    : store(std::make_shared<Store>()) {
+  Store &s = *store;
+  s.spread = spread;
+  s.lean = lean;
+
+  // The assignments keep the regimes alive while prices are computed; no
+  // per-day schedule is retained afterwards.
+  RegimeTimeline timeline(regimes);
+  int totalDays = timeline.getTotalDays();
+  s.totalDays = totalDays;
+  revealedDay = totalDays;
 
-  dayRegimes.resize(totalDays, nullptr);
-  for (const auto &assignment : regimes) {
-    for (int d = assignment.startDay; d < assignment.endDay; d++) {
-      dayRegimes[d] = assignment.regime;
+  s.buyPrices.resize(totalDays + 1);
+  s.sellPrices.resize(totalDays + 1);
+  s.buyPrices[0] = startBuyPrice;
+  s.sellPrices[0] = startSellPrice;
+  RandomSource rng(std::mt19937(resolveSeed(seed)));
+  simulateDays(timeline, rng, s.buyPrices.data(), s.sellPrices.data(),
+               spread);
+
+  // Compute mid prices
+  if (!lean) {
+    s.midPrices.resize(s.buyPrices.size());
+    for (size_t i = 0; i < s.buyPrices.size(); i++) {
+      s.midPrices[i] = (s.buyPrices[i] + s.sellPrices[i]) / 2.0f;
     }
   }
+}
 
-  buyPrices.push_back(startBuyPrice);
-  sellPrices.push_back(startSellPrice);
+MarketData::MarketData(float startBuyPrice, float startSellPrice,
+                       const Scenario &scenario,
+                       std::optional<unsigned int> seed,
+                       std::optional<SpreadModel> spread, bool lean)
+    : MarketData(startBuyPrice, startSellPrice, scenario.instantiate(), seed,
+                 spread, lean) {}
 
-  computePrices();
+// --- Sessions ---
 
-  // Compute mid prices
-  midPrices.resize(buyPrices.size());
-  for (size_t i = 0; i < buyPrices.size(); i++) {
-    midPrices[i] = (buyPrices[i] + sellPrices[i]) / 2.0f;
-  }
-}
-
-void MarketData::computePrices() {
-  for (int i = 0; i < totalDays; i++) {
-    if (dayRegimes[i]) {
-      dayRegimes[i]->setDayIndex(i);
-      float newBuy = dayRegimes[i]->update(buyPrices.back(), rng);
-      float newSell = dayRegimes[i]->update(sellPrices.back(), rng);
-      // Enforce ask >= bid (buy price >= sell price)
-      if (newSell > newBuy) {
-        std::swap(newBuy, newSell);
-      }
-      buyPrices.push_back(newBuy);
-      sellPrices.push_back(newSell);
-    } else {
-      buyPrices.push_back(buyPrices.back());
-      sellPrices.push_back(sellPrices.back());
-    }
+MarketData MarketData::session(int revealedDay) const {
+  if (revealedDay < 0 || revealedDay > store->totalDays) {
+    throw std::invalid_argument("Revealed day must be in [0, total days]");
   }
+  MarketData view(*this);
+  view.revealedDay = revealedDay;
+  return view;
 }
 
-std::vector<float> MarketData::getBuyPrices(int start, int end) {
-  if (end == -1) {
-    end = static_cast<int>(buyPrices.size());
+void MarketData::reveal(int day) {
+  if (day < revealedDay) {
+    throw std::invalid_argument("Revealed days cannot be hidden again");
   }
-  if (start < 0 || end > static_cast<int>(buyPrices.size()) || start >= end) {
-    throw std::out_of_range("Invalid day range");
+  if (day > store->totalDays) {
+    throw std::invalid_argument("Revealed day must be in [0, total days]");
   }
-  return std::vector<float>(buyPrices.begin() + start,
-                            buyPrices.begin() + end);
+  revealedDay = day;
 }
 
-std::vector<float> MarketData::getSellPrices(int start, int end) {
+void MarketData::checkRange(int &start, int &end) const {
+  int visible = revealedDay + 1;
   if (end == -1) {
-    end = static_cast<int>(sellPrices.size());
+    end = visible;
   }
-  if (start < 0 || end > static_cast<int>(sellPrices.size()) || start >= end) {
+  if (start < 0 || end > store->totalDays + 1 || start >= end) {
     throw std::out_of_range("Invalid day range");
   }
-  return std::vector<float>(sellPrices.begin() + start,
-                            sellPrices.begin() + end);
+  if (end > visible) {
+    throw std::out_of_range("Day not yet revealed");
+  }
 }
 
-int MarketData::getTotalDays() { return totalDays; }
+std::vector<float> MarketData::getBuyPrices(int start, int end) {
+  checkRange(start, end);
+  return std::vector<float>(store->buyPrices.begin() + start,
+                            store->buyPrices.begin() + end);
+}
+
+std::vector<float> MarketData::getSellPrices(int start, int end) {
+  checkRange(start, end);
+  return std::vector<float>(store->sellPrices.begin() + start,
+                            store->sellPrices.begin() + end);
+}
+
+int MarketData::getTotalDays() { return store->totalDays; }
 
 std::vector<float> MarketData::getMidPrices(int start, int end) {
-  if (end == -1) {
-    end = static_cast<int>(midPrices.size());
+  checkRange(start, end);
+  if (!store->lean) {
+    return std::vector<float>(store->midPrices.begin() + start,
+                              store->midPrices.begin() + end);
   }
-  if (start < 0 || end > static_cast<int>(midPrices.size()) || start >= end) {
-    throw std::out_of_range("Invalid day range");
+  std::vector<float> result(end - start);
+  for (int i = start; i < end; i++) {
+    result[i - start] = (store->buyPrices[i] + store->sellPrices[i]) / 2.0f;
   }
-  return std::vector<float>(midPrices.begin() + start,
-                            midPrices.begin() + end);
+  return result;
 }
 
-std::vector<float> MarketData::sliceResult(const std::vector<float>& data,
-                                           int start, int end) {
-  if (end == -1) {
-    end = static_cast<int>(data.size());
+size_t MarketData::getMemoryBytes() const {
+  size_t bytes = (store->buyPrices.capacity() + store->sellPrices.capacity() +
+                  store->midPrices.capacity()) * sizeof(float);
+  for (const auto &entry : store->indicatorCache) {
+    bytes += entry.first.capacity() + sizeof(CachedSeries) +
+             entry.second.values.capacity() * sizeof(float);
   }
-  if (start < 0 || end > static_cast<int>(data.size()) || start >= end) {
-    throw std::out_of_range("Invalid day range");
+  for (const auto &entry : store->eventCache) {
+    bytes += entry.first.capacity() + sizeof(std::vector<int>) +
+             entry.second.capacity() * sizeof(int);
+  }
+  return bytes;
+}
+
+const char *MarketData::seriesName(PriceSeries series) {
+  switch (series) {
+  case PriceSeries::Buy: return "buy";
+  case PriceSeries::Sell: return "sell";
+  default: return "mid";
+  }
+}
+
+MarketData::PriceSeries MarketData::parseSeries(const std::string &name) {
+  if (name == "buy") return PriceSeries::Buy;
+  if (name == "sell") return PriceSeries::Sell;
+  if (name == "mid") return PriceSeries::Mid;
+  throw std::invalid_argument("Unknown price series: " + name);
+}
+
+const std::vector<float> &
+MarketData::seriesData(PriceSeries series, std::vector<float> &scratch) const {
+  if (series == PriceSeries::Buy) return store->buyPrices;
+  if (series == PriceSeries::Sell) return store->sellPrices;
+  if (!store->lean) return store->midPrices;
+  scratch.resize(store->buyPrices.size());
+  for (size_t i = 0; i < store->buyPrices.size(); i++) {
+    scratch[i] = (store->buyPrices[i] + store->sellPrices[i]) / 2.0f;
   }
-  return std::vector<float>(data.begin() + start, data.begin() + end);
+  return scratch;
 }
 
-const std::vector<float>& MarketData::getCachedOrCompute(
+MarketData::CachedSeries MarketData::compact(std::vector<float> full) {
+  size_t first = 0;
+  while (first < full.size() && std::isnan(full[first])) {
+    first++;
+  }
+  if (first == 0) {
+    return {0, std::move(full)};
+  }
+  return {static_cast<int>(first),
+          std::vector<float>(full.begin() + first, full.end())};
+}
+
+std::vector<float> MarketData::sliceResult(const CachedSeries& data,
+                                           int start, int end) {
+  checkRange(start, end);
+  // Re-expand the elided warm-up NaNs
+  std::vector<float> result(end - start,
+                            std::numeric_limits<float>::quiet_NaN());
+  int from = std::max(start, data.offset);
+  for (int i = from; i < end; i++) {
+    result[i - start] = data.values[i - data.offset];
+  }
+  return result;
+}
+
+const MarketData::CachedSeries& MarketData::getCachedOrCompute(
     const std::string& key,
-    const std::vector<float>& prices,
+    PriceSeries series,
     std::function<std::vector<float>(const std::vector<float>&)> computeFn) {
-  auto it = indicatorCache.find(key);
-  if (it == indicatorCache.end()) {
-    indicatorCache[key] = computeFn(prices);
-    return indicatorCache[key];
+  auto it = store->indicatorCache.find(key);
+  if (it == store->indicatorCache.end()) {
+    std::vector<float> scratch;
+    store->indicatorCache[key] =
+        compact(computeFn(seriesData(series, scratch)));
+    return store->indicatorCache[key];
   }
   return it->second;
 }
@@ -122,13 +191,13 @@ const std::vector<float>& MarketData::getCachedOrCompute(
 // SMA
 std::vector<float> MarketData::getBuySMA(int period, int start, int end) {
   std::string key = "buy_sma_" + std::to_string(period);
-  const auto& data = getCachedOrCompute(key, buyPrices,
+  const auto& data = getCachedOrCompute(key, PriceSeries::Buy,
       [period](const std::vector<float>& p) { return indicators::sma(p, period); });
   return sliceResult(data, start, end);
 }
 std::vector<float> MarketData::getSellSMA(int period, int start, int end) {
   std::string key = "sell_sma_" + std::to_string(period);
-  const auto& data = getCachedOrCompute(key, sellPrices,
+  const auto& data = getCachedOrCompute(key, PriceSeries::Sell,
       [period](const std::vector<float>& p) { return indicators::sma(p, period); });
   return sliceResult(data, start, end);
 }
@@ -136,13 +205,13 @@ std::vector<float> MarketData::getSellSMA(int period, int start, int end) {
 // EMA
 std::vector<float> MarketData::getBuyEMA(int period, int start, int end) {
   std::string key = "buy_ema_" + std::to_string(period);
-  const auto& data = getCachedOrCompute(key, buyPrices,
+  const auto& data = getCachedOrCompute(key, PriceSeries::Buy,
       [period](const std::vector<float>& p) { return indicators::ema(p, period); });
   return sliceResult(data, start, end);
 }
 std::vector<float> MarketData::getSellEMA(int period, int start, int end) {
   std::string key = "sell_ema_" + std::to_string(period);
-  const auto& data = getCachedOrCompute(key, sellPrices,
+  const auto& data = getCachedOrCompute(key, PriceSeries::Sell,
       [period](const std::vector<float>& p) { return indicators::ema(p, period); });
   return sliceResult(data, start, end);
 }
@@ -150,108 +219,96 @@ std::vector<float> MarketData::getSellEMA(int period, int start, int end) {
 // RSI
 std::vector<float> MarketData::getBuyRSI(int period, int start, int end) {
   std::string key = "buy_rsi_" + std::to_string(period);
-  const auto& data = getCachedOrCompute(key, buyPrices,
+  const auto& data = getCachedOrCompute(key, PriceSeries::Buy,
       [period](const std::vector<float>& p) { return indicators::rsi(p, period); });
   return sliceResult(data, start, end);
 }
 std::vector<float> MarketData::getSellRSI(int period, int start, int end) {
   std::string key = "sell_rsi_" + std::to_string(period);
-  const auto& data = getCachedOrCompute(key, sellPrices,
+  const auto& data = getCachedOrCompute(key, PriceSeries::Sell,
       [period](const std::vector<float>& p) { return indicators::rsi(p, period); });
   return sliceResult(data, start, end);
 }
 
 // MACD
 std::tuple<std::vector<float>, std::vector<float>, std::vector<float>>
-MarketData::getBuyMACD(int fast, int slow, int signal, int start, int end) {
-  std::string base = "buy_macd_" + std::to_string(fast) + "_" +
-                     std::to_string(slow) + "_" + std::to_string(signal);
+MarketData::macdFor(PriceSeries series, int fast, int slow, int signal,
+                    int start, int end) {
+  std::string base = std::string(seriesName(series)) + "_macd_" +
+                     std::to_string(fast) + "_" + std::to_string(slow) + "_" +
+                     std::to_string(signal);
   std::string keyLine = base + "_line";
   std::string keySignal = base + "_signal";
   std::string keyHist = base + "_hist";
 
-  if (indicatorCache.find(keyLine) == indicatorCache.end()) {
-    auto result = indicators::macd(buyPrices, fast, slow, signal);
-    indicatorCache[keyLine] = std::move(result.macd_line);
-    indicatorCache[keySignal] = std::move(result.signal_line);
-    indicatorCache[keyHist] = std::move(result.histogram);
+  if (store->indicatorCache.find(keyLine) == store->indicatorCache.end()) {
+    std::vector<float> scratch;
+    auto result =
+        indicators::macd(seriesData(series, scratch), fast, slow, signal);
+    store->indicatorCache[keyLine] = compact(std::move(result.macd_line));
+    store->indicatorCache[keySignal] = compact(std::move(result.signal_line));
+    store->indicatorCache[keyHist] = compact(std::move(result.histogram));
   }
-  return {sliceResult(indicatorCache[keyLine], start, end),
-          sliceResult(indicatorCache[keySignal], start, end),
-          sliceResult(indicatorCache[keyHist], start, end)};
+  return {sliceResult(store->indicatorCache[keyLine], start, end),
+          sliceResult(store->indicatorCache[keySignal], start, end),
+          sliceResult(store->indicatorCache[keyHist], start, end)};
+}
+std::tuple<std::vector<float>, std::vector<float>, std::vector<float>>
+MarketData::getBuyMACD(int fast, int slow, int signal, int start, int end) {
+  return macdFor(PriceSeries::Buy, fast, slow, signal, start, end);
 }
 std::tuple<std::vector<float>, std::vector<float>, std::vector<float>>
 MarketData::getSellMACD(int fast, int slow, int signal, int start, int end) {
-  std::string base = "sell_macd_" + std::to_string(fast) + "_" +
-                     std::to_string(slow) + "_" + std::to_string(signal);
-  std::string keyLine = base + "_line";
-  std::string keySignal = base + "_signal";
-  std::string keyHist = base + "_hist";
-
-  if (indicatorCache.find(keyLine) == indicatorCache.end()) {
-    auto result = indicators::macd(sellPrices, fast, slow, signal);
-    indicatorCache[keyLine] = std::move(result.macd_line);
-    indicatorCache[keySignal] = std::move(result.signal_line);
-    indicatorCache[keyHist] = std::move(result.histogram);
-  }
-  return {sliceResult(indicatorCache[keyLine], start, end),
-          sliceResult(indicatorCache[keySignal], start, end),
-          sliceResult(indicatorCache[keyHist], start, end)};
+  return macdFor(PriceSeries::Sell, fast, slow, signal, start, end);
 }
 
 // Bollinger Bands
 std::tuple<std::vector<float>, std::vector<float>, std::vector<float>>
-MarketData::getBuyBollingerBands(int period, float std_dev, int start, int end) {
+MarketData::bollingerFor(PriceSeries series, int period, float std_dev,
+                         int start, int end) {
   char buf[32];
-  std::snprintf(buf, sizeof(buf), "%.2f", std_dev);
-  std::string base = "buy_bb_" + std::to_string(period) + "_" + buf;
+  std::snprintf(buf, sizeof(buf), "%.9g", std_dev);
+  std::string base = std::string(seriesName(series)) + "_bb_" +
+                     std::to_string(period) + "_" + buf;
   std::string keyUpper = base + "_upper";
   std::string keyMiddle = base + "_middle";
   std::string keyLower = base + "_lower";
 
-  if (indicatorCache.find(keyUpper) == indicatorCache.end()) {
-    auto result = indicators::bollinger(buyPrices, period, std_dev);
-    indicatorCache[keyUpper] = std::move(result.upper);
-    indicatorCache[keyMiddle] = std::move(result.middle);
-    indicatorCache[keyLower] = std::move(result.lower);
+  if (store->indicatorCache.find(keyUpper) == store->indicatorCache.end()) {
+    std::vector<float> scratch;
+    auto result =
+        indicators::bollinger(seriesData(series, scratch), period, std_dev);
+    store->indicatorCache[keyUpper] = compact(std::move(result.upper));
+    store->indicatorCache[keyMiddle] = compact(std::move(result.middle));
+    store->indicatorCache[keyLower] = compact(std::move(result.lower));
   }
-  return {sliceResult(indicatorCache[keyUpper], start, end),
-          sliceResult(indicatorCache[keyMiddle], start, end),
-          sliceResult(indicatorCache[keyLower], start, end)};
+  return {sliceResult(store->indicatorCache[keyUpper], start, end),
+          sliceResult(store->indicatorCache[keyMiddle], start, end),
+          sliceResult(store->indicatorCache[keyLower], start, end)};
+}
+std::tuple<std::vector<float>, std::vector<float>, std::vector<float>>
+MarketData::getBuyBollingerBands(int period, float std_dev, int start, int end) {
+  return bollingerFor(PriceSeries::Buy, period, std_dev, start, end);
 }
 std::tuple<std::vector<float>, std::vector<float>, std::vector<float>>
 MarketData::getSellBollingerBands(int period, float std_dev, int start, int end) {
-  char buf[32];
-  std::snprintf(buf, sizeof(buf), "%.2f", std_dev);
-  std::string base = "sell_bb_" + std::to_string(period) + "_" + buf;
-  std::string keyUpper = base + "_upper";
-  std::string keyMiddle = base + "_middle";
-  std::string keyLower = base + "_lower";
-
-  if (indicatorCache.find(keyUpper) == indicatorCache.end()) {
-    auto result = indicators::bollinger(sellPrices, period, std_dev);
-    indicatorCache[keyUpper] = std::move(result.upper);
-    indicatorCache[keyMiddle] = std::move(result.middle);
-    indicatorCache[keyLower] = std::move(result.lower);
-  }
-  return {sliceResult(indicatorCache[keyUpper], start, end),
-          sliceResult(indicatorCache[keyMiddle], start, end),
-          sliceResult(indicatorCache[keyLower], start, end)};
+  return bollingerFor(PriceSeries::Sell, period, std_dev, start, end);
 }
 
 // ATR
 std::vector<float> MarketData::getATR(int period, int start, int end) {
   std::string key = "atr_" + std::to_string(period);
-  if (indicatorCache.find(key) == indicatorCache.end()) {
-    indicatorCache[key] = indicators::atr(buyPrices, sellPrices, period);
+  if (store->indicatorCache.find(key) == store->indicatorCache.end()) {
+    store->indicatorCache[key] =
+        compact(indicators::atr(store->buyPrices, store->sellPrices, period));
   }
-  return sliceResult(indicatorCache[key], start, end);
+  return sliceResult(store->indicatorCache[key], start, end);
 }
 
 // Mid SMA
 std::vector<float> MarketData::getMidSMA(int period, int start, int end) {
   std::string key = "mid_sma_" + std::to_string(period);
-  const auto& data = getCachedOrCompute(key, midPrices,
+  const auto& data = getCachedOrCompute(key, PriceSeries::Mid,
       [period](const std::vector<float>& p) { return indicators::sma(p, period); });
   return sliceResult(data, start, end);
 }
@@ -259,7 +316,7 @@ std::vector<float> MarketData::getMidSMA(int period, int start, int end) {
 // Mid EMA
 std::vector<float> MarketData::getMidEMA(int period, int start, int end) {
   std::string key = "mid_ema_" + std::to_string(period);
-  const auto& data = getCachedOrCompute(key, midPrices,
+  const auto& data = getCachedOrCompute(key, PriceSeries::Mid,
       [period](const std::vector<float>& p) { return indicators::ema(p, period); });
   return sliceResult(data, start, end);
 }
@@ -267,7 +324,7 @@ std::vector<float> MarketData::getMidEMA(int period, int start, int end) {
 // Mid RSI
 std::vector<float> MarketData::getMidRSI(int period, int start, int end) {
   std::string key = "mid_rsi_" + std::to_string(period);
-  const auto& data = getCachedOrCompute(key, midPrices,
+  const auto& data = getCachedOrCompute(key, PriceSeries::Mid,
       [period](const std::vector<float>& p) { return indicators::rsi(p, period); });
   return sliceResult(data, start, end);
 }
@@ -275,40 +332,280 @@ std::vector<float> MarketData::getMidRSI(int period, int start, int end) {
 // Mid MACD
 std::tuple<std::vector<float>, std::vector<float>, std::vector<float>>
 MarketData::getMidMACD(int fast, int slow, int signal, int start, int end) {
-  std::string base = "mid_macd_" + std::to_string(fast) + "_" +
-                     std::to_string(slow) + "_" + std::to_string(signal);
-  std::string keyLine = base + "_line";
-  std::string keySignal = base + "_signal";
-  std::string keyHist = base + "_hist";
-
-  if (indicatorCache.find(keyLine) == indicatorCache.end()) {
-    auto result = indicators::macd(midPrices, fast, slow, signal);
-    indicatorCache[keyLine] = std::move(result.macd_line);
-    indicatorCache[keySignal] = std::move(result.signal_line);
-    indicatorCache[keyHist] = std::move(result.histogram);
-  }
-  return {sliceResult(indicatorCache[keyLine], start, end),
-          sliceResult(indicatorCache[keySignal], start, end),
-          sliceResult(indicatorCache[keyHist], start, end)};
+  return macdFor(PriceSeries::Mid, fast, slow, signal, start, end);
 }
 
 // Mid Bollinger Bands
 std::tuple<std::vector<float>, std::vector<float>, std::vector<float>>
 MarketData::getMidBollingerBands(int period, float std_dev, int start, int end) {
-  char buf[32];
-  std::snprintf(buf, sizeof(buf), "%.2f", std_dev);
-  std::string base = "mid_bb_" + std::to_string(period) + "_" + buf;
+  return bollingerFor(PriceSeries::Mid, period, std_dev, start, end);
+}
+
+// Donchian Channels
+std::tuple<std::vector<float>, std::vector<float>, std::vector<float>>
+MarketData::donchianFor(PriceSeries series, int period, int start, int end) {
+  std::string base =
+      std::string(seriesName(series)) + "_donchian_" + std::to_string(period);
   std::string keyUpper = base + "_upper";
   std::string keyMiddle = base + "_middle";
   std::string keyLower = base + "_lower";
 
-  if (indicatorCache.find(keyUpper) == indicatorCache.end()) {
-    auto result = indicators::bollinger(midPrices, period, std_dev);
-    indicatorCache[keyUpper] = std::move(result.upper);
-    indicatorCache[keyMiddle] = std::move(result.middle);
-    indicatorCache[keyLower] = std::move(result.lower);
+  if (store->indicatorCache.find(keyUpper) == store->indicatorCache.end()) {
+    std::vector<float> scratch;
+    auto result = indicators::donchian(seriesData(series, scratch), period);
+    store->indicatorCache[keyUpper] = compact(std::move(result.upper));
+    store->indicatorCache[keyMiddle] = compact(std::move(result.middle));
+    store->indicatorCache[keyLower] = compact(std::move(result.lower));
+  }
+  return {sliceResult(store->indicatorCache[keyUpper], start, end),
+          sliceResult(store->indicatorCache[keyMiddle], start, end),
+          sliceResult(store->indicatorCache[keyLower], start, end)};
+}
+std::tuple<std::vector<float>, std::vector<float>, std::vector<float>>
+MarketData::getBuyDonchian(int period, int start, int end) {
+  return donchianFor(PriceSeries::Buy, period, start, end);
+}
+std::tuple<std::vector<float>, std::vector<float>, std::vector<float>>
+MarketData::getSellDonchian(int period, int start, int end) {
+  return donchianFor(PriceSeries::Sell, period, start, end);
+}
+std::tuple<std::vector<float>, std::vector<float>, std::vector<float>>
+MarketData::getMidDonchian(int period, int start, int end) {
+  return donchianFor(PriceSeries::Mid, period, start, end);
+}
+
+// Stochastic Oscillator
+std::tuple<std::vector<float>, std::vector<float>>
+MarketData::stochasticFor(PriceSeries series, int kPeriod, int dPeriod,
+                          int start, int end) {
+  std::string base = std::string(seriesName(series)) + "_stoch_" +
+                     std::to_string(kPeriod) + "_" + std::to_string(dPeriod);
+  std::string keyK = base + "_k";
+  std::string keyD = base + "_d";
+
+  if (store->indicatorCache.find(keyK) == store->indicatorCache.end()) {
+    std::vector<float> scratch;
+    auto result =
+        indicators::stochastic(seriesData(series, scratch), kPeriod, dPeriod);
+    store->indicatorCache[keyK] = compact(std::move(result.k));
+    store->indicatorCache[keyD] = compact(std::move(result.d));
+  }
+  return {sliceResult(store->indicatorCache[keyK], start, end),
+          sliceResult(store->indicatorCache[keyD], start, end)};
+}
+std::tuple<std::vector<float>, std::vector<float>>
+MarketData::getBuyStochastic(int k_period, int d_period, int start, int end) {
+  return stochasticFor(PriceSeries::Buy, k_period, d_period, start, end);
+}
+std::tuple<std::vector<float>, std::vector<float>>
+MarketData::getSellStochastic(int k_period, int d_period, int start, int end) {
+  return stochasticFor(PriceSeries::Sell, k_period, d_period, start, end);
+}
+std::tuple<std::vector<float>, std::vector<float>>
+MarketData::getMidStochastic(int k_period, int d_period, int start, int end) {
+  return stochasticFor(PriceSeries::Mid, k_period, d_period, start, end);
+}
+
+// Williams %R
+std::vector<float> MarketData::williamsRFor(PriceSeries series, int period,
+                                            int start, int end) {
+  std::string key =
+      std::string(seriesName(series)) + "_willr_" + std::to_string(period);
+  const auto& data = getCachedOrCompute(key, series,
+      [period](const std::vector<float>& p) { return indicators::williams_r(p, period); });
+  return sliceResult(data, start, end);
+}
+std::vector<float> MarketData::getBuyWilliamsR(int period, int start, int end) {
+  return williamsRFor(PriceSeries::Buy, period, start, end);
+}
+std::vector<float> MarketData::getSellWilliamsR(int period, int start, int end) {
+  return williamsRFor(PriceSeries::Sell, period, start, end);
+}
+std::vector<float> MarketData::getMidWilliamsR(int period, int start, int end) {
+  return williamsRFor(PriceSeries::Mid, period, start, end);
+}
+
+// --- Resampling ---
+
+std::vector<std::string> MarketData::getCachedSeries() const {
+  std::vector<std::string> keys;
+  keys.reserve(store->indicatorCache.size());
+  for (const auto &entry : store->indicatorCache) {
+    keys.push_back(entry.first);
+  }
+  return keys;
+}
+
+std::vector<float> MarketData::namedSeries(const std::string &series,
+                                           int start, int end) {
+  if (series == "buy") return getBuyPrices(start, end);
+  if (series == "sell") return getSellPrices(start, end);
+  if (series == "mid") return getMidPrices(start, end);
+  auto it = store->indicatorCache.find(series);
+  if (it == store->indicatorCache.end()) {
+    throw std::invalid_argument("Unknown or uncached series: " + series);
+  }
+  return sliceResult(it->second, start, end);
+}
+
+std::tuple<std::vector<int>, std::vector<float>>
+MarketData::getStrided(const std::string &series, int step, int start,
+                       int end) {
+  auto result = resample::stride(namedSeries(series, start, end), start, step);
+  return {std::move(result.days), std::move(result.values)};
+}
+
+std::tuple<std::vector<int>, std::vector<float>, std::vector<float>,
+           std::vector<float>, std::vector<float>>
+MarketData::getOHLC(const std::string &series, int bucket_days, int start,
+                    int end) {
+  auto result =
+      resample::ohlc(namedSeries(series, start, end), start, bucket_days);
+  return {std::move(result.days), std::move(result.open),
+          std::move(result.high), std::move(result.low),
+          std::move(result.close)};
+}
+
+std::tuple<std::vector<int>, std::vector<float>>
+MarketData::getDecimated(const std::string &series, int points, int start,
+                         int end) {
+  auto result = resample::lttb(namedSeries(series, start, end), start, points);
+  return {std::move(result.days), std::move(result.values)};
+}
+
+// --- Signal events ---
+
+namespace {
+
+enum class EventFamily { Rsi, Macd, Bollinger };
+
+struct EventKind {
+  const char *name;
+  EventFamily family;
+  events::Direction direction;
+  // Parameter names and defaults, in key order
+  std::vector<std::pair<std::string, float>> params;
+};
+
+const std::vector<EventKind> &eventKinds() {
+  using events::Direction;
+  static const std::vector<std::pair<std::string, float>> rsi = {
+      {"period", 14.0f}};
+  static const std::vector<std::pair<std::string, float>> macd = {
+      {"fast", 12.0f}, {"slow", 26.0f}, {"signal", 9.0f}};
+  static const std::vector<std::pair<std::string, float>> bollinger = {
+      {"period", 20.0f}, {"std_dev", 2.0f}};
+  static const std::vector<EventKind> kinds = {
+      {"rsi_below", EventFamily::Rsi, Direction::Down,
+       {rsi[0], {"level", 30.0f}}},
+      {"rsi_above", EventFamily::Rsi, Direction::Up,
+       {rsi[0], {"level", 70.0f}}},
+      {"macd_cross", EventFamily::Macd, Direction::Either, macd},
+      {"macd_cross_up", EventFamily::Macd, Direction::Up, macd},
+      {"macd_cross_down", EventFamily::Macd, Direction::Down, macd},
+      {"bollinger_above", EventFamily::Bollinger, Direction::Up, bollinger},
+      {"bollinger_below", EventFamily::Bollinger, Direction::Down, bollinger},
+      {"bollinger_outside", EventFamily::Bollinger, Direction::Either,
+       bollinger},
+  };
+  return kinds;
+}
+
+const EventKind &findEventKind(const std::string &name) {
+  for (const auto &kind : eventKinds()) {
+    if (name == kind.name) return kind;
+  }
+  throw std::invalid_argument("Unknown event kind: " + name);
+}
+
+} // namespace
+
+const std::vector<int> &
+MarketData::eventDays(const std::string &kind, const std::string &series,
+                      const std::map<std::string, float> &params) {
+  const EventKind &spec = findEventKind(kind);
+  PriceSeries priceSeries = parseSeries(series);
+
+  // Resolve parameters against the kind's defaults
+  std::vector<float> values;
+  for (const auto &param : spec.params) {
+    values.push_back(param.second);
   }
-  return {sliceResult(indicatorCache[keyUpper], start, end),
-          sliceResult(indicatorCache[keyMiddle], start, end),
-          sliceResult(indicatorCache[keyLower], start, end)};
+  for (const auto &entry : params) {
+    auto it = std::find_if(spec.params.begin(), spec.params.end(),
+                           [&](const auto &p) { return p.first == entry.first; });
+    if (it == spec.params.end()) {
+      throw std::invalid_argument("Unknown parameter for " + kind + ": " +
+                                  entry.first);
+    }
+    values[it - spec.params.begin()] = entry.second;
+  }
+  for (size_t i = 0; i < values.size(); i++) {
+    const std::string &name = spec.params[i].first;
+    if (name == "level" || name == "std_dev") continue;
+    if (values[i] < 1.0f || values[i] != std::floor(values[i])) {
+      throw std::invalid_argument("Event parameter " + name +
+                                  " must be a positive integer");
+    }
+  }
+
+  std::string key = std::string(seriesName(priceSeries)) + "_" + kind;
+  for (float value : values) {
+    // %.9g round-trips every float, so distinct settings get distinct keys
+    char buf[32];
+    std::snprintf(buf, sizeof(buf), "_%.9g", value);
+    key += buf;
+  }
+  auto cached = store->eventCache.find(key);
+  if (cached != store->eventCache.end()) {
+    return cached->second;
+  }
+
+  // Index the whole market: events on day i depend on days <= i only, so
+  // revealed-day limits are applied at query time.
+  MarketData full(store);
+  std::vector<int> days;
+  switch (spec.family) {
+  case EventFamily::Rsi: {
+    int period = static_cast<int>(values[0]);
+    std::vector<float> rsi =
+        priceSeries == PriceSeries::Buy    ? full.getBuyRSI(period)
+        : priceSeries == PriceSeries::Sell ? full.getSellRSI(period)
+                                           : full.getMidRSI(period);
+    days = ::events::crossings(rsi, values[1], spec.direction);
+    break;
+  }
+  case EventFamily::Macd: {
+    auto [line, signal, hist] =
+        full.macdFor(priceSeries, static_cast<int>(values[0]),
+                     static_cast<int>(values[1]), static_cast<int>(values[2]),
+                     0, -1);
+    days = ::events::crossings(line, signal, spec.direction);
+    break;
+  }
+  case EventFamily::Bollinger: {
+    auto [upper, middle, lower] = full.bollingerFor(
+        priceSeries, static_cast<int>(values[0]), values[1], 0, -1);
+    std::vector<float> scratch;
+    days = ::events::outside(seriesData(priceSeries, scratch), upper, lower,
+                           spec.direction);
+    break;
+  }
+  }
+  return store->eventCache[key] = std::move(days);
+}
+
+std::vector<int> MarketData::events(const std::string &kind, int start,
+                                    int end, const std::string &series,
+                                    const std::map<std::string, float> &params) {
+  checkRange(start, end);
+  return ::events::between(eventDays(kind, series, params), start, end);
+}
+
+std::optional<int>
+MarketData::nextEvent(const std::string &kind, int day,
+                      const std::string &series,
+                      const std::map<std::string, float> &params) {
+  return ::events::next_after(eventDays(kind, series, params), day,
+                            revealedDay + 1);
 }
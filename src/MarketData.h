@@ -1,6 +1,9 @@
 #pragma once
 #include "Indicator.h"
 #include "Regime.h"
+#include "Resample.h"
+#include "Scenario.h"
+#include "Simulation.h"
 #include <functional>
 #include <map>
 #include <memory>
@@ -10,16 +13,43 @@
 #include <tuple>
 #include <vector>
 
+// Simulated prices plus a lazily filled indicator cache. Copies made with
+// session() share the prices and cache but each has its own revealed day:
+// ranges ending past it raise, and end = -1 means "up to the revealed day".
+// Indicators only look back, so a revealed prefix never leaks later prices.
 class MarketData {
 public:
   MarketData(float startBuyPrice, float startSellPrice,
              std::vector<RegimeAssignment> regimes,
-             std::optional<unsigned int> seed = std::nullopt);
+             std::optional<unsigned int> seed = std::nullopt,
+             std::optional<SpreadModel> spread = std::nullopt,
+             bool lean = false);
+  MarketData(float startBuyPrice, float startSellPrice,
+             const Scenario &scenario,
+             std::optional<unsigned int> seed = std::nullopt,
+             std::optional<SpreadModel> spread = std::nullopt,
+             bool lean = false);
+
+  // A handle on the same prices and indicator cache revealing days
+  // [0, revealedDay].
+  MarketData session(int revealedDay = 0) const;
+  int getRevealedDay() const { return revealedDay; }
+  // Reveal days up to `day`; days cannot be hidden again.
+  void reveal(int day);
+  void advance(int days = 1) { reveal(revealedDay + days); }
+  // Whether both handles share one simulation and indicator cache
+  bool sharesMarket(const MarketData &other) const {
+    return store == other.store;
+  }
 
   std::vector<float> getBuyPrices(int start = 0, int end = -1);
   std::vector<float> getSellPrices(int start = 0, int end = -1);
   std::vector<float> getMidPrices(int start = 0, int end = -1);
   int getTotalDays();
+  bool isLean() const { return store->lean; }
+  // Approximate bytes held by price arrays and the indicator cache (shared
+  // by all sessions on the market)
+  size_t getMemoryBytes() const;
 
   // Technical indicators - Buy
   std::vector<float> getBuySMA(int period = 20, int start = 0, int end = -1);
@@ -57,22 +87,132 @@ public:
   // ATR uses both price series
   std::vector<float> getATR(int period = 14, int start = 0, int end = -1);
 
+  // Range oscillators (rolling extrema) - Buy
+  std::tuple<std::vector<float>, std::vector<float>, std::vector<float>>
+      getBuyDonchian(int period = 20, int start = 0, int end = -1);
+  std::tuple<std::vector<float>, std::vector<float>>
+      getBuyStochastic(int k_period = 14, int d_period = 3,
+                       int start = 0, int end = -1);
+  std::vector<float> getBuyWilliamsR(int period = 14, int start = 0,
+                                     int end = -1);
+
+  // Range oscillators (rolling extrema) - Sell
+  std::tuple<std::vector<float>, std::vector<float>, std::vector<float>>
+      getSellDonchian(int period = 20, int start = 0, int end = -1);
+  std::tuple<std::vector<float>, std::vector<float>>
+      getSellStochastic(int k_period = 14, int d_period = 3,
+                        int start = 0, int end = -1);
+  std::vector<float> getSellWilliamsR(int period = 14, int start = 0,
+                                      int end = -1);
+
+  // Range oscillators (rolling extrema) - Mid
+  std::tuple<std::vector<float>, std::vector<float>, std::vector<float>>
+      getMidDonchian(int period = 20, int start = 0, int end = -1);
+  std::tuple<std::vector<float>, std::vector<float>>
+      getMidStochastic(int k_period = 14, int d_period = 3,
+                       int start = 0, int end = -1);
+  std::vector<float> getMidWilliamsR(int period = 14, int start = 0,
+                                     int end = -1);
+
+  // Chart resampling. `series` is "buy", "sell", "mid" or the key of an
+  // indicator that has already been computed (see getCachedSeries). Day
+  // indices are returned alongside the values.
+  std::vector<std::string> getCachedSeries() const;
+  std::tuple<std::vector<int>, std::vector<float>>
+      getStrided(const std::string& series, int step, int start = 0,
+                 int end = -1);
+  std::tuple<std::vector<int>, std::vector<float>, std::vector<float>,
+             std::vector<float>, std::vector<float>>
+      getOHLC(const std::string& series, int bucket_days = 5, int start = 0,
+              int end = -1);
+  std::tuple<std::vector<int>, std::vector<float>>
+      getDecimated(const std::string& series, int points = 1000,
+                   int start = 0, int end = -1);
+
+  // Signal events. `kind` is one of "rsi_below", "rsi_above", "macd_cross",
+  // "macd_cross_up", "macd_cross_down", "bollinger_above", "bollinger_below"
+  // or "bollinger_outside" on the given price series; `params` overrides the
+  // kind's indicator settings. The first query for a kind and parameter set
+  // indexes the event days once; later queries binary-search that index.
+  std::vector<int> events(const std::string& kind, int start = 0,
+                          int end = -1, const std::string& series = "mid",
+                          const std::map<std::string, float>& params = {});
+  // First revealed event day after `day`, if any
+  std::optional<int> nextEvent(const std::string& kind, int day = -1,
+                               const std::string& series = "mid",
+                               const std::map<std::string, float>& params = {});
+
 private:
-  std::vector<std::shared_ptr<Regime>> dayRegimes;
-  std::vector<float> buyPrices;
-  std::vector<float> sellPrices;
-  std::vector<float> midPrices;
-  int totalDays;
-  std::mt19937 rng;
+  friend class MarketRegistry;
 
-  void computePrices();
+  enum class PriceSeries { Buy, Sell, Mid };
 
-  // Indicator cache
-  std::map<std::string, std::vector<float>> indicatorCache;
+  // Cached indicator values for days [offset, offset + values.size()); days
+  // before offset (the warm-up period) are NaN and are not stored.
+  struct CachedSeries {
+    int offset;
+    std::vector<float> values;
+  };
 
-  std::vector<float> sliceResult(const std::vector<float>& data, int start, int end);
-  const std::vector<float>& getCachedOrCompute(
+  // Everything shared between sessions on one market
+  struct Store {
+    std::vector<float> buyPrices;
+    std::vector<float> sellPrices;
+    std::vector<float> midPrices; // empty in lean mode, derived on demand
+    int totalDays;
+    std::optional<SpreadModel> spread;
+    bool lean;
+
+    // Indicator cache
+    std::map<std::string, CachedSeries> indicatorCache;
+    // Sorted event days by event key
+    std::map<std::string, std::vector<int>> eventCache;
+    // Custom regimes of an interned market, held so that the addresses its
+    // registry key is built from cannot be reused while it is alive
+    std::vector<std::shared_ptr<Regime>> keyRegimes;
+  };
+
+  std::shared_ptr<Store> store;
+  int revealedDay;
+
+  // Handle on an existing market with every day revealed
+  explicit MarketData(std::shared_ptr<Store> store)
+      : store(std::move(store)), revealedDay(this->store->totalDays) {}
+
+  // Resolve end = -1 to the revealed end and validate [start, end).
+  void checkRange(int& start, int& end) const;
+  static const char* seriesName(PriceSeries series);
+  static PriceSeries parseSeries(const std::string& name);
+  // Prices for a series; in lean mode mid is materialized into scratch.
+  const std::vector<float>& seriesData(PriceSeries series,
+                                       std::vector<float>& scratch) const;
+  static CachedSeries compact(std::vector<float> full);
+  std::vector<float> sliceResult(const CachedSeries& data, int start, int end);
+  // Values of a named price series or cached indicator over [start, end)
+  std::vector<float> namedSeries(const std::string& series, int start,
+                                 int end);
+  const CachedSeries& getCachedOrCompute(
       const std::string& key,
-      const std::vector<float>& prices,
+      PriceSeries series,
       std::function<std::vector<float>(const std::vector<float>&)> computeFn);
+
+  // Shared implementations of the multi-output indicators for one series
+  std::tuple<std::vector<float>, std::vector<float>, std::vector<float>>
+      macdFor(PriceSeries series, int fast, int slow, int signal,
+              int start, int end);
+  std::tuple<std::vector<float>, std::vector<float>, std::vector<float>>
+      bollingerFor(PriceSeries series, int period, float std_dev,
+                   int start, int end);
+  std::tuple<std::vector<float>, std::vector<float>, std::vector<float>>
+      donchianFor(PriceSeries series, int period, int start, int end);
+  std::tuple<std::vector<float>, std::vector<float>>
+      stochasticFor(PriceSeries series, int kPeriod, int dPeriod,
+                    int start, int end);
+  std::vector<float> williamsRFor(PriceSeries series, int period,
+                                  int start, int end);
+
+  // Sorted days of an event over the whole market, indexed on first use
+  const std::vector<int>& eventDays(
+      const std::string& kind, const std::string& series,
+      const std::map<std::string, float>& params);
 };
@@ -0,0 +1,108 @@
+#include "MarketRegistry.h"
+#include <cstdint>
+
+namespace {
+
+template <typename T> void put(std::string &key, const T &value) {
+  key.append(reinterpret_cast<const char *>(&value), sizeof(T));
+}
+
+// Byte-exact key: equal keys give bit-identical simulations.
+std::string canonicalKey(float startBuyPrice, float startSellPrice,
+                         const std::vector<ScenarioSegment> &segments,
+                         unsigned int seed,
+                         const std::optional<SpreadModel> &spread, bool lean) {
+  std::string key;
+  put(key, startBuyPrice);
+  put(key, startSellPrice);
+  put(key, seed);
+  put(key, lean);
+  put(key, spread.has_value());
+  if (spread.has_value()) {
+    put(key, spread->mean.has_value());
+    put(key, spread->mean.value_or(0.0f));
+    put(key, spread->reversion);
+    put(key, spread->volatility);
+    put(key, spread->floor);
+  }
+  put(key, segments.size());
+  for (const auto &segment : segments) {
+    put(key, segment.startDay);
+    put(key, segment.endDay);
+    put(key, reinterpret_cast<uintptr_t>(segment.spec.instance.get()));
+    put(key, segment.spec.type.size());
+    key += segment.spec.type;
+    put(key, segment.spec.params.size());
+    for (float param : segment.spec.params) {
+      put(key, param);
+    }
+  }
+  return key;
+}
+
+} // namespace
+
+MarketRegistry &MarketRegistry::instance() {
+  static MarketRegistry registry;
+  return registry;
+}
+
+MarketData MarketRegistry::acquire(float startBuyPrice, float startSellPrice,
+                                   const std::vector<ScenarioSegment> &segments,
+                                   unsigned int seed,
+                                   const std::optional<SpreadModel> &spread,
+                                   bool lean, int revealedDay) {
+  std::string key = canonicalKey(startBuyPrice, startSellPrice, segments,
+                                 seed, spread, lean);
+  {
+    std::lock_guard<std::mutex> lock(mutex);
+    auto it = markets.find(key);
+    if (it != markets.end()) {
+      if (auto store = it->second.lock()) {
+        return MarketData(std::move(store)).session(revealedDay);
+      }
+    }
+  }
+
+  // Simulate without the lock: a custom regime can call back into Python,
+  // and another thread may need the registry meanwhile.
+  std::vector<RegimeAssignment> regimes;
+  regimes.reserve(segments.size());
+  for (const auto &segment : segments) {
+    regimes.emplace_back(makeRegime(segment.spec), segment.startDay,
+                         segment.endDay);
+  }
+  MarketData market(startBuyPrice, startSellPrice, std::move(regimes), seed,
+                    spread, lean);
+  for (const auto &segment : segments) {
+    if (segment.spec.instance) {
+      market.store->keyRegimes.push_back(segment.spec.instance);
+    }
+  }
+
+  std::lock_guard<std::mutex> lock(mutex);
+  prune();
+  auto &slot = markets[key];
+  if (auto store = slot.lock()) {
+    // Another thread built the same market first
+    return MarketData(std::move(store)).session(revealedDay);
+  }
+  slot = market.store;
+  return market.session(revealedDay);
+}
+
+size_t MarketRegistry::size() {
+  std::lock_guard<std::mutex> lock(mutex);
+  prune();
+  return markets.size();
+}
+
+void MarketRegistry::prune() {
+  for (auto it = markets.begin(); it != markets.end();) {
+    if (it->second.expired()) {
+      it = markets.erase(it);
+    } else {
+      ++it;
+    }
+  }
+}
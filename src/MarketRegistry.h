@@ -0,0 +1,41 @@
+#pragma once
+#include "MarketData.h"
+#include <mutex>
+#include <string>
+#include <unordered_map>
+#include <vector>
+
+// Process-wide interning of simulated markets. Requests for the same start
+// prices, regime schedule, seed and pricing options get MarketData sessions
+// on one shared simulation and indicator cache, so memory and CPU scale with
+// distinct markets rather than sessions. The registry only holds weak
+// references: a market is freed when its last session goes away.
+//
+// Markets are built from the schedule's regime specs, so the prices equal
+// those of a MarketData on the same schedule. Custom regimes are keyed by
+// object identity; a market keeps its custom regimes alive, so a key never
+// refers to a reused address.
+class MarketRegistry {
+public:
+  static MarketRegistry &instance();
+
+  // Session on the interned market, revealing days [0, revealedDay]. The
+  // lock is not held while a new market is simulated; if two threads build
+  // the same market at once, both get the one that was stored first.
+  MarketData acquire(float startBuyPrice, float startSellPrice,
+                     const std::vector<ScenarioSegment> &segments,
+                     unsigned int seed,
+                     const std::optional<SpreadModel> &spread, bool lean,
+                     int revealedDay = 0);
+
+  // Number of markets that still have live sessions
+  size_t size();
+
+private:
+  MarketRegistry() = default;
+
+  std::mutex mutex;
+  std::unordered_map<std::string, std::weak_ptr<MarketData::Store>> markets;
+
+  void prune();
+};
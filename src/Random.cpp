@@ -0,0 +1,277 @@
+#include "Random.h"
+#include "SobolTable.h"
+#include <array>
+#include <cmath>
+#include <limits>
+#include <stdexcept>
+#include <string>
+#include <vector>
+
+SamplingMode parseSamplingMode(const std::string &name) {
+  if (name == "pseudo")
+    return SamplingMode::Pseudo;
+  if (name == "antithetic")
+    return SamplingMode::Antithetic;
+  if (name == "sobol")
+    return SamplingMode::Sobol;
+  throw std::invalid_argument("Unknown sampling mode: " + name +
+                              " (expected pseudo, antithetic or sobol)");
+}
+
+std::mt19937 pathRng(unsigned int seed, uint64_t pathIndex) {
+  std::seed_seq seq{seed, static_cast<unsigned int>(pathIndex),
+                    static_cast<unsigned int>(pathIndex >> 32)};
+  return std::mt19937(seq);
+}
+
+RandomSource pathSource(unsigned int seed, uint64_t pathIndex,
+                        SamplingMode mode) {
+  switch (mode) {
+  case SamplingMode::Antithetic:
+    return RandomSource(pathRng(seed, pathIndex / 2), pathIndex % 2 == 1);
+  case SamplingMode::Sobol:
+    return RandomSource::sobol(pathRng(seed, pathIndex),
+                               static_cast<uint32_t>(pathIndex), seed);
+  default:
+    return RandomSource(pathRng(seed, pathIndex));
+  }
+}
+
+// --- Recording and replay ---
+
+void RandomSource::record(RandomTape &tape) {
+  tape.clear();
+  recording = &tape;
+  replaying = nullptr;
+}
+
+RandomSource RandomSource::replay(const RandomTape &tape) const {
+  RandomSource source(*this);
+  source.recording = nullptr;
+  source.replaying = &tape;
+  source.bitPos = 0;
+  source.normalPos = 0;
+  source.conditionalPos = 0;
+  return source;
+}
+
+RandomSource::result_type RandomSource::tapeBits() {
+  if (recording) {
+    result_type r = drawBits();
+    recording->bits.push_back(r);
+    return r;
+  }
+  if (bitPos < replaying->bits.size()) {
+    return replaying->bits[bitPos++];
+  }
+  return drawBits();
+}
+
+float RandomSource::tapeNormal() {
+  if (recording) {
+    float z = drawNormal();
+    recording->normals.push_back(z);
+    return z;
+  }
+  if (normalPos < replaying->normals.size()) {
+    return replaying->normals[normalPos++];
+  }
+  return drawNormal();
+}
+
+float RandomSource::conditionalNormal(bool needed) {
+  if (recording) {
+    float z = needed ? drawNormal() : std::numeric_limits<float>::quiet_NaN();
+    recording->conditionals.push_back(z);
+    return needed ? z : 0.0f;
+  }
+  if (replaying && conditionalPos < replaying->conditionals.size()) {
+    float z = replaying->conditionals[conditionalPos++];
+    if (!needed) {
+      return 0.0f;
+    }
+    return std::isnan(z) ? pseudoNormal() : z;
+  }
+  return needed ? drawNormal() : 0.0f;
+}
+
+// --- Inverse normal CDF ---
+
+// Acklam's rational approximation (relative error below 1.2e-9)
+double inverseNormalCdf(double p) {
+  static const double a[] = {-3.969683028665376e+01, 2.209460984245205e+02,
+                             -2.759285104469687e+02, 1.383577518672690e+02,
+                             -3.066479806614716e+01, 2.506628277459239e+00};
+  static const double b[] = {-5.447609879822406e+01, 1.615858368580409e+02,
+                             -1.556989798598866e+02, 6.680131188771972e+01,
+                             -1.328068155288572e+01};
+  static const double c[] = {-7.784894002430293e-03, -3.223964580411365e-01,
+                             -2.400758277161838e+00, -2.549732539343734e+00,
+                             4.374664141464968e+00,  2.938163982698783e+00};
+  static const double d[] = {7.784695709041462e-03, 3.224671290700398e-01,
+                             2.445134137142996e+00, 3.754408661907416e+00};
+  const double pLow = 0.02425;
+
+  if (!(p > 0.0 && p < 1.0)) {
+    throw std::invalid_argument("Probability must be in (0, 1)");
+  }
+  if (p < pLow) {
+    double q = std::sqrt(-2.0 * std::log(p));
+    return (((((c[0] * q + c[1]) * q + c[2]) * q + c[3]) * q + c[4]) * q +
+            c[5]) /
+           ((((d[0] * q + d[1]) * q + d[2]) * q + d[3]) * q + 1.0);
+  }
+  if (p > 1.0 - pLow) {
+    double q = std::sqrt(-2.0 * std::log(1.0 - p));
+    return -(((((c[0] * q + c[1]) * q + c[2]) * q + c[3]) * q + c[4]) * q +
+             c[5]) /
+           ((((d[0] * q + d[1]) * q + d[2]) * q + d[3]) * q + 1.0);
+  }
+  double q = p - 0.5;
+  double r = q * q;
+  return (((((a[0] * r + a[1]) * r + a[2]) * r + a[3]) * r + a[4]) * r +
+          a[5]) *
+         q /
+         (((((b[0] * r + b[1]) * r + b[2]) * r + b[3]) * r + b[4]) * r + 1.0);
+}
+
+// --- Sobol sequence ---
+
+namespace {
+
+constexpr int kSobolBits = 32;
+constexpr int kMaxPolynomialDegree = sobol_table::kMaxDegree; // 1111 dimensions
+
+using Directions = std::array<uint32_t, kSobolBits>;
+
+// Product of polynomials over GF(2) reduced modulo `mod` of degree `deg`.
+uint32_t mulMod(uint32_t x, uint32_t y, uint32_t mod, int deg) {
+  uint32_t result = 0;
+  while (y) {
+    if (y & 1u)
+      result ^= x;
+    y >>= 1;
+    x <<= 1;
+    if (x & (1u << deg))
+      x ^= mod;
+  }
+  return result;
+}
+
+uint32_t powMod(uint32_t base, uint32_t exp, uint32_t mod, int deg) {
+  uint32_t result = 1;
+  while (exp) {
+    if (exp & 1u)
+      result = mulMod(result, base, mod, deg);
+    base = mulMod(base, base, mod, deg);
+    exp >>= 1;
+  }
+  return result;
+}
+
+// A polynomial is primitive iff x has multiplicative order 2^deg - 1.
+bool isPrimitive(uint32_t poly, int deg) {
+  if (!(poly & 1u))
+    return false;
+  uint32_t order = (1u << deg) - 1;
+  uint32_t x = deg == 1 ? 1u : 2u; // x mod (x + 1) is 1
+  if (powMod(x, order, poly, deg) != 1u)
+    return false;
+  uint32_t n = order;
+  for (uint32_t q = 2; q * q <= n; q++) {
+    if (n % q == 0) {
+      if (powMod(x, order / q, poly, deg) == 1u)
+        return false;
+      while (n % q == 0)
+        n /= q;
+    }
+  }
+  return n == 1 || powMod(x, order / n, poly, deg) != 1u;
+}
+
+// Direction numbers for every primitive polynomial up to
+// kMaxPolynomialDegree, in order of degree and then coefficients, with the
+// Joe-Kuo initial values m_k (see SobolTable.h), which are chosen for good
+// two-dimensional projections.
+std::vector<Directions> buildDirections() {
+  std::vector<Directions> dirs;
+  Directions first{};
+  for (int k = 0; k < kSobolBits; k++) {
+    first[k] = 1u << (kSobolBits - 1 - k);
+  }
+  dirs.push_back(first);
+
+  const uint16_t *initial = sobol_table::kInitialDirections;
+  for (int deg = 1; deg <= kMaxPolynomialDegree; deg++) {
+    for (uint32_t poly = (1u << deg) | 1u; poly < (2u << deg); poly += 2) {
+      if (!isPrimitive(poly, deg))
+        continue;
+      std::vector<uint32_t> m(kSobolBits + 1);
+      for (int k = 1; k <= deg && k <= kSobolBits; k++) {
+        m[k] = *initial++;
+      }
+      for (int k = deg + 1; k <= kSobolBits; k++) {
+        uint32_t value = m[k - deg] ^ (m[k - deg] << deg);
+        for (int j = 1; j < deg; j++) {
+          if ((poly >> (deg - j)) & 1u)
+            value ^= m[k - j] << j;
+        }
+        m[k] = value;
+      }
+      Directions v{};
+      for (int k = 1; k <= kSobolBits; k++) {
+        v[k - 1] = m[k] << (kSobolBits - k);
+      }
+      dirs.push_back(v);
+    }
+  }
+  return dirs;
+}
+
+const std::vector<Directions> &sobolDirections() {
+  static const std::vector<Directions> dirs = buildDirections();
+  return dirs;
+}
+
+uint64_t splitmix64(uint64_t x) {
+  x += 0x9E3779B97F4A7C15ull;
+  x = (x ^ (x >> 30)) * 0xBF58476D1CE4E5B9ull;
+  x = (x ^ (x >> 27)) * 0x94D049BB133111EBull;
+  return x ^ (x >> 31);
+}
+
+} // namespace
+
+uint32_t sobolDimensions() {
+  return static_cast<uint32_t>(sobolDirections().size());
+}
+
+RandomSource RandomSource::sobol(std::mt19937 engine, uint32_t point,
+                                 uint64_t scrambleSeed) {
+  RandomSource source(std::move(engine));
+  source.useSobol = true;
+  source.point = point;
+  source.scrambleSeed = scrambleSeed;
+  return source;
+}
+
+float RandomSource::sobolNormal() {
+  if (dimension >= sobolDimensions()) {
+    throw std::invalid_argument(
+        "sampling='sobol' covers " + std::to_string(sobolDimensions()) +
+        " normal draws per path and this schedule needs more; shorten it "
+        "or use 'pseudo' or 'antithetic' sampling");
+  }
+  const Directions &v = sobolDirections()[dimension];
+  uint32_t x = 0;
+  for (uint32_t i = point, k = 0; i; i >>= 1, k++) {
+    if (i & 1u)
+      x ^= v[k];
+  }
+  // Random digital shift per dimension, fixed by the seed
+  x ^= static_cast<uint32_t>(splitmix64(scrambleSeed * 0x100000001B3ull +
+                                        dimension));
+  dimension++;
+  double u = (static_cast<double>(x) + 0.5) / 4294967296.0;
+  return static_cast<float>(inverseNormalCdf(u));
+}
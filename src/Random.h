@@ -0,0 +1,129 @@
+#pragma once
+#include <cstdint>
+#include <random>
+#include <string>
+#include <vector>
+
+// How a multi-path run draws its random numbers.
+//   Pseudo:     independent mt19937 stream per path.
+//   Antithetic: paths 2k and 2k + 1 share a stream; the odd path sees
+//               complemented uniforms and negated normals.
+//   Sobol:      normals come from a digitally shifted Sobol sequence (one
+//               point per path, one dimension per normal draw) mapped through
+//               the inverse normal CDF; uniforms come from the path's
+//               mt19937. A path needing more normals than sobolDimensions()
+//               throws std::invalid_argument.
+enum class SamplingMode { Pseudo, Antithetic, Sobol };
+
+// Parse "pseudo", "antithetic" or "sobol". Throws std::invalid_argument.
+SamplingMode parseSamplingMode(const std::string &name);
+
+// Number of Sobol dimensions (normal draws per path) covered by the sequence.
+uint32_t sobolDimensions();
+
+// Inverse of the standard normal CDF for p in (0, 1).
+double inverseNormalCdf(double p);
+
+// Every draw taken from a RandomSource while recording, in order. Replaying
+// a tape gives another run of the same path exactly the same draws without
+// regenerating them.
+struct RandomTape {
+  std::vector<std::mt19937::result_type> bits;
+  std::vector<float> normals;
+  // One slot per conditionalNormal() call; NaN where nothing was drawn.
+  std::vector<float> conditionals;
+
+  void clear() {
+    bits.clear();
+    normals.clear();
+    conditionals.clear();
+  }
+};
+
+// Source of randomness for one path. It is a UniformRandomBitGenerator, so
+// standard distributions work on it directly, and regimes draw standard
+// normals through normal() so the sampling mode can supply them. In Pseudo
+// mode the results are exactly those of the wrapped mt19937.
+class RandomSource {
+public:
+  using result_type = std::mt19937::result_type;
+  static constexpr result_type min() { return std::mt19937::min(); }
+  static constexpr result_type max() { return std::mt19937::max(); }
+
+  explicit RandomSource(std::mt19937 engine, bool antithetic = false)
+      : engine(std::move(engine)), antithetic(antithetic) {}
+
+  // Normals from Sobol point `point`, scrambled by scrambleSeed; `engine`
+  // supplies uniforms.
+  static RandomSource sobol(std::mt19937 engine, uint32_t point,
+                            uint64_t scrambleSeed);
+
+  // Append every draw from now on to `tape` (cleared first).
+  void record(RandomTape &tape);
+  // A source that replays `tape`, recorded from this source, and then
+  // continues with this source's own draws.
+  RandomSource replay(const RandomTape &tape) const;
+
+  result_type operator()() {
+    if (recording || replaying) {
+      return tapeBits();
+    }
+    return drawBits();
+  }
+
+  float normal() {
+    if (recording || replaying) {
+      return tapeNormal();
+    }
+    return drawNormal();
+  }
+
+  // A standard normal that is only needed when `needed` holds, such as the
+  // size of a jump that may not happen; returns 0 otherwise. Live sources
+  // draw it only when needed. A recording keeps a slot for every call, so a
+  // replay whose condition differs stays aligned with the tape; where the
+  // recording drew nothing, the replay draws from its own pseudo-random
+  // stream.
+  float conditionalNormal(bool needed);
+
+private:
+  std::mt19937 engine;
+  bool antithetic;
+  bool useSobol = false;
+  uint32_t point = 0;
+  uint32_t dimension = 0;
+  uint64_t scrambleSeed = 0;
+  RandomTape *recording = nullptr;
+  const RandomTape *replaying = nullptr;
+  size_t bitPos = 0;
+  size_t normalPos = 0;
+  size_t conditionalPos = 0;
+
+  result_type drawBits() {
+    result_type r = engine();
+    return antithetic ? max() - r : r;
+  }
+  float drawNormal() {
+    if (useSobol) {
+      return sobolNormal();
+    }
+    return pseudoNormal();
+  }
+  float pseudoNormal() {
+    std::normal_distribution<float> dist(0.0f, 1.0f);
+    float z = dist(engine);
+    return antithetic ? -z : z;
+  }
+  float sobolNormal();
+  result_type tapeBits();
+  float tapeNormal();
+};
+
+// RNG for one path of a multi-path run. It depends only on the run seed and
+// the path index, so any subset of paths can be regenerated independently.
+std::mt19937 pathRng(unsigned int seed, uint64_t pathIndex);
+
+// Source for one path of a multi-path run under the given sampling mode.
+// Depends only on (seed, pathIndex, mode).
+RandomSource pathSource(unsigned int seed, uint64_t pathIndex,
+                        SamplingMode mode);
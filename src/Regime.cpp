@@ -1,10 +1,41 @@
 #include "Regime.h"
+#include <cmath>
+#include <map>
+#include <stdexcept>
+
+// --- BlockRegime ---
+
+BlockRegime::BlockRegime(int drawsPerDay) : draws(drawsPerDay) {
+  if (drawsPerDay < 0) {
+    throw std::invalid_argument("draws_per_day must be non-negative");
+  }
+}
+
+float BlockRegime::update(float val, int day, RegimeState &state,
+                          RandomSource &rng) const {
+  (void)state;
+  std::vector<float> normals(draws);
+  for (auto &z : normals) {
+    z = rng.normal();
+  }
+  float out = val;
+  simulateBlock(normals.data(), &day, 1, val, &out);
+  return out;
+}
+
+RegimeSpec BlockRegime::spec() const {
+  auto self = std::const_pointer_cast<BlockRegime>(shared_from_this());
+  return {"Custom", {}, self};
+}
 
 // --- RandomWalkRegime ---
 
 RandomWalkRegime::RandomWalkRegime(float volatility) : volatility(volatility) {}
 
-float RandomWalkRegime::update(float val, std::mt19937 &rng) {
+float RandomWalkRegime::update(float val, int day, RegimeState &state,
+                               RandomSource &rng) const {
+  (void)day;
+  (void)state;
   std::uniform_real_distribution<float> noiseDist(-val / 50.0f, val / 50.0f);
   float noise = noiseDist(rng);
   val += noise;
@@ -16,68 +47,102 @@ float RandomWalkRegime::update(float val, std::mt19937 &rng) {
   return val + change;
 }
 
+RegimeSpec RandomWalkRegime::spec() const {
+  return {"RandomWalk", {volatility}};
+}
+
 // --- SineWaveRegime ---
 
 SineWaveRegime::SineWaveRegime(float volatility, float amplitude, float phase)
-    : volatility(volatility), amplitude(amplitude), phase(phase), dayIndex(0) {}
-
-void SineWaveRegime::setDayIndex(int day) { dayIndex = day; }
+    : volatility(volatility), amplitude(amplitude), phase(phase) {}
 
-float SineWaveRegime::update(float val, std::mt19937 &rng) {
+float SineWaveRegime::update(float val, int day, RegimeState &state,
+                             RandomSource &rng) const {
+  (void)state;
   std::uniform_real_distribution<float> noiseDist(-val * volatility,
                                                   val * volatility);
   float noise = noiseDist(rng);
   val += noise;
-  float sineValue = amplitude * std::sin(static_cast<float>(dayIndex) + phase);
+  float sineValue = amplitude * std::sin(static_cast<float>(day) + phase);
   return val + sineValue;
 }
 
+RegimeSpec SineWaveRegime::spec() const {
+  return {"SineWave", {volatility, amplitude, phase}};
+}
+
 // --- DropRegime ---
 
 DropRegime::DropRegime(float rate) : rate(rate) {}
 
-float DropRegime::update(float val, std::mt19937 &rng) {
+float DropRegime::update(float val, int day, RegimeState &state,
+                         RandomSource &rng) const {
+  (void)day;
+  (void)state;
   std::uniform_real_distribution<float> noiseDist(-val * rate, val * rate);
   float noise = noiseDist(rng);
   val += noise;
   return val - val * rate;
 }
 
+RegimeSpec DropRegime::spec() const {
+  return {"Drop", {rate}};
+}
+
 // --- SpikeRegime ---
 
 SpikeRegime::SpikeRegime(float rate) : rate(rate) {}
 
-float SpikeRegime::update(float val, std::mt19937 &rng) {
+float SpikeRegime::update(float val, int day, RegimeState &state,
+                          RandomSource &rng) const {
+  (void)day;
+  (void)state;
   std::uniform_real_distribution<float> noiseDist(-val * rate, val * rate);
   float noise = noiseDist(rng);
   val += noise;
   return val + val * rate;
 }
 
+RegimeSpec SpikeRegime::spec() const {
+  return {"Spike", {rate}};
+}
+
 // --- GBMRegime ---
 
 GBMRegime::GBMRegime(float mu, float sigma) : mu(mu), sigma(sigma) {}
 
-float GBMRegime::update(float val, std::mt19937 &rng) {
-  std::normal_distribution<float> norm(0.0f, 1.0f);
-  float z = norm(rng);
+float GBMRegime::update(float val, int day, RegimeState &state,
+                        RandomSource &rng) const {
+  (void)day;
+  (void)state;
+  float z = rng.normal();
   float dt = 1.0f;
   return val * std::exp((mu - 0.5f * sigma * sigma) * dt +
                         sigma * std::sqrt(dt) * z);
 }
 
+RegimeSpec GBMRegime::spec() const {
+  return {"GBM", {mu, sigma}};
+}
+
 // --- MeanReversionRegime ---
 
 MeanReversionRegime::MeanReversionRegime(float mu, float theta, float sigma)
     : mu(mu), theta(theta), sigma(sigma) {}
 
-float MeanReversionRegime::update(float val, std::mt19937 &rng) {
-  std::normal_distribution<float> norm(0.0f, 1.0f);
-  float z = norm(rng);
+float MeanReversionRegime::update(float val, int day, RegimeState &state,
+                                  RandomSource &rng) const {
+  (void)day;
+  (void)state;
+  float z = rng.normal();
   float dt = 1.0f;
   return val + theta * (mu - val) * dt + sigma * z;
 }
 
+RegimeSpec MeanReversionRegime::spec() const {
+  return {"MeanReversion", {mu, theta, sigma}};
+}
+
 // --- JumpDiffusionRegime ---
 
 JumpDiffusionRegime::JumpDiffusionRegime(float mu, float sigma,
@@ -85,81 +150,99 @@ JumpDiffusionRegime::JumpDiffusionRegime(float mu, float sigma,
     : mu(mu), sigma(sigma), jumpIntensity(jumpIntensity),
       jumpSize(jumpSize) {}
 
-float JumpDiffusionRegime::update(float val, std::mt19937 &rng) {
+float JumpDiffusionRegime::update(float val, int day, RegimeState &state,
+                                  RandomSource &rng) const {
+  (void)day;
+  (void)state;
   // GBM component
-  std::normal_distribution<float> norm(0.0f, 1.0f);
-  float z = norm(rng);
+  float z = rng.normal();
   float dt = 1.0f;
   float gbmPrice =
       val * std::exp((mu - 0.5f * sigma * sigma) * dt +
                      sigma * std::sqrt(dt) * z);
 
-  // Jump component
+  // Jump component. The jump size is a conditional draw, so parameter
+  // sweeps stay aligned when jumpIntensity differs between variants.
   std::uniform_real_distribution<float> uniformDist(0.0f, 1.0f);
-  if (uniformDist(rng) < jumpIntensity) {
-    std::normal_distribution<float> jumpDist(jumpSize, std::abs(jumpSize));
-    float jump = jumpDist(rng);
+  bool jumps = uniformDist(rng) < jumpIntensity;
+  float jumpZ = rng.conditionalNormal(jumps);
+  if (jumps) {
+    float jump = jumpZ * std::abs(jumpSize) + jumpSize;
     gbmPrice *= (1.0f + jump);
   }
 
   return gbmPrice;
 }
 
+RegimeSpec JumpDiffusionRegime::spec() const {
+  return {"JumpDiffusion", {mu, sigma, jumpIntensity, jumpSize}};
+}
+
 // --- MomentumRegime ---
 
 MomentumRegime::MomentumRegime(float mu, float sigma, float momentum)
-    : mu(mu), sigma(sigma), momentum(momentum), prevReturn(0.0f) {}
+    : mu(mu), sigma(sigma), momentum(momentum) {}
 
-float MomentumRegime::update(float val, std::mt19937 &rng) {
-  std::normal_distribution<float> norm(0.0f, 1.0f);
-  float z = norm(rng);
+float MomentumRegime::update(float val, int day, RegimeState &state,
+                             RandomSource &rng) const {
+  (void)day;
+  float z = rng.normal();
   float dt = 1.0f;
-  float driftEff = mu + momentum * prevReturn;
+  float driftEff = mu + momentum * state.prevReturn;
   float newVal = val * std::exp((driftEff - 0.5f * sigma * sigma) * dt +
                                  sigma * std::sqrt(dt) * z);
-  prevReturn = (newVal - val) / val;
+  state.prevReturn = (newVal - val) / val;
   return newVal;
 }
 
+RegimeSpec MomentumRegime::spec() const {
+  return {"Momentum", {mu, sigma, momentum}};
+}
+
 // --- TrendingMeanReversionRegime ---
 
 TrendingMeanReversionRegime::TrendingMeanReversionRegime(float mu, float drift,
                                                          float theta, float sigma)
-    : mu(mu), drift(drift), theta(theta), sigma(sigma), step(0) {}
+    : mu(mu), drift(drift), theta(theta), sigma(sigma) {}
 
-float TrendingMeanReversionRegime::update(float val, std::mt19937 &rng) {
-  std::normal_distribution<float> norm(0.0f, 1.0f);
-  float z = norm(rng);
+float TrendingMeanReversionRegime::update(float val, int day,
+                                          RegimeState &state,
+                                          RandomSource &rng) const {
+  (void)day;
+  float z = rng.normal();
   float dt = 1.0f;
-  float trendingMu = mu + drift * static_cast<float>(step);
+  float trendingMu = mu + drift * static_cast<float>(state.steps);
   float newVal = val + theta * (trendingMu - val) * dt + sigma * z;
-  step++;
+  state.steps++;
   return newVal;
 }
 
+RegimeSpec TrendingMeanReversionRegime::spec() const {
+  return {"TrendingMeanReversion", {mu, drift, theta, sigma}};
+}
+
 // --- EarningsRegime ---
 
 EarningsRegime::EarningsRegime(float targetMin, float targetMax, int numDays,
                                float noise)
-    : targetMin(targetMin), targetMax(targetMax), numDays(numDays), noise(noise),
-      startDay(-1), relativeDay(0), targetPrice(0.0f), basePrice(0.0f),
-      noiseAccum(0.0f), mode(-1), initialized(false) {}
-
-void EarningsRegime::setDayIndex(int day) {
-  if (startDay < 0)
-    startDay = day;
-  relativeDay = day - startDay;
-}
-
-float EarningsRegime::update(float val, std::mt19937 &rng) {
-  if (!initialized) {
-    basePrice = val;
+    : targetMin(targetMin), targetMax(targetMax), numDays(numDays),
+      noise(noise) {}
+
+float EarningsRegime::update(float val, int day, RegimeState &state,
+                             RandomSource &rng) const {
+  RegimeEvent &event = *state.event;
+  if (event.startDay < 0) {
+    event.startDay = day;
+    event.basePrice = val;
     std::uniform_int_distribution<int> modeDist(0, 2);
-    mode = modeDist(rng);
+    event.mode = modeDist(rng);
     std::uniform_real_distribution<float> targetDist(targetMin, targetMax);
-    targetPrice = targetDist(rng);
-    initialized = true;
+    event.targetPrice = targetDist(rng);
   }
+  int relativeDay = day - event.startDay;
+  int mode = event.mode;
+  float basePrice = event.basePrice;
+  float targetPrice = event.targetPrice;
 
   float progress =
       (numDays <= 1) ? 1.0f
@@ -182,10 +265,14 @@ float EarningsRegime::update(float val, std::mt19937 &rng) {
   }
 
   // Mean-reverting GBM-style noise
-  std::normal_distribution<float> norm(0.0f, 1.0f);
-  float z = norm(rng);
-  noiseAccum = noiseAccum * 0.95f + noise * z;
-  return price * (1.0f + noiseAccum);
+  float z = rng.normal();
+  event.noiseAccum = event.noiseAccum * 0.95f + noise * z;
+  return price * (1.0f + event.noiseAccum);
+}
+
+RegimeSpec EarningsRegime::spec() const {
+  return {"Earnings",
+          {targetMin, targetMax, static_cast<float>(numDays), noise}};
 }
 
 // --- DeadCatBounceRegime ---
@@ -194,20 +281,17 @@ DeadCatBounceRegime::DeadCatBounceRegime(float dropRate, float recoveryRate,
                                          float declineRate, int numDays,
                                          float noise)
     : dropRate(dropRate), recoveryRate(recoveryRate), declineRate(declineRate),
-      numDays(numDays), noise(noise), startDay(-1), relativeDay(0),
-      basePrice(0.0f), noiseAccum(0.0f), initialized(false) {}
-
-void DeadCatBounceRegime::setDayIndex(int day) {
-  if (startDay < 0)
-    startDay = day;
-  relativeDay = day - startDay;
-}
-
-float DeadCatBounceRegime::update(float val, std::mt19937 &rng) {
-  if (!initialized) {
-    basePrice = val;
-    initialized = true;
+      numDays(numDays), noise(noise) {}
+
+float DeadCatBounceRegime::update(float val, int day, RegimeState &state,
+                                  RandomSource &rng) const {
+  RegimeEvent &event = *state.event;
+  if (event.startDay < 0) {
+    event.startDay = day;
+    event.basePrice = val;
   }
+  int relativeDay = day - event.startDay;
+  float basePrice = event.basePrice;
 
   int phase1End = numDays * 30 / 100;
   int phase2End = numDays * 60 / 100;
@@ -243,10 +327,15 @@ float DeadCatBounceRegime::update(float val, std::mt19937 &rng) {
   }
 
   // Mean-reverting GBM-style noise
-  std::normal_distribution<float> norm(0.0f, 1.0f);
-  float z = norm(rng);
-  noiseAccum = noiseAccum * 0.95f + noise * z;
-  return price * (1.0f + noiseAccum);
+  float z = rng.normal();
+  event.noiseAccum = event.noiseAccum * 0.95f + noise * z;
+  return price * (1.0f + event.noiseAccum);
+}
+
+RegimeSpec DeadCatBounceRegime::spec() const {
+  return {"DeadCatBounce",
+          {dropRate, recoveryRate, declineRate, static_cast<float>(numDays),
+           noise}};
 }
 
 // --- InverseDeadCatBounceRegime ---
@@ -255,21 +344,18 @@ InverseDeadCatBounceRegime::InverseDeadCatBounceRegime(
     float riseRate, float pullbackRate, float continueRate, int numDays,
     float noise)
     : riseRate(riseRate), pullbackRate(pullbackRate),
-      continueRate(continueRate), numDays(numDays), noise(noise),
-      startDay(-1), relativeDay(0), basePrice(0.0f), noiseAccum(0.0f),
-      initialized(false) {}
-
-void InverseDeadCatBounceRegime::setDayIndex(int day) {
-  if (startDay < 0)
-    startDay = day;
-  relativeDay = day - startDay;
-}
-
-float InverseDeadCatBounceRegime::update(float val, std::mt19937 &rng) {
-  if (!initialized) {
-    basePrice = val;
-    initialized = true;
+      continueRate(continueRate), numDays(numDays), noise(noise) {}
+
+float InverseDeadCatBounceRegime::update(float val, int day,
+                                         RegimeState &state,
+                                         RandomSource &rng) const {
+  RegimeEvent &event = *state.event;
+  if (event.startDay < 0) {
+    event.startDay = day;
+    event.basePrice = val;
   }
+  int relativeDay = day - event.startDay;
+  float basePrice = event.basePrice;
 
   int phase1End = numDays * 30 / 100;
   int phase2End = numDays * 60 / 100;
@@ -305,8 +391,137 @@ float InverseDeadCatBounceRegime::update(float val, std::mt19937 &rng) {
   }
 
   // Mean-reverting GBM-style noise
-  std::normal_distribution<float> norm(0.0f, 1.0f);
-  float z = norm(rng);
-  noiseAccum = noiseAccum * 0.95f + noise * z;
-  return price * (1.0f + noiseAccum);
+  float z = rng.normal();
+  event.noiseAccum = event.noiseAccum * 0.95f + noise * z;
+  return price * (1.0f + event.noiseAccum);
+}
+
+RegimeSpec InverseDeadCatBounceRegime::spec() const {
+  return {"InverseDeadCatBounce",
+          {riseRate, pullbackRate, continueRate, static_cast<float>(numDays),
+           noise}};
+}
+
+// --- Regime registry ---
+
+namespace {
+
+const std::map<std::string, std::vector<RegimeParamDef>> &registry() {
+  // Defaults mirror the Python bindings in main.cpp.
+  static const std::map<std::string, std::vector<RegimeParamDef>> defs = {
+      {"RandomWalk", {{"volatility", 0.01f}}},
+      {"SineWave",
+       {{"volatility", 0.01f}, {"amplitude", 1.0f}, {"phase", 0.0f}}},
+      {"Drop", {{"rate", 0.01f}}},
+      {"Spike", {{"rate", 0.05f}}},
+      {"GBM", {{"mu", 0.0005f}, {"sigma", 0.02f}}},
+      {"MeanReversion", {{"mu", 100.0f}, {"theta", 0.1f}, {"sigma", 0.5f}}},
+      {"JumpDiffusion",
+       {{"mu", 0.0f},
+        {"sigma", 0.02f},
+        {"jump_intensity", 0.1f},
+        {"jump_size", 0.05f}}},
+      {"Momentum", {{"mu", 0.0f}, {"sigma", 0.02f}, {"momentum", 0.0f}}},
+      {"TrendingMeanReversion",
+       {{"mu", 100.0f}, {"drift", 0.0f}, {"theta", 0.1f}, {"sigma", 0.5f}}},
+      {"Earnings",
+       {{"target_min", 90.0f},
+        {"target_max", 110.0f},
+        {"num_days", 5.0f, true},
+        {"noise", 0.02f}}},
+      {"DeadCatBounce",
+       {{"drop_rate", 0.3f},
+        {"recovery_rate", 0.5f},
+        {"decline_rate", 0.2f},
+        {"num_days", 30.0f, true},
+        {"noise", 0.02f}}},
+      {"InverseDeadCatBounce",
+       {{"rise_rate", 0.3f},
+        {"pullback_rate", 0.5f},
+        {"continue_rate", 0.2f},
+        {"num_days", 30.0f, true},
+        {"noise", 0.02f}}},
+  };
+  return defs;
+}
+
+} // namespace
+
+const std::vector<RegimeParamDef> &regimeParamDefs(const std::string &type) {
+  auto it = registry().find(type);
+  if (it == registry().end()) {
+    throw std::invalid_argument("Unknown regime type: " + type);
+  }
+  return it->second;
+}
+
+void checkRegimeParam(const std::string &type, const RegimeParamDef &def,
+                      float value) {
+  if (def.integral && value != std::floor(value)) {
+    throw std::invalid_argument("Parameter '" + def.name + "' for regime " +
+                                type + " must be an integer");
+  }
+}
+
+RegimeSpec makeRegimeSpec(
+    const std::string &type,
+    const std::vector<std::pair<std::string, float>> &params) {
+  const auto &defs = regimeParamDefs(type);
+  RegimeSpec spec{type, {}};
+  for (const auto &def : defs) {
+    spec.params.push_back(def.defaultValue);
+  }
+  for (const auto &[name, value] : params) {
+    size_t i = 0;
+    while (i < defs.size() && defs[i].name != name) {
+      i++;
+    }
+    if (i == defs.size()) {
+      throw std::invalid_argument("Unknown parameter '" + name +
+                                  "' for regime " + type);
+    }
+    checkRegimeParam(type, defs[i], value);
+    spec.params[i] = value;
+  }
+  return spec;
+}
+
+std::shared_ptr<Regime> makeRegime(const RegimeSpec &spec) {
+  if (spec.instance) {
+    return spec.instance;
+  }
+  const auto &p = spec.params;
+  if (p.size() != regimeParamDefs(spec.type).size()) {
+    throw std::invalid_argument("Wrong parameter count for regime " +
+                                spec.type);
+  }
+  const std::string &t = spec.type;
+  if (t == "RandomWalk")
+    return std::make_shared<RandomWalkRegime>(p[0]);
+  if (t == "SineWave")
+    return std::make_shared<SineWaveRegime>(p[0], p[1], p[2]);
+  if (t == "Drop")
+    return std::make_shared<DropRegime>(p[0]);
+  if (t == "Spike")
+    return std::make_shared<SpikeRegime>(p[0]);
+  if (t == "GBM")
+    return std::make_shared<GBMRegime>(p[0], p[1]);
+  if (t == "MeanReversion")
+    return std::make_shared<MeanReversionRegime>(p[0], p[1], p[2]);
+  if (t == "JumpDiffusion")
+    return std::make_shared<JumpDiffusionRegime>(p[0], p[1], p[2], p[3]);
+  if (t == "Momentum")
+    return std::make_shared<MomentumRegime>(p[0], p[1], p[2]);
+  if (t == "TrendingMeanReversion")
+    return std::make_shared<TrendingMeanReversionRegime>(p[0], p[1], p[2],
+                                                         p[3]);
+  if (t == "Earnings")
+    return std::make_shared<EarningsRegime>(p[0], p[1],
+                                            static_cast<int>(p[2]), p[3]);
+  if (t == "DeadCatBounce")
+    return std::make_shared<DeadCatBounceRegime>(p[0], p[1], p[2],
+                                                 static_cast<int>(p[3]), p[4]);
+  // InverseDeadCatBounce (the registry lookup above rejects unknown types)
+  return std::make_shared<InverseDeadCatBounceRegime>(
+      p[0], p[1], p[2], static_cast<int>(p[3]), p[4]);
 }
@@ -1,13 +1,80 @@
 #pragma once
+#include "Random.h"
 #include <cmath>
 #include <memory>
 #include <random>
+#include <string>
+#include <utility>
+#include <vector>
+
+class Regime;
+
+// Declarative description of a regime: its Python-facing type name plus the
+// full list of constructor parameters in declaration order. Regimes that
+// cannot be rebuilt from parameters (custom block regimes) carry the shared
+// instance itself instead.
+struct RegimeSpec {
+  std::string type;
+  std::vector<float> params;
+  std::shared_ptr<Regime> instance = nullptr;
+};
+
+// Outcome of an event regime (Earnings, DeadCatBounce, InverseDeadCatBounce)
+// on one path: the day and price it started from, its mean-reverting noise
+// and, for Earnings, the drawn path shape and target. It belongs to the
+// path, not a price series, so buy and sell share one and follow the same
+// event; each side's update still adds its own shock to the noise.
+struct RegimeEvent {
+  int startDay = -1;        // day of the first update
+  float basePrice = 0.0f;   // price before the first update
+  float targetPrice = 0.0f; // Earnings
+  float noiseAccum = 0.0f;
+  int mode = -1; // Earnings path: 0=instant, 1=linear, 2=ease-in-out
+};
+
+// Mutable state of one regime for one price series of one path. The engine
+// creates a fresh state per scheduled segment, path and series (buy, sell or
+// mid), pointing at a RegimeEvent shared by the path's series, so regimes
+// themselves are immutable and can be shared freely across runs and threads.
+// Stateless regimes ignore it.
+struct RegimeState {
+  RegimeEvent *event = nullptr; // set by the engine
+  int steps = 0;                // updates so far
+  float prevReturn = 0.0f;      // Momentum
+};
 
 class Regime {
 public:
   virtual ~Regime() = default;
-  virtual void setDayIndex(int day) { (void)day; }
-  virtual float update(float val, std::mt19937 &rng) = 0;
+  // Price after `day`, given the price before it.
+  virtual float update(float val, int day, RegimeState &state,
+                       RandomSource &rng) const = 0;
+  // Type and constructor parameters; makeRegime(spec()) yields an equal
+  // regime.
+  virtual RegimeSpec spec() const = 0;
+};
+
+// Regime whose dynamics are computed a whole run of days at a time. The
+// engine pre-draws drawsPerDay() standard normals per day and makes one
+// simulateBlock call per contiguous run instead of one update per day. Block
+// regimes receive all their inputs per call, so one instance is shared by
+// every run and path (spec() hands out the instance itself).
+class BlockRegime : public Regime,
+                    public std::enable_shared_from_this<BlockRegime> {
+private:
+  int draws;
+
+public:
+  explicit BlockRegime(int drawsPerDay);
+  int drawsPerDay() const { return draws; }
+  // Fill out[k] with the price after day days[k] for k < count, starting
+  // from `start`. normals holds count * drawsPerDay() values, one row per day.
+  virtual void simulateBlock(const float *normals, const int *days, int count,
+                             float start, float *out) const = 0;
+  // Single-day fallback; the engine itself always goes through simulateBlock.
+  float update(float val, int day, RegimeState &state,
+               RandomSource &rng) const override;
+  RegimeSpec spec() const override;
 };
 
 class RandomWalkRegime : public Regime {
@@ -16,7 +83,9 @@ private:
 
 public:
   explicit RandomWalkRegime(float volatility);
-  float update(float val, std::mt19937 &rng) override;
+  float update(float val, int day, RegimeState &state,
+               RandomSource &rng) const override;
+  RegimeSpec spec() const override;
 };
 
 class SineWaveRegime : public Regime {
@@ -24,12 +93,12 @@ private:
   float volatility;
   float amplitude;
   float phase;
-  int dayIndex;
 
 public:
   SineWaveRegime(float volatility, float amplitude, float phase);
-  void setDayIndex(int day) override;
-  float update(float val, std::mt19937 &rng) override;
+  float update(float val, int day, RegimeState &state,
+               RandomSource &rng) const override;
+  RegimeSpec spec() const override;
 };
 
 class DropRegime : public Regime {
@@ -38,7 +107,9 @@ private:
 
 public:
   explicit DropRegime(float rate);
-  float update(float val, std::mt19937 &rng) override;
+  float update(float val, int day, RegimeState &state,
+               RandomSource &rng) const override;
+  RegimeSpec spec() const override;
 };
 
 class SpikeRegime : public Regime {
@@ -47,7 +118,9 @@ private:
 
 public:
   explicit SpikeRegime(float rate);
-  float update(float val, std::mt19937 &rng) override;
+  float update(float val, int day, RegimeState &state,
+               RandomSource &rng) const override;
+  RegimeSpec spec() const override;
 };
 
 class GBMRegime : public Regime {
@@ -57,7 +130,9 @@ private:
 
 public:
   GBMRegime(float mu, float sigma);
-  float update(float val, std::mt19937 &rng) override;
+  float update(float val, int day, RegimeState &state,
+               RandomSource &rng) const override;
+  RegimeSpec spec() const override;
 };
 
 class MeanReversionRegime : public Regime {
@@ -68,7 +143,9 @@ private:
 
 public:
   MeanReversionRegime(float mu, float theta, float sigma);
-  float update(float val, std::mt19937 &rng) override;
+  float update(float val, int day, RegimeState &state,
+               RandomSource &rng) const override;
+  RegimeSpec spec() const override;
 };
 
 class JumpDiffusionRegime : public Regime {
@@ -81,7 +158,9 @@ private:
 public:
   JumpDiffusionRegime(float mu, float sigma, float jumpIntensity,
                       float jumpSize);
-  float update(float val, std::mt19937 &rng) override;
+  float update(float val, int day, RegimeState &state,
+               RandomSource &rng) const override;
+  RegimeSpec spec() const override;
 };
 
 class MomentumRegime : public Regime {
@@ -89,11 +168,12 @@ private:
   float mu;
   float sigma;
   float momentum;
-  float prevReturn;
 
 public:
   MomentumRegime(float mu, float sigma, float momentum);
-  float update(float val, std::mt19937 &rng) override;
+  float update(float val, int day, RegimeState &state,
+               RandomSource &rng) const override;
+  RegimeSpec spec() const override;
 };
 
 class TrendingMeanReversionRegime : public Regime {
@@ -102,11 +182,12 @@ private:
   float drift;
   float theta;
   float sigma;
-  int step;
 
 public:
   TrendingMeanReversionRegime(float mu, float drift, float theta, float sigma);
-  float update(float val, std::mt19937 &rng) override;
+  float update(float val, int day, RegimeState &state,
+               RandomSource &rng) const override;
+  RegimeSpec spec() const override;
 };
 
 class EarningsRegime : public Regime {
@@ -115,18 +196,12 @@ private:
   float targetMax;
   int numDays;
   float noise;
-  int startDay;
-  int relativeDay;
-  float targetPrice;
-  float basePrice;
-  float noiseAccum;
-  int mode; // 0=instant, 1=linear, 2=ease-in-out
-  bool initialized;
 
 public:
   EarningsRegime(float targetMin, float targetMax, int numDays, float noise);
-  void setDayIndex(int day) override;
-  float update(float val, std::mt19937 &rng) override;
+  float update(float val, int day, RegimeState &state,
+               RandomSource &rng) const override;
+  RegimeSpec spec() const override;
 };
 
 class DeadCatBounceRegime : public Regime {
@@ -136,17 +211,13 @@ private:
   float declineRate;
   int numDays;
   float noise;
-  int startDay;
-  int relativeDay;
-  float basePrice;
-  float noiseAccum;
-  bool initialized;
 
 public:
   DeadCatBounceRegime(float dropRate, float recoveryRate, float declineRate,
                       int numDays, float noise);
-  void setDayIndex(int day) override;
-  float update(float val, std::mt19937 &rng) override;
+  float update(float val, int day, RegimeState &state,
+               RandomSource &rng) const override;
+  RegimeSpec spec() const override;
 };
 
 class InverseDeadCatBounceRegime : public Regime {
@@ -156,17 +227,13 @@ private:
   float continueRate;
   int numDays;
   float noise;
-  int startDay;
-  int relativeDay;
-  float basePrice;
-  float noiseAccum;
-  bool initialized;
 
 public:
   InverseDeadCatBounceRegime(float riseRate, float pullbackRate,
                              float continueRate, int numDays, float noise);
-  void setDayIndex(int day) override;
-  float update(float val, std::mt19937 &rng) override;
+  float update(float val, int day, RegimeState &state,
+               RandomSource &rng) const override;
+  RegimeSpec spec() const override;
 };
 
 struct RegimeAssignment {
@@ -177,3 +244,27 @@ struct RegimeAssignment {
   RegimeAssignment(std::shared_ptr<Regime> regime, int startDay, int endDay)
       : regime(std::move(regime)), startDay(startDay), endDay(endDay) {}
 };
+
+struct RegimeParamDef {
+  std::string name;
+  float defaultValue;
+  bool integral = false; // the constructor takes an int
+};
+
+// Constructor parameters (name, default and whether it is an integer) for a
+// regime type, in the order the constructor takes them. Throws
+// std::invalid_argument for unknown types.
+const std::vector<RegimeParamDef> &regimeParamDefs(const std::string &type);
+
+// Throws std::invalid_argument if `value` is not valid for parameter `def`
+// of a regime of the given type (e.g. a fractional integer parameter).
+void checkRegimeParam(const std::string &type, const RegimeParamDef &def,
+                      float value);
+
+// Build a spec from named overrides; unspecified parameters take defaults.
+RegimeSpec
+makeRegimeSpec(const std::string &type,
+               const std::vector<std::pair<std::string, float>> &params);
+
+// Construct a regime from a spec (custom regimes return their instance).
+std::shared_ptr<Regime> makeRegime(const RegimeSpec &spec);
@@ -0,0 +1,130 @@
+#include "RegimeGenerator.h"
+#include "Simulation.h"
+#include <algorithm>
+#include <stdexcept>
+
+namespace {
+
+std::vector<float> toCdf(const std::vector<float> &weights,
+                         const std::string &what) {
+  std::vector<float> cdf(weights.size());
+  float total = 0.0f;
+  for (size_t i = 0; i < weights.size(); i++) {
+    if (!(weights[i] >= 0.0f)) {
+      throw std::invalid_argument(what + " has a negative probability");
+    }
+    total += weights[i];
+    cdf[i] = total;
+  }
+  if (total <= 0.0f) {
+    throw std::invalid_argument(what + " has no positive probability");
+  }
+  for (float &c : cdf) {
+    c /= total;
+  }
+  cdf.back() = 1.0f;
+  return cdf;
+}
+
+int drawFromCdf(const std::vector<float> &cdf, std::mt19937 &rng) {
+  std::uniform_real_distribution<float> uniform(0.0f, 1.0f);
+  float u = uniform(rng);
+  auto it = std::upper_bound(cdf.begin(), cdf.end(), u);
+  // float rounding can produce u == 1.0f; fall back to the last live state
+  if (it == cdf.end()) {
+    it = std::lower_bound(cdf.begin(), cdf.end(), 1.0f);
+  }
+  return static_cast<int>(it - cdf.begin());
+}
+
+} // namespace
+
+MarkovRegimeGenerator::MarkovRegimeGenerator(
+    std::vector<std::pair<std::string, std::shared_ptr<Regime>>> regimes,
+    std::vector<std::vector<float>> transitions,
+    std::vector<std::pair<int, int>> dwellDays,
+    std::optional<std::vector<float>> initial)
+    : dwellDays(std::move(dwellDays)) {
+  size_t n = regimes.size();
+  if (n == 0) {
+    throw std::invalid_argument("Need at least one regime");
+  }
+  if (transitions.size() != n || this->dwellDays.size() != n) {
+    throw std::invalid_argument(
+        "Transition matrix and dwell times must have one row per regime");
+  }
+  for (size_t i = 0; i < n; i++) {
+    if (!regimes[i].second) {
+      throw std::invalid_argument("Regime must not be None");
+    }
+    labels.push_back(regimes[i].first);
+    this->regimes.push_back(regimes[i].second);
+    if (transitions[i].size() != n) {
+      throw std::invalid_argument("Transition matrix must be square");
+    }
+    transitionCdfs.push_back(toCdf(
+        transitions[i], "Transition row " + std::to_string(i)));
+    auto [minDays, maxDays] = this->dwellDays[i];
+    if (minDays < 1 || maxDays < minDays) {
+      throw std::invalid_argument(
+          "Dwell times must satisfy 1 <= min_days <= max_days");
+    }
+  }
+  if (initial.has_value()) {
+    if (initial->size() != n) {
+      throw std::invalid_argument(
+          "Initial distribution must have one entry per regime");
+    }
+    initialCdf = toCdf(*initial, "Initial distribution");
+  } else {
+    initialCdf = toCdf(std::vector<float>(n, 1.0f), "Initial distribution");
+  }
+}
+
+std::vector<int> MarkovRegimeGenerator::sampleStates(int numDays,
+                                                     std::mt19937 &rng) const {
+  std::vector<int> states;
+  states.reserve(numDays);
+  int state = drawFromCdf(initialCdf, rng);
+  while (static_cast<int>(states.size()) < numDays) {
+    auto [minDays, maxDays] = dwellDays[state];
+    std::uniform_int_distribution<int> dwellDist(minDays, maxDays);
+    int dwell = std::min(dwellDist(rng),
+                         numDays - static_cast<int>(states.size()));
+    states.insert(states.end(), dwell, state);
+    state = drawFromCdf(transitionCdfs[state], rng);
+  }
+  return states;
+}
+
+MarkovSimulation
+MarkovRegimeGenerator::simulate(float startBuyPrice, float startSellPrice,
+                                int numDays,
+                                std::optional<unsigned int> seed) const {
+  if (numDays <= 0) {
+    throw std::invalid_argument("num_days must be positive");
+  }
+  std::mt19937 rng(resolveSeed(seed));
+  std::vector<int> states = sampleStates(numDays, rng);
+  unsigned int priceSeed = rng();
+
+  // One segment per contiguous run of the same state. A self-transition
+  // continues the run rather than restarting the regime.
+  std::vector<RegimeAssignment> assignments;
+  int segStart = 0;
+  for (int d = 1; d <= numDays; d++) {
+    if (d == numDays || states[d] != states[segStart]) {
+      assignments.emplace_back(regimes[states[segStart]], segStart, d);
+      segStart = d;
+    }
+  }
+
+  MarkovSimulation result;
+  result.market = std::make_unique<MarketData>(
+      startBuyPrice, startSellPrice, std::move(assignments), priceSeed);
+  result.labels.reserve(numDays);
+  for (int s : states) {
+    result.labels.push_back(labels[s]);
+  }
+  return result;
+}
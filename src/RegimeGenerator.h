@@ -0,0 +1,47 @@
+#pragma once
+#include "MarketData.h"
+#include "Regime.h"
+#include <memory>
+#include <optional>
+#include <random>
+#include <string>
+#include <utility>
+#include <vector>
+
+struct MarkovSimulation {
+  std::unique_ptr<MarketData> market;
+  std::vector<std::string> labels; // realized regime label for each day
+};
+
+// Samples regime schedules from a Markov chain over labelled regimes. Each
+// visit to a state lasts a dwell time drawn uniformly from that state's
+// [minDays, maxDays], after which the next state is drawn from the state's
+// row of the transition matrix. Segments share the labelled regime
+// instances; each segment starts with fresh regime state.
+class MarkovRegimeGenerator {
+public:
+  MarkovRegimeGenerator(
+      std::vector<std::pair<std::string, std::shared_ptr<Regime>>> regimes,
+      std::vector<std::vector<float>> transitions,
+      std::vector<std::pair<int, int>> dwellDays,
+      std::optional<std::vector<float>> initial = std::nullopt);
+
+  // Per-day state indices for a schedule of numDays days.
+  std::vector<int> sampleStates(int numDays, std::mt19937 &rng) const;
+
+  // Sample a schedule and simulate it. The seed drives both the schedule and
+  // the prices, so equal seeds give identical labels and prices.
+  MarkovSimulation
+  simulate(float startBuyPrice, float startSellPrice, int numDays,
+           std::optional<unsigned int> seed = std::nullopt) const;
+
+  const std::vector<std::string> &getLabels() const { return labels; }
+
+private:
+  std::vector<std::string> labels;
+  std::vector<std::shared_ptr<Regime>> regimes;
+  // Cumulative, normalized probabilities for the next and the first state
+  std::vector<std::vector<float>> transitionCdfs;
+  std::vector<float> initialCdf;
+  std::vector<std::pair<int, int>> dwellDays;
+};
@@ -0,0 +1,131 @@
+#include "Resample.h"
+
+#include <algorithm>
+#include <cmath>
+#include <limits>
+#include <stdexcept>
+#include <vector>
+
+namespace resample {
+
+Series stride(const std::vector<float>& values, int first_day, int step) {
+    if (step <= 0) {
+        throw std::invalid_argument("step must be positive");
+    }
+    Series result;
+    size_t count = (values.size() + step - 1) / step;
+    result.days.reserve(count);
+    result.values.reserve(count);
+    for (size_t i = 0; i < values.size(); i += step) {
+        result.days.push_back(first_day + static_cast<int>(i));
+        result.values.push_back(values[i]);
+    }
+    return result;
+}
+
+OHLCResult ohlc(const std::vector<float>& values, int first_day, int bucket_days) {
+    if (bucket_days <= 0) {
+        throw std::invalid_argument("bucket_days must be positive");
+    }
+    const float nan = std::numeric_limits<float>::quiet_NaN();
+    OHLCResult result;
+    int n = static_cast<int>(values.size());
+    int i = 0;
+    while (i < n) {
+        int day = first_day + i;
+        int bucket_end = (day / bucket_days + 1) * bucket_days;
+        int stop = std::min(n, bucket_end - first_day);
+        float open = nan, high = nan, low = nan, close = nan;
+        for (int j = i; j < stop; j++) {
+            float v = values[j];
+            if (std::isnan(v)) {
+                continue;
+            }
+            if (std::isnan(open)) {
+                open = high = low = v;
+            }
+            high = std::max(high, v);
+            low = std::min(low, v);
+            close = v;
+        }
+        result.days.push_back(day);
+        result.open.push_back(open);
+        result.high.push_back(high);
+        result.low.push_back(low);
+        result.close.push_back(close);
+        i = stop;
+    }
+    return result;
+}
+
+Series lttb(const std::vector<float>& values, int first_day, int threshold) {
+    if (threshold < 3) {
+        throw std::invalid_argument("threshold must be at least 3");
+    }
+    std::vector<int> idx;
+    idx.reserve(values.size());
+    for (int i = 0; i < static_cast<int>(values.size()); i++) {
+        if (!std::isnan(values[i])) {
+            idx.push_back(i);
+        }
+    }
+
+    Series result;
+    int n = static_cast<int>(idx.size());
+    if (n <= threshold) {
+        for (int i : idx) {
+            result.days.push_back(first_day + i);
+            result.values.push_back(values[i]);
+        }
+        return result;
+    }
+
+    result.days.reserve(threshold);
+    result.values.reserve(threshold);
+    // Interior points are split into threshold - 2 buckets of near-equal size
+    auto bound = [&](int b) {
+        return 1 + static_cast<int>(static_cast<long long>(b) * (n - 2) / (threshold - 2));
+    };
+    int a = 0;  // previously selected point
+    result.days.push_back(first_day + idx[0]);
+    result.values.push_back(values[idx[0]]);
+    for (int b = 0; b < threshold - 2; b++) {
+        int lo = bound(b);
+        int hi = bound(b + 1);
+        // Average of the next bucket (the last point for the final bucket)
+        int next_lo = hi;
+        int next_hi = bound(b + 2);
+        if (b == threshold - 3) {
+            next_lo = n - 1;
+            next_hi = n;
+        }
+        double avg_x = 0.0, avg_y = 0.0;
+        for (int j = next_lo; j < next_hi; j++) {
+            avg_x += idx[j];
+            avg_y += values[idx[j]];
+        }
+        avg_x /= (next_hi - next_lo);
+        avg_y /= (next_hi - next_lo);
+
+        double ax = idx[a];
+        double ay = values[idx[a]];
+        double max_area = -1.0;
+        int chosen = lo;
+        for (int j = lo; j < hi; j++) {
+            double area = std::fabs((ax - avg_x) * (values[idx[j]] - ay) -
+                                    (ax - idx[j]) * (avg_y - ay));
+            if (area > max_area) {
+                max_area = area;
+                chosen = j;
+            }
+        }
+        result.days.push_back(first_day + idx[chosen]);
+        result.values.push_back(values[idx[chosen]]);
+        a = chosen;
+    }
+    result.days.push_back(first_day + idx[n - 1]);
+    result.values.push_back(values[idx[n - 1]]);
+    return result;
+}
+
+} // namespace resample
@@ -0,0 +1,36 @@
+#pragma once
+#include <vector>
+
+// Reduce a day-indexed series to fewer points for charting. Inputs are the
+// values for consecutive days starting at `first_day`; outputs carry the day
+// index of every point they keep.
+namespace resample {
+
+struct Series {
+    std::vector<int> days;
+    std::vector<float> values;
+};
+
+// Every `step`-th day, starting at first_day.
+Series stride(const std::vector<float>& values, int first_day, int step);
+
+struct OHLCResult {
+    std::vector<int> days;  // first day of each bucket within the input
+    std::vector<float> open;
+    std::vector<float> high;
+    std::vector<float> low;
+    std::vector<float> close;
+};
+// Aggregate into buckets of `bucket_days` aligned to absolute day multiples
+// (days 0..4, 5..9, ... for bucket_days = 5), so a bucket means the same thing
+// whatever range is requested. NaN values are skipped; a bucket with no
+// finite values is NaN throughout.
+OHLCResult ohlc(const std::vector<float>& values, int first_day, int bucket_days);
+
+// Largest-Triangle-Three-Buckets decimation to at most `threshold` points.
+// Keeps the first and last finite points and, from each bucket in between,
+// the point forming the largest triangle with its neighbours, which preserves
+// peaks and troughs. NaN values are dropped before decimation.
+Series lttb(const std::vector<float>& values, int first_day, int threshold);
+
+} // namespace resample
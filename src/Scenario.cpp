@@ -0,0 +1,523 @@
+#include "Scenario.h"
+#include <cmath>
+#include <cstdint>
+#include <cstdio>
+#include <cstdlib>
+#include <fstream>
+#include <mutex>
+#include <sstream>
+#include <unordered_map>
+#include <stdexcept>
+
+namespace {
+
+// --- Minimal JSON reader ---
+
+struct JsonValue {
+  enum class Kind { Null, Bool, Number, String, Array, Object };
+  Kind kind = Kind::Null;
+  bool boolean = false;
+  double number = 0.0;
+  std::string string;
+  std::vector<JsonValue> items;  // Array elements or Object values
+  std::vector<std::string> keys; // Object keys, parallel to items
+};
+
+class JsonParser {
+public:
+  explicit JsonParser(const std::string &text) : text(text), pos(0) {}
+
+  JsonValue parseDocument() {
+    JsonValue value = parseValue();
+    skipWhitespace();
+    if (pos != text.size()) {
+      fail("unexpected trailing characters");
+    }
+    return value;
+  }
+
+private:
+  const std::string &text;
+  size_t pos;
+
+  [[noreturn]] void fail(const std::string &msg) const {
+    throw std::invalid_argument("Invalid scenario JSON at offset " +
+                                std::to_string(pos) + ": " + msg);
+  }
+
+  void skipWhitespace() {
+    while (pos < text.size() && (text[pos] == ' ' || text[pos] == '\t' ||
+                                 text[pos] == '\n' || text[pos] == '\r')) {
+      pos++;
+    }
+  }
+
+  void expect(char c) {
+    skipWhitespace();
+    if (pos >= text.size() || text[pos] != c) {
+      fail(std::string("expected '") + c + "'");
+    }
+    pos++;
+  }
+
+  bool consumeLiteral(const char *lit) {
+    size_t len = std::char_traits<char>::length(lit);
+    if (text.compare(pos, len, lit) == 0) {
+      pos += len;
+      return true;
+    }
+    return false;
+  }
+
+  JsonValue parseValue() {
+    skipWhitespace();
+    if (pos >= text.size()) {
+      fail("unexpected end of input");
+    }
+    JsonValue value;
+    char c = text[pos];
+    if (c == '{') {
+      value.kind = JsonValue::Kind::Object;
+      pos++;
+      skipWhitespace();
+      if (pos < text.size() && text[pos] == '}') {
+        pos++;
+        return value;
+      }
+      while (true) {
+        skipWhitespace();
+        if (pos >= text.size() || text[pos] != '"') {
+          fail("expected object key");
+        }
+        size_t keyPos = pos;
+        std::string key = parseString();
+        for (const auto &existing : value.keys) {
+          if (existing == key) {
+            pos = keyPos;
+            fail("duplicate key '" + key + "'");
+          }
+        }
+        value.keys.push_back(std::move(key));
+        expect(':');
+        value.items.push_back(parseValue());
+        skipWhitespace();
+        if (pos < text.size() && text[pos] == ',') {
+          pos++;
+          continue;
+        }
+        expect('}');
+        return value;
+      }
+    }
+    if (c == '[') {
+      value.kind = JsonValue::Kind::Array;
+      pos++;
+      skipWhitespace();
+      if (pos < text.size() && text[pos] == ']') {
+        pos++;
+        return value;
+      }
+      while (true) {
+        value.items.push_back(parseValue());
+        skipWhitespace();
+        if (pos < text.size() && text[pos] == ',') {
+          pos++;
+          continue;
+        }
+        expect(']');
+        return value;
+      }
+    }
+    if (c == '"') {
+      value.kind = JsonValue::Kind::String;
+      value.string = parseString();
+      return value;
+    }
+    if (consumeLiteral("true")) {
+      value.kind = JsonValue::Kind::Bool;
+      value.boolean = true;
+      return value;
+    }
+    if (consumeLiteral("false")) {
+      value.kind = JsonValue::Kind::Bool;
+      return value;
+    }
+    if (consumeLiteral("null")) {
+      return value;
+    }
+    value.kind = JsonValue::Kind::Number;
+    value.number = parseNumber();
+    return value;
+  }
+
+  bool digitAt(size_t i) const {
+    return i < text.size() && text[i] >= '0' && text[i] <= '9';
+  }
+
+  // Strict JSON number: -?(0|[1-9][0-9]*)(.[0-9]+)?([eE][+-]?[0-9]+)?
+  double parseNumber() {
+    size_t start = pos;
+    size_t i = pos;
+    if (i < text.size() && text[i] == '-') {
+      i++;
+    }
+    if (!digitAt(i)) {
+      fail("unexpected character");
+    }
+    if (text[i] == '0') {
+      i++;
+    } else {
+      while (digitAt(i)) i++;
+    }
+    if (i < text.size() && text[i] == '.') {
+      i++;
+      if (!digitAt(i)) {
+        fail("expected digits after decimal point");
+      }
+      while (digitAt(i)) i++;
+    }
+    if (i < text.size() && (text[i] == 'e' || text[i] == 'E')) {
+      i++;
+      if (i < text.size() && (text[i] == '+' || text[i] == '-')) {
+        i++;
+      }
+      if (!digitAt(i)) {
+        fail("expected digits in exponent");
+      }
+      while (digitAt(i)) i++;
+    }
+    double number =
+        std::strtod(text.substr(start, i - start).c_str(), nullptr);
+    if (!std::isfinite(number)) {
+      fail("number out of range");
+    }
+    pos = i;
+    return number;
+  }
+
+  std::string parseString() {
+    pos++; // opening quote
+    std::string out;
+    while (pos < text.size() && text[pos] != '"') {
+      char c = text[pos];
+      if (static_cast<unsigned char>(c) < 0x20) {
+        fail("control character in string");
+      }
+      pos++;
+      if (c != '\\') {
+        out += c;
+        continue;
+      }
+      if (pos >= text.size()) {
+        break;
+      }
+      switch (text[pos++]) {
+      case '"': out += '"'; break;
+      case '\\': out += '\\'; break;
+      case '/': out += '/'; break;
+      case 'n': out += '\n'; break;
+      case 't': out += '\t'; break;
+      case 'r': out += '\r'; break;
+      case 'b': out += '\b'; break;
+      case 'f': out += '\f'; break;
+      case 'u': appendUtf8(out, parseCodePoint()); break;
+      default:
+        pos--;
+        fail("invalid escape in string");
+      }
+    }
+    if (pos >= text.size()) {
+      fail("unterminated string");
+    }
+    pos++; // closing quote
+    return out;
+  }
+
+  // Four hex digits after "\u".
+  uint32_t parseHex4() {
+    if (text.size() - pos < 4) {
+      fail("invalid \\u escape");
+    }
+    uint32_t value = 0;
+    for (int i = 0; i < 4; i++) {
+      char c = text[pos];
+      value <<= 4;
+      if (c >= '0' && c <= '9') {
+        value |= static_cast<uint32_t>(c - '0');
+      } else if (c >= 'a' && c <= 'f') {
+        value |= static_cast<uint32_t>(c - 'a' + 10);
+      } else if (c >= 'A' && c <= 'F') {
+        value |= static_cast<uint32_t>(c - 'A' + 10);
+      } else {
+        fail("invalid \\u escape");
+      }
+      pos++;
+    }
+    return value;
+  }
+
+  // Code point of a "\u" escape, combining a UTF-16 surrogate pair.
+  uint32_t parseCodePoint() {
+    uint32_t unit = parseHex4();
+    if (unit >= 0xDC00 && unit <= 0xDFFF) {
+      fail("unpaired surrogate in \\u escape");
+    }
+    if (unit < 0xD800 || unit > 0xDBFF) {
+      return unit;
+    }
+    if (text.compare(pos, 2, "\\u") != 0) {
+      fail("unpaired surrogate in \\u escape");
+    }
+    pos += 2;
+    uint32_t low = parseHex4();
+    if (low < 0xDC00 || low > 0xDFFF) {
+      fail("unpaired surrogate in \\u escape");
+    }
+    return 0x10000 + ((unit - 0xD800) << 10) + (low - 0xDC00);
+  }
+
+  static void appendUtf8(std::string &out, uint32_t cp) {
+    if (cp < 0x80) {
+      out += static_cast<char>(cp);
+    } else if (cp < 0x800) {
+      out += static_cast<char>(0xC0 | (cp >> 6));
+      out += static_cast<char>(0x80 | (cp & 0x3F));
+    } else if (cp < 0x10000) {
+      out += static_cast<char>(0xE0 | (cp >> 12));
+      out += static_cast<char>(0x80 | ((cp >> 6) & 0x3F));
+      out += static_cast<char>(0x80 | (cp & 0x3F));
+    } else {
+      out += static_cast<char>(0xF0 | (cp >> 18));
+      out += static_cast<char>(0x80 | ((cp >> 12) & 0x3F));
+      out += static_cast<char>(0x80 | ((cp >> 6) & 0x3F));
+      out += static_cast<char>(0x80 | (cp & 0x3F));
+    }
+  }
+};
+
+// --- Validation helpers ---
+
+const JsonValue *findKey(const JsonValue &obj, const std::string &key) {
+  for (size_t i = 0; i < obj.keys.size(); i++) {
+    if (obj.keys[i] == key) {
+      return &obj.items[i];
+    }
+  }
+  return nullptr;
+}
+
+void checkKeys(const JsonValue &obj, const std::vector<std::string> &allowed,
+               const std::string &where) {
+  for (const auto &key : obj.keys) {
+    bool ok = false;
+    for (const auto &a : allowed) {
+      ok = ok || key == a;
+    }
+    if (!ok) {
+      throw std::invalid_argument("Unknown key '" + key + "' in " + where);
+    }
+  }
+}
+
+int toDay(const JsonValue &v, const std::string &where) {
+  if (v.kind != JsonValue::Kind::Number || v.number != std::floor(v.number) ||
+      v.number < 0 || v.number > 1e9) {
+    throw std::invalid_argument(where +
+                                ": days must be non-negative integers");
+  }
+  return static_cast<int>(v.number);
+}
+
+uint64_t fnv1a(const std::string &text) {
+  uint64_t h = 14695981039346656037ULL;
+  for (unsigned char c : text) {
+    h ^= c;
+    h *= 1099511628211ULL;
+  }
+  return h;
+}
+
+ScenarioSegment parseSegment(const JsonValue &entry, size_t index) {
+  std::string where = "regimes[" + std::to_string(index) + "]";
+  if (entry.kind != JsonValue::Kind::Object) {
+    throw std::invalid_argument(where + " must be an object");
+  }
+  checkKeys(entry, {"regime", "preset", "params", "days"}, where);
+
+  const JsonValue *regime = findKey(entry, "regime");
+  const JsonValue *preset = findKey(entry, "preset");
+  if ((regime == nullptr) == (preset == nullptr)) {
+    throw std::invalid_argument(where +
+                                " needs exactly one of 'regime' or 'preset'");
+  }
+  const JsonValue *typeValue = regime ? regime : preset;
+  if (typeValue->kind != JsonValue::Kind::String) {
+    throw std::invalid_argument(where + ": regime/preset name must be a string");
+  }
+
+  std::vector<std::pair<std::string, float>> params;
+  if (const JsonValue *p = findKey(entry, "params")) {
+    if (p->kind != JsonValue::Kind::Object) {
+      throw std::invalid_argument(where + ": 'params' must be an object");
+    }
+    for (size_t i = 0; i < p->keys.size(); i++) {
+      if (p->items[i].kind != JsonValue::Kind::Number ||
+          !std::isfinite(static_cast<float>(p->items[i].number))) {
+        throw std::invalid_argument(where + ": parameter '" + p->keys[i] +
+                                    "' must be a finite number");
+      }
+      params.emplace_back(p->keys[i], static_cast<float>(p->items[i].number));
+    }
+  }
+
+  const JsonValue *days = findKey(entry, "days");
+  if (!days || days->kind != JsonValue::Kind::Array || days->items.size() != 2) {
+    throw std::invalid_argument(where + ": 'days' must be [start, end]");
+  }
+  int startDay = toDay(days->items[0], where);
+  int endDay = toDay(days->items[1], where);
+  if (startDay >= endDay) {
+    throw std::invalid_argument(where + ": empty day range");
+  }
+
+  RegimeSpec spec = regime ? makeRegimeSpec(typeValue->string, params)
+                           : makePresetSpec(typeValue->string, params);
+  return {std::move(spec), startDay, endDay};
+}
+
+// Keyed by the full text, so texts whose hashes collide never share an entry
+std::mutex cacheMutex;
+std::unordered_map<std::string, std::shared_ptr<Scenario>> &scenarioCache() {
+  static std::unordered_map<std::string, std::shared_ptr<Scenario>> cache;
+  return cache;
+}
+
+} // namespace
+
+// --- Presets ---
+
+RegimeSpec makePresetSpec(
+    const std::string &preset,
+    const std::vector<std::pair<std::string, float>> &params) {
+  // Mirrors mm_game/presets.py.
+  bool takesMu = preset == "SidewaysQuiet" ||
+                 preset == "DisbeliefMomentum" || preset == "ChopZone";
+  float scale = 1.0f;
+  float mu = 100.0f;
+  for (const auto &[name, value] : params) {
+    if (name == "scale") {
+      scale = value;
+    } else if (name == "mu" && takesMu) {
+      mu = value;
+    } else {
+      throw std::invalid_argument("Unknown parameter '" + name +
+                                  "' for preset " + preset);
+    }
+  }
+
+  if (preset == "BullQuiet")
+    return {"GBM", {0.001f, 0.005f * scale}};
+  if (preset == "BullVolatile")
+    return {"GBM", {0.003f, 0.04f * scale}};
+  if (preset == "BearQuiet")
+    return {"GBM", {-0.001f, 0.005f * scale}};
+  if (preset == "BearVolatile")
+    return {"GBM", {-0.003f, 0.04f * scale}};
+  if (preset == "SidewaysQuiet")
+    return {"MeanReversion", {mu, 0.3f, 0.2f * scale}};
+  if (preset == "Crisis")
+    return {"JumpDiffusion", {-0.005f, 0.06f * scale, 0.3f, -0.08f}};
+  if (preset == "DisbeliefMomentum")
+    return {"TrendingMeanReversion", {mu, 0.3f, 0.15f, 0.5f * scale}};
+  if (preset == "FrenzyZone")
+    return {"Momentum", {0.003f, 0.04f * scale, 0.5f}};
+  if (preset == "ChopZone")
+    return {"MeanReversion", {mu, 0.5f, 0.8f * scale}};
+  if (preset == "Transition")
+    return {"GBM", {0.0f, 0.03f * scale}};
+  throw std::invalid_argument("Unknown preset: " + preset);
+}
+
+// --- Scenario ---
+
+Scenario::Scenario(std::string name, std::vector<ScenarioSegment> segments,
+                   uint64_t hash)
+    : name(std::move(name)), segments(std::move(segments)), totalDays(0),
+      hash(hash) {
+  assignments.reserve(this->segments.size());
+  for (const auto &segment : this->segments) {
+    if (segment.endDay > totalDays) {
+      totalDays = segment.endDay;
+    }
+    assignments.emplace_back(makeRegime(segment.spec), segment.startDay,
+                             segment.endDay);
+  }
+}
+
+std::shared_ptr<Scenario> Scenario::fromJson(const std::string &text) {
+  {
+    std::lock_guard<std::mutex> lock(cacheMutex);
+    auto it = scenarioCache().find(text);
+    if (it != scenarioCache().end()) {
+      return it->second;
+    }
+  }
+
+  JsonValue root = JsonParser(text).parseDocument();
+  if (root.kind != JsonValue::Kind::Object) {
+    throw std::invalid_argument("Scenario must be a JSON object");
+  }
+  checkKeys(root, {"name", "description", "regimes"}, "scenario");
+
+  std::string name;
+  if (const JsonValue *n = findKey(root, "name")) {
+    if (n->kind != JsonValue::Kind::String) {
+      throw std::invalid_argument("Scenario 'name' must be a string");
+    }
+    name = n->string;
+  }
+  const JsonValue *regimes = findKey(root, "regimes");
+  if (!regimes || regimes->kind != JsonValue::Kind::Array ||
+      regimes->items.empty()) {
+    throw std::invalid_argument(
+        "Scenario needs a non-empty 'regimes' array");
+  }
+  std::vector<ScenarioSegment> segments;
+  for (size_t i = 0; i < regimes->items.size(); i++) {
+    segments.push_back(parseSegment(regimes->items[i], i));
+  }
+
+  std::shared_ptr<Scenario> scenario(
+      new Scenario(std::move(name), std::move(segments), fnv1a(text)));
+  std::lock_guard<std::mutex> lock(cacheMutex);
+  // Another thread may have compiled the same text meanwhile; keep the first.
+  auto inserted = scenarioCache().emplace(text, scenario);
+  return inserted.first->second;
+}
+
+std::shared_ptr<Scenario> Scenario::fromFile(const std::string &path) {
+  std::ifstream in(path, std::ios::binary);
+  if (!in) {
+    throw std::runtime_error("Cannot open scenario file: " + path);
+  }
+  std::ostringstream contents;
+  contents << in.rdbuf();
+  return fromJson(contents.str());
+}
+
+size_t Scenario::cacheSize() {
+  std::lock_guard<std::mutex> lock(cacheMutex);
+  return scenarioCache().size();
+}
+
+void Scenario::clearCache() {
+  std::lock_guard<std::mutex> lock(cacheMutex);
+  scenarioCache().clear();
+}
+
+std::string Scenario::getHash() const {
+  char buf[17];
+  std::snprintf(buf, sizeof(buf), "%016llx",
+                static_cast<unsigned long long>(hash));
+  return buf;
+}
@@ -0,0 +1,58 @@
+#pragma once
+#include "Regime.h"
+#include <cstdint>
+#include <memory>
+#include <string>
+#include <vector>
+
+struct ScenarioSegment {
+  RegimeSpec spec;
+  int startDay;
+  int endDay;
+};
+
+// A regime schedule compiled from a JSON scenario spec. Scenarios and their
+// regimes are immutable, so a single compiled scenario can back any number
+// of runs; per-run regime state lives in the simulation engine.
+//
+// Format:
+//   {
+//     "name": "crash-and-recover",                        (optional)
+//     "regimes": [
+//       {"regime": "GBM", "params": {"sigma": 0.01}, "days": [0, 50]},
+//       {"preset": "Crisis", "params": {"scale": 1.5}, "days": [50, 80]}
+//     ]
+//   }
+//
+// As with (regime, range) lists, later entries win where day ranges overlap.
+class Scenario {
+public:
+  // Parse and validate a scenario. Results are cached process-wide by their
+  // text, so loading the same spec twice returns the same object.
+  static std::shared_ptr<Scenario> fromJson(const std::string &text);
+  static std::shared_ptr<Scenario> fromFile(const std::string &path);
+  static size_t cacheSize();
+  static void clearCache();
+
+  // Assignments sharing the scenario's regime instances
+  std::vector<RegimeAssignment> instantiate() const { return assignments; }
+  const std::vector<ScenarioSegment> &getSegments() const { return segments; }
+  const std::string &getName() const { return name; }
+  int getTotalDays() const { return totalDays; }
+  std::string getHash() const;
+
+private:
+  Scenario(std::string name, std::vector<ScenarioSegment> segments,
+           uint64_t hash);
+
+  std::string name;
+  std::vector<ScenarioSegment> segments;
+  std::vector<RegimeAssignment> assignments;
+  int totalDays;
+  uint64_t hash;
+};
+
+// Resolve a preset name (as exported by mm_game.presets) to a regime spec.
+RegimeSpec makePresetSpec(
+    const std::string &preset,
+    const std::vector<std::pair<std::string, float>> &params);
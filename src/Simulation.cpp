@@ -0,0 +1,345 @@
+#include "Simulation.h"
+#include <algorithm>
+#include <chrono>
+#include <stdexcept>
+#include <utility>
+
+SpreadModel::SpreadModel(std::optional<float> mean, float reversion,
+                         float volatility, float floor)
+    : mean(mean), reversion(reversion), volatility(volatility), floor(floor) {
+  if (mean.has_value() && !(mean.value() >= 0.0f)) {
+    throw std::invalid_argument("Spread mean must be non-negative");
+  }
+  if (!(reversion >= 0.0f && reversion <= 1.0f)) {
+    throw std::invalid_argument("Spread reversion must be in [0, 1]");
+  }
+  if (!(volatility >= 0.0f) || !(floor >= 0.0f)) {
+    throw std::invalid_argument(
+        "Spread volatility and floor must be non-negative");
+  }
+}
+
+RegimeTimeline::RegimeTimeline(
+    const std::vector<RegimeAssignment> &assignments) {
+  int totalDays = 0;
+  for (const auto &assignment : assignments) {
+    totalDays = std::max(totalDays, assignment.endDay);
+  }
+  std::vector<int> daySegment(totalDays, -1);
+  for (size_t s = 0; s < assignments.size(); s++) {
+    regimes.push_back(assignments[s].regime.get());
+    for (int d = assignments[s].startDay; d < assignments[s].endDay; d++) {
+      daySegment[d] = static_cast<int>(s);
+    }
+  }
+  std::vector<const BlockRegime *> blocks;
+  for (const Regime *regime : regimes) {
+    blocks.push_back(dynamic_cast<const BlockRegime *>(regime));
+  }
+  for (int d = 0; d < totalDays; d++) {
+    int segment = daySegment[d];
+    const Regime *regime = segment >= 0 ? regimes[segment] : nullptr;
+    if (!runs.empty()) {
+      Run &last = runs.back();
+      if (last.segment == segment ||
+          (last.block && last.regime == regime)) {
+        last.end = d + 1;
+        continue;
+      }
+    }
+    runs.push_back({d, d + 1, segment, regime,
+                    segment >= 0 ? blocks[segment] : nullptr});
+  }
+}
+
+namespace {
+
+// Advance `start` through days [first, first + count) of a block regime,
+// writing the price after each day to out.
+void runBlock(const BlockRegime &regime, int first, int count, float start,
+              RandomSource &rng, float *out) {
+  std::vector<float> normals(static_cast<size_t>(count) *
+                             regime.drawsPerDay());
+  for (auto &z : normals) {
+    z = rng.normal();
+  }
+  std::vector<int> days(count);
+  for (int k = 0; k < count; k++) {
+    days[k] = first + k;
+  }
+  regime.simulateBlock(normals.data(), days.data(), count, start, out);
+}
+
+// Fresh per-segment states for one price series, all pointing at the
+// path's shared events.
+std::vector<RegimeState> freshStates(std::vector<RegimeEvent> &events) {
+  std::vector<RegimeState> states(events.size());
+  for (size_t s = 0; s < events.size(); s++) {
+    states[s].event = &events[s];
+  }
+  return states;
+}
+
+void simulateMidSpread(const RegimeTimeline &timeline, RandomSource &rng,
+                       float *buy, float *sell, const SpreadModel &model) {
+  std::vector<RegimeEvent> events(timeline.regimes.size());
+  std::vector<RegimeState> states = freshStates(events);
+  float spread = std::max(model.floor, buy[0] - sell[0]);
+  float mean = model.mean.value_or(spread);
+  float mid = (buy[0] + sell[0]) / 2.0f;
+  std::vector<float> blockMids;
+  for (const auto &run : timeline.runs) {
+    if (!run.regime) {
+      for (int d = run.start; d < run.end; d++) {
+        buy[d + 1] = mid + spread / 2.0f;
+        sell[d + 1] = mid - spread / 2.0f;
+      }
+      continue;
+    }
+    if (run.block) {
+      blockMids.resize(run.end - run.start);
+      runBlock(*run.block, run.start, run.end - run.start, mid, rng,
+               blockMids.data());
+    }
+    for (int d = run.start; d < run.end; d++) {
+      if (run.block) {
+        mid = blockMids[d - run.start];
+      } else {
+        mid = run.regime->update(mid, d, states[run.segment], rng);
+      }
+      float shock = model.volatility * rng.normal();
+      spread = std::max(model.floor,
+                        spread + model.reversion * (mean - spread) + shock);
+      buy[d + 1] = mid + spread / 2.0f;
+      sell[d + 1] = mid - spread / 2.0f;
+    }
+  }
+}
+
+} // namespace
+
+void simulateDays(const RegimeTimeline &timeline, RandomSource &rng,
+                  float *buy, float *sell,
+                  const std::optional<SpreadModel> &spread) {
+  if (spread.has_value()) {
+    simulateMidSpread(timeline, rng, buy, sell, spread.value());
+    return;
+  }
+  // Buy and sell are separate series with their own regime state, but a
+  // regime's event outcome is drawn once per path and shared by both
+  std::vector<RegimeEvent> events(timeline.regimes.size());
+  std::vector<RegimeState> buyStates = freshStates(events);
+  std::vector<RegimeState> sellStates = freshStates(events);
+  for (const auto &run : timeline.runs) {
+    if (run.block) {
+      // One call per side for the whole run: buy draws come first, then sell
+      int count = run.end - run.start;
+      runBlock(*run.block, run.start, count, buy[run.start], rng,
+               buy + run.start + 1);
+      runBlock(*run.block, run.start, count, sell[run.start], rng,
+               sell + run.start + 1);
+      for (int d = run.start + 1; d <= run.end; d++) {
+        if (sell[d] > buy[d]) {
+          std::swap(buy[d], sell[d]);
+        }
+      }
+    } else if (run.regime) {
+      RegimeState &buyState = buyStates[run.segment];
+      RegimeState &sellState = sellStates[run.segment];
+      for (int d = run.start; d < run.end; d++) {
+        float newBuy = run.regime->update(buy[d], d, buyState, rng);
+        float newSell = run.regime->update(sell[d], d, sellState, rng);
+        // Enforce ask >= bid (buy price >= sell price)
+        if (newSell > newBuy) {
+          std::swap(newBuy, newSell);
+        }
+        buy[d + 1] = newBuy;
+        sell[d + 1] = newSell;
+      }
+    } else {
+      for (int d = run.start; d < run.end; d++) {
+        buy[d + 1] = buy[d];
+        sell[d + 1] = sell[d];
+      }
+    }
+  }
+}
+
+unsigned int resolveSeed(std::optional<unsigned int> seed) {
+  if (seed.has_value()) {
+    return seed.value();
+  }
+  return static_cast<unsigned int>(
+      std::chrono::steady_clock::now().time_since_epoch().count());
+}
+
+std::vector<ScenarioSegment>
+segmentsFromAssignments(const std::vector<RegimeAssignment> &assignments) {
+  std::vector<ScenarioSegment> segments;
+  segments.reserve(assignments.size());
+  for (const auto &a : assignments) {
+    if (!a.regime) {
+      throw std::invalid_argument("Regime must not be None");
+    }
+    if (a.startDay < 0 || a.endDay < a.startDay) {
+      throw std::invalid_argument("Invalid regime day range");
+    }
+    segments.push_back({a.regime->spec(), a.startDay, a.endDay});
+  }
+  return segments;
+}
+
+// --- PathGenerator ---
+
+PathGenerator::PathGenerator(std::vector<ScenarioSegment> segments,
+                             float startBuyPrice, float startSellPrice,
+                             std::optional<SpreadModel> spread)
+    : segments(std::move(segments)), startBuyPrice(startBuyPrice),
+      startSellPrice(startSellPrice), spread(spread) {
+  regimes.reserve(this->segments.size());
+  for (const auto &segment : this->segments) {
+    regimes.emplace_back(makeRegime(segment.spec), segment.startDay,
+                         segment.endDay);
+  }
+  timeline = RegimeTimeline(regimes);
+  totalDays = timeline.getTotalDays();
+}
+
+void PathGenerator::generate(unsigned int seed, uint64_t pathIndex, float *buy,
+                             float *sell, SamplingMode mode) const {
+  RandomSource rng = pathSource(seed, pathIndex, mode);
+  generate(rng, buy, sell);
+}
+
+void PathGenerator::generate(RandomSource &rng, float *buy,
+                             float *sell) const {
+  buy[0] = startBuyPrice;
+  sell[0] = startSellPrice;
+  simulateDays(timeline, rng, buy, sell, spread);
+}
+
+// --- Reductions ---
+
+PathSummary simulateSummary(const PathGenerator &generator, int numPaths,
+                            unsigned int seed,
+                            std::vector<double> quantileLevels,
+                            double compression, SamplingMode mode,
+                            uint64_t firstPath) {
+  if (numPaths <= 0) {
+    throw std::invalid_argument("num_paths must be positive");
+  }
+  int n = generator.getTotalDays() + 1;
+  PathSummary summary(n, std::move(quantileLevels), compression);
+  std::vector<float> buy(n), sell(n), mid(n);
+  for (int k = 0; k < numPaths; k++) {
+    uint64_t p = firstPath + k;
+    generator.generate(seed, p, buy.data(), sell.data(), mode);
+    for (int d = 0; d < n; d++) {
+      mid[d] = (buy[d] + sell[d]) / 2.0f;
+    }
+    summary.addPath(mid.data(), p);
+  }
+  return summary;
+}
+
+ShardSpec::ShardSpec(unsigned int seed, int index, int count)
+    : seed(seed), index(index), count(count) {
+  if (count <= 0) {
+    throw std::invalid_argument("Shard count must be positive");
+  }
+  if (index < 0 || index >= count) {
+    throw std::invalid_argument("Shard index must be in [0, count)");
+  }
+}
+
+std::pair<uint64_t, uint64_t> ShardSpec::pathRange(uint64_t totalPaths) const {
+  if (totalPaths < static_cast<uint64_t>(count)) {
+    throw std::invalid_argument("num_paths must be at least the shard count");
+  }
+  return {totalPaths * index / count, totalPaths * (index + 1) / count};
+}
+
+void simulateMidPaths(const PathGenerator &generator, unsigned int seed,
+                      SamplingMode mode, uint64_t firstPath, int count,
+                      float *out) {
+  if (count < 0) {
+    throw std::invalid_argument("Path count must be non-negative");
+  }
+  int n = generator.getTotalDays() + 1;
+  std::vector<float> buy(n), sell(n);
+  for (int k = 0; k < count; k++) {
+    generator.generate(seed, firstPath + k, buy.data(), sell.data(), mode);
+    float *row = out + static_cast<size_t>(k) * n;
+    for (int d = 0; d < n; d++) {
+      row[d] = (buy[d] + sell[d]) / 2.0f;
+    }
+  }
+}
+
+// --- Parameter sweeps ---
+
+std::vector<ScenarioSegment>
+applyOverrides(const std::vector<ScenarioSegment> &segments,
+               const ParamOverrides &overrides) {
+  std::vector<ScenarioSegment> result = segments;
+  for (const auto &override : overrides) {
+    bool matched = false;
+    for (auto &segment : result) {
+      if (segment.spec.instance) {
+        continue; // custom regimes have no named parameters
+      }
+      const auto &defs = regimeParamDefs(segment.spec.type);
+      for (size_t i = 0; i < defs.size(); i++) {
+        if (defs[i].name == override.first) {
+          checkRegimeParam(segment.spec.type, defs[i], override.second);
+          segment.spec.params[i] = override.second;
+          matched = true;
+        }
+      }
+    }
+    if (!matched) {
+      throw std::invalid_argument("No regime in the schedule has parameter " +
+                                  override.first);
+    }
+  }
+  return result;
+}
+
+void simulateSweep(const std::vector<ScenarioSegment> &segments,
+                   float startBuyPrice, float startSellPrice,
+                   const std::optional<SpreadModel> &spread,
+                   const std::vector<ParamOverrides> &variants, int numPaths,
+                   unsigned int seed, float *out, SamplingMode mode) {
+  if (numPaths <= 0) {
+    throw std::invalid_argument("num_paths must be positive");
+  }
+  if (variants.empty()) {
+    throw std::invalid_argument("At least one variant is required");
+  }
+  std::vector<PathGenerator> generators;
+  generators.reserve(variants.size());
+  for (const auto &overrides : variants) {
+    generators.emplace_back(applyOverrides(segments, overrides),
+                            startBuyPrice, startSellPrice, spread);
+  }
+  int n = generators.front().getTotalDays() + 1;
+  std::vector<float> buy(n), sell(n);
+  RandomTape tape;
+  for (int p = 0; p < numPaths; p++) {
+    // The first variant records the path's draws; the others replay them
+    RandomSource source = pathSource(seed, static_cast<uint64_t>(p), mode);
+    source.record(tape);
+    for (size_t v = 0; v < generators.size(); v++) {
+      if (v == 0) {
+        generators[v].generate(source, buy.data(), sell.data());
+      } else {
+        RandomSource rng = source.replay(tape);
+        generators[v].generate(rng, buy.data(), sell.data());
+      }
+      float *row = out + (v * numPaths + p) * static_cast<size_t>(n);
+      for (int d = 0; d < n; d++) {
+        row[d] = (buy[d] + sell[d]) / 2.0f;
+      }
+    }
+  }
+}
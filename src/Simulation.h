@@ -0,0 +1,141 @@
+#pragma once
+#include "Regime.h"
+#include "Scenario.h"
+#include "Statistics.h"
+#include <cstdint>
+#include <optional>
+#include <random>
+#include <vector>
+
+// Opt-in pricing mode where the regime drives only the mid price and the
+// spread follows its own mean-reverting process with a floor:
+//   spread' = max(floor, spread + reversion * (mean - spread) + volatility * z)
+// buy and sell sit half a spread either side of the mid. Compared with the
+// default mode (two independent regime updates, swapped if they cross) this
+// costs one regime update plus one normal draw per day and keeps the spread
+// bounded. A missing mean defaults to the starting spread.
+struct SpreadModel {
+  std::optional<float> mean;
+  float reversion;
+  float volatility;
+  float floor;
+
+  SpreadModel(std::optional<float> mean = std::nullopt, float reversion = 0.2f,
+              float volatility = 0.02f, float floor = 0.01f);
+};
+
+// A regime schedule resolved to runs of days. Later segments win on
+// overlap. Each segment gets its own RegimeEvent per path and RegimeState per
+// path and price series, even when several segments share one regime.
+struct RegimeTimeline {
+  // Days [start, end) driven by regimes[segment], or holding the previous
+  // price when segment is -1. `block` is the regime as a BlockRegime, or
+  // null; adjacent runs of the same block regime are merged so that it is
+  // simulated in one call.
+  struct Run {
+    int start;
+    int end;
+    int segment;
+    const Regime *regime;
+    const BlockRegime *block;
+  };
+
+  std::vector<const Regime *> regimes;
+  std::vector<Run> runs;
+
+  RegimeTimeline() = default;
+  explicit RegimeTimeline(const std::vector<RegimeAssignment> &assignments);
+
+  int getTotalDays() const { return runs.empty() ? 0 : runs.back().end; }
+};
+
+// Advance buy/sell prices one day per day of the timeline. buy[0] and
+// sell[0] must hold the start prices; both arrays need getTotalDays() + 1
+// entries. Consecutive days of the same BlockRegime are simulated with one
+// simulateBlock call per price series.
+void simulateDays(const RegimeTimeline &timeline, RandomSource &rng,
+                  float *buy, float *sell,
+                  const std::optional<SpreadModel> &spread = std::nullopt);
+
+// The given seed, or a time-based one when none is provided.
+unsigned int resolveSeed(std::optional<unsigned int> seed);
+
+std::vector<ScenarioSegment>
+segmentsFromAssignments(const std::vector<RegimeAssignment> &assignments);
+
+// A regime schedule prepared for repeated path generation. Regimes are
+// built once and shared by every path; per-path state lives in the engine.
+class PathGenerator {
+public:
+  PathGenerator(std::vector<ScenarioSegment> segments, float startBuyPrice,
+                float startSellPrice,
+                std::optional<SpreadModel> spread = std::nullopt);
+
+  int getTotalDays() const { return totalDays; }
+
+  // Fill buy and sell (getTotalDays() + 1 entries each) for one path.
+  void generate(unsigned int seed, uint64_t pathIndex, float *buy, float *sell,
+                SamplingMode mode = SamplingMode::Pseudo) const;
+  // Same, drawing from the given source instead of pathSource(...).
+  void generate(RandomSource &rng, float *buy, float *sell) const;
+
+private:
+  std::vector<ScenarioSegment> segments;
+  std::vector<RegimeAssignment> regimes;
+  RegimeTimeline timeline;
+  float startBuyPrice;
+  float startSellPrice;
+  std::optional<SpreadModel> spread;
+  int totalDays;
+};
+
+// Simulate paths [firstPath, firstPath + numPaths) and reduce their mid
+// prices on the fly; no path is kept in memory beyond the one being generated.
+PathSummary simulateSummary(const PathGenerator &generator, int numPaths,
+                            unsigned int seed,
+                            std::vector<double> quantileLevels,
+                            double compression = 100.0,
+                            SamplingMode mode = SamplingMode::Pseudo,
+                            uint64_t firstPath = 0);
+
+// One of `count` disjoint slices of a run seeded with `seed`. Shard `index`
+// covers a contiguous block of path indices, so the shards of a run together
+// generate exactly the paths of the unsharded run.
+struct ShardSpec {
+  unsigned int seed;
+  int index;
+  int count;
+
+  ShardSpec(unsigned int seed, int index, int count);
+
+  // [first, end) path indices of this shard in a run of totalPaths paths.
+  std::pair<uint64_t, uint64_t> pathRange(uint64_t totalPaths) const;
+};
+
+// Mid prices for paths [firstPath, firstPath + count), one row of
+// getTotalDays() + 1 values per path. Rows depend only on (seed, path index,
+// mode), so any split of a path range into chunks gives identical output.
+void simulateMidPaths(const PathGenerator &generator, unsigned int seed,
+                      SamplingMode mode, uint64_t firstPath, int count,
+                      float *out);
+
+// Named parameter overrides for one variant of a sweep.
+using ParamOverrides = std::vector<std::pair<std::string, float>>;
+
+// Copy of segments with overrides applied to every segment whose regime type
+// has a parameter of that name. Throws std::invalid_argument for a name that
+// matches no segment.
+std::vector<ScenarioSegment>
+applyOverrides(const std::vector<ScenarioSegment> &segments,
+               const ParamOverrides &overrides);
+
+// Common-random-numbers sweep: each path's draws are recorded by the first
+// variant and replayed for the others, so differences between variants
+// reflect the parameters rather than sampling noise. Writes mid
+// prices to out, laid out as (variants, numPaths, totalDays + 1).
+void simulateSweep(const std::vector<ScenarioSegment> &segments,
+                   float startBuyPrice, float startSellPrice,
+                   const std::optional<SpreadModel> &spread,
+                   const std::vector<ParamOverrides> &variants, int numPaths,
+                   unsigned int seed, float *out,
+                   SamplingMode mode = SamplingMode::Pseudo);
@@ -0,0 +1,455 @@
+#include "Statistics.h"
+#include <algorithm>
+#include <cmath>
+#include <cstring>
+#include <limits>
+#include <stdexcept>
+
+// --- RunningMoments ---
+
+void RunningMoments::add(double x) {
+  count++;
+  double delta = x - mean;
+  mean += delta / static_cast<double>(count);
+  m2 += delta * (x - mean);
+}
+
+void RunningMoments::merge(const RunningMoments &other) {
+  if (other.count == 0) {
+    return;
+  }
+  if (count == 0) {
+    *this = other;
+    return;
+  }
+  double n1 = static_cast<double>(count);
+  double n2 = static_cast<double>(other.count);
+  double delta = other.mean - mean;
+  double n = n1 + n2;
+  mean += delta * n2 / n;
+  m2 += other.m2 + delta * delta * n1 * n2 / n;
+  count += other.count;
+}
+
+double RunningMoments::variance() const {
+  if (count < 2) {
+    return std::numeric_limits<double>::quiet_NaN();
+  }
+  return m2 / static_cast<double>(count - 1);
+}
+
+// --- TDigest ---
+
+TDigest::TDigest(double compression) : compression(compression) {
+  if (!(compression >= 10.0)) {
+    throw std::invalid_argument("t-digest compression must be >= 10");
+  }
+}
+
+TDigest::TDigest(double compression, std::vector<Centroid> centroids)
+    : TDigest(compression) {
+  this->centroids = std::move(centroids);
+}
+
+void TDigest::add(double x, double weight) {
+  buffer.push_back({x, weight});
+  if (buffer.size() >= static_cast<size_t>(5.0 * compression)) {
+    compress();
+  }
+}
+
+void TDigest::merge(const TDigest &other) {
+  for (const auto &c : other.getCentroids()) {
+    buffer.push_back(c);
+  }
+  compress();
+}
+
+double TDigest::totalWeight() const {
+  double total = 0.0;
+  for (const auto &c : getCentroids()) {
+    total += c.weight;
+  }
+  return total;
+}
+
+const std::vector<TDigest::Centroid> &TDigest::getCentroids() const {
+  compress();
+  return centroids;
+}
+
+void TDigest::compress() const {
+  if (buffer.empty()) {
+    return;
+  }
+  std::vector<Centroid> all;
+  all.reserve(centroids.size() + buffer.size());
+  all.insert(all.end(), centroids.begin(), centroids.end());
+  all.insert(all.end(), buffer.begin(), buffer.end());
+  buffer.clear();
+  std::sort(all.begin(), all.end(),
+            [](const Centroid &a, const Centroid &b) { return a.mean < b.mean; });
+
+  double total = 0.0;
+  for (const auto &c : all) {
+    total += c.weight;
+  }
+  // k1 scale function: centroids are small near the tails, large in the
+  // middle, which keeps extreme quantiles accurate.
+  const double pi = 3.14159265358979323846;
+  auto k = [&](double q) {
+    return compression / (2.0 * pi) * std::asin(2.0 * q - 1.0);
+  };
+
+  centroids.clear();
+  Centroid cur = all[0];
+  double weightBefore = 0.0;
+  for (size_t i = 1; i < all.size(); i++) {
+    double proposed = cur.weight + all[i].weight;
+    double q0 = weightBefore / total;
+    double q2 = std::min(1.0, (weightBefore + proposed) / total);
+    if (k(q2) - k(q0) <= 1.0) {
+      cur.mean += (all[i].mean - cur.mean) * all[i].weight / proposed;
+      cur.weight = proposed;
+    } else {
+      centroids.push_back(cur);
+      weightBefore += cur.weight;
+      cur = all[i];
+    }
+  }
+  centroids.push_back(cur);
+}
+
+double TDigest::quantile(double q) const {
+  const auto &cs = getCentroids();
+  if (cs.empty()) {
+    return std::numeric_limits<double>::quiet_NaN();
+  }
+  if (cs.size() == 1) {
+    return cs[0].mean;
+  }
+  double total = 0.0;
+  for (const auto &c : cs) {
+    total += c.weight;
+  }
+  double target = std::clamp(q, 0.0, 1.0) * total;
+
+  // Each centroid's mass is centred on its cumulative midpoint; interpolate
+  // linearly between neighbouring midpoints.
+  double prevMid = cs[0].weight / 2.0;
+  if (target <= prevMid) {
+    return cs[0].mean;
+  }
+  double cumulative = cs[0].weight;
+  for (size_t i = 1; i < cs.size(); i++) {
+    double mid = cumulative + cs[i].weight / 2.0;
+    if (target <= mid) {
+      double t = (target - prevMid) / (mid - prevMid);
+      return cs[i - 1].mean + t * (cs[i].mean - cs[i - 1].mean);
+    }
+    cumulative += cs[i].weight;
+    prevMid = mid;
+  }
+  return cs.back().mean;
+}
+
+// --- Path scalars ---
+
+PathScalars computePathScalars(const float *mid, int n) {
+  PathScalars s{0.0f, std::numeric_limits<float>::quiet_NaN(), 0.0f};
+  if (n <= 0) {
+    return s;
+  }
+  float peak = mid[0];
+  RunningMoments logReturns;
+  for (int i = 1; i < n; i++) {
+    peak = std::max(peak, mid[i]);
+    if (peak > 0.0f) {
+      s.maxDrawdown = std::max(s.maxDrawdown, (peak - mid[i]) / peak);
+    }
+    logReturns.add(std::log(static_cast<double>(mid[i]) / mid[i - 1]));
+  }
+  s.realizedVolatility = static_cast<float>(std::sqrt(logReturns.variance()));
+  s.terminalReturn = mid[n - 1] / mid[0] - 1.0f;
+  return s;
+}
+
+// --- PathSummary ---
+
+PathSummary::PathSummary(int numDays, std::vector<double> quantileLevels,
+                         double compression)
+    : numDays(numDays), numPaths(0), compression(compression),
+      quantileLevels(std::move(quantileLevels)), moments(numDays),
+      digests(numDays, TDigest(compression)) {
+  for (double q : this->quantileLevels) {
+    if (!(q >= 0.0 && q <= 1.0)) {
+      throw std::invalid_argument("Quantile levels must be in [0, 1]");
+    }
+  }
+}
+
+void PathSummary::addPath(const float *mid, uint64_t pathIndex) {
+  if (!pathRanges.empty() &&
+      pathRanges.back().first + pathRanges.back().count == pathIndex) {
+    pathRanges.back().count++;
+  } else if (pathRanges.empty() ||
+             pathRanges.back().first + pathRanges.back().count < pathIndex) {
+    pathRanges.push_back({pathIndex, 1});
+  } else {
+    throw std::invalid_argument("Paths must be added in increasing order");
+  }
+  for (int d = 0; d < numDays; d++) {
+    moments[d].add(mid[d]);
+    digests[d].add(mid[d]);
+  }
+  PathScalars s = computePathScalars(mid, numDays);
+  maxDrawdown.push_back(s.maxDrawdown);
+  realizedVolatility.push_back(s.realizedVolatility);
+  terminalReturn.push_back(s.terminalReturn);
+  numPaths++;
+}
+
+void PathSummary::merge(const PathSummary &other) {
+  if (other.numDays != numDays || other.quantileLevels != quantileLevels) {
+    throw std::invalid_argument(
+        "Summaries must cover the same days and quantile levels");
+  }
+  // Interleave both sides' path ranges (and their scalars) in index order
+  struct Block {
+    PathRange range;
+    const PathSummary *source;
+    uint64_t offset;
+  };
+  std::vector<Block> blocks;
+  const PathSummary *self = this;
+  for (const PathSummary *source : {self, &other}) {
+    uint64_t offset = 0;
+    for (const auto &range : source->pathRanges) {
+      blocks.push_back({range, source, offset});
+      offset += range.count;
+    }
+  }
+  std::sort(blocks.begin(), blocks.end(), [](const Block &a, const Block &b) {
+    return a.range.first < b.range.first;
+  });
+  std::vector<PathRange> ranges;
+  std::vector<float> drawdown, volatility, terminal;
+  drawdown.reserve(numPaths + other.numPaths);
+  volatility.reserve(numPaths + other.numPaths);
+  terminal.reserve(numPaths + other.numPaths);
+  for (const auto &block : blocks) {
+    const PathRange &r = block.range;
+    if (!ranges.empty()) {
+      uint64_t end = ranges.back().first + ranges.back().count;
+      if (r.first < end) {
+        throw std::invalid_argument("Summaries cover overlapping paths");
+      }
+      if (r.first == end) {
+        ranges.back().count += r.count;
+      } else {
+        ranges.push_back(r);
+      }
+    } else {
+      ranges.push_back(r);
+    }
+    auto append = [&](std::vector<float> &dst, const std::vector<float> &src) {
+      dst.insert(dst.end(), src.begin() + block.offset,
+                 src.begin() + block.offset + r.count);
+    };
+    append(drawdown, block.source->maxDrawdown);
+    append(volatility, block.source->realizedVolatility);
+    append(terminal, block.source->terminalReturn);
+  }
+
+  for (int d = 0; d < numDays; d++) {
+    moments[d].merge(other.moments[d]);
+    digests[d].merge(other.digests[d]);
+  }
+  pathRanges = std::move(ranges);
+  maxDrawdown = std::move(drawdown);
+  realizedVolatility = std::move(volatility);
+  terminalReturn = std::move(terminal);
+  numPaths += other.numPaths;
+}
+
+// --- Serialization ---
+
+namespace {
+
+constexpr char kSummaryMagic[4] = {'M', 'M', 'P', 'S'};
+constexpr uint32_t kSummaryVersion = 1;
+
+template <typename T> void put(std::string &out, const T &value) {
+  out.append(reinterpret_cast<const char *>(&value), sizeof(T));
+}
+
+template <typename T>
+void putArray(std::string &out, const std::vector<T> &values) {
+  out.append(reinterpret_cast<const char *>(values.data()),
+             values.size() * sizeof(T));
+}
+
+[[noreturn]] void corrupt() {
+  throw std::invalid_argument("Corrupt or truncated PathSummary data");
+}
+
+class Reader {
+public:
+  explicit Reader(const std::string &data) : data(data), pos(0) {}
+
+  template <typename T> T get() {
+    T value;
+    read(&value, sizeof(T));
+    return value;
+  }
+
+  template <typename T> std::vector<T> getArray(uint64_t count) {
+    if (count > (data.size() - pos) / sizeof(T)) {
+      corrupt();
+    }
+    std::vector<T> values(count);
+    read(values.data(), count * sizeof(T));
+    return values;
+  }
+
+  bool done() const { return pos == data.size(); }
+  size_t remaining() const { return data.size() - pos; }
+
+private:
+  const std::string &data;
+  size_t pos;
+
+  void read(void *dst, size_t n) {
+    if (n > data.size() - pos) {
+      corrupt();
+    }
+    std::memcpy(dst, data.data() + pos, n);
+    pos += n;
+  }
+};
+
+} // namespace
+
+std::string PathSummary::serialize() const {
+  std::string out(kSummaryMagic, sizeof(kSummaryMagic));
+  put(out, kSummaryVersion);
+  put(out, static_cast<int32_t>(numDays));
+  put(out, compression);
+  put(out, static_cast<uint32_t>(quantileLevels.size()));
+  putArray(out, quantileLevels);
+  put(out, numPaths);
+  for (int d = 0; d < numDays; d++) {
+    put(out, moments[d].count);
+    put(out, moments[d].mean);
+    put(out, moments[d].m2);
+    const auto &cs = digests[d].getCentroids();
+    put(out, static_cast<uint32_t>(cs.size()));
+    putArray(out, cs);
+  }
+  put(out, static_cast<uint32_t>(pathRanges.size()));
+  putArray(out, pathRanges);
+  putArray(out, maxDrawdown);
+  putArray(out, realizedVolatility);
+  putArray(out, terminalReturn);
+  return out;
+}
+
+PathSummary PathSummary::deserialize(const std::string &bytes) {
+  Reader in(bytes);
+  char magic[4];
+  for (char &c : magic) {
+    c = in.get<char>();
+  }
+  if (std::memcmp(magic, kSummaryMagic, sizeof(magic)) != 0 ||
+      in.get<uint32_t>() != kSummaryVersion) {
+    throw std::invalid_argument("Not a serialized PathSummary");
+  }
+  int numDays = in.get<int32_t>();
+  double compression = in.get<double>();
+  auto levels = in.getArray<double>(in.get<uint32_t>());
+  // Each day takes at least its moments and centroid count
+  if (numDays < 0 || static_cast<uint64_t>(numDays) > in.remaining() / 28 ||
+      !(compression > 0.0)) {
+    corrupt();
+  }
+  PathSummary summary(numDays, std::move(levels), compression);
+  summary.numPaths = in.get<uint64_t>();
+  for (int d = 0; d < numDays; d++) {
+    RunningMoments &m = summary.moments[d];
+    m.count = in.get<uint64_t>();
+    m.mean = in.get<double>();
+    m.m2 = in.get<double>();
+    summary.digests[d] =
+        TDigest(compression, in.getArray<TDigest::Centroid>(in.get<uint32_t>()));
+  }
+  summary.pathRanges = in.getArray<PathRange>(in.get<uint32_t>());
+  summary.maxDrawdown = in.getArray<float>(summary.numPaths);
+  summary.realizedVolatility = in.getArray<float>(summary.numPaths);
+  summary.terminalReturn = in.getArray<float>(summary.numPaths);
+  if (!in.done()) {
+    corrupt();
+  }
+
+  // The blob may come from another process: check that it is consistent
+  // before merge() indexes the scalars by the ranges.
+  for (int d = 0; d < numDays; d++) {
+    if (summary.moments[d].count != summary.numPaths) {
+      corrupt();
+    }
+    double prevMean = -std::numeric_limits<double>::infinity();
+    for (const auto &c : summary.digests[d].getCentroids()) {
+      if (!(c.mean >= prevMean) || !std::isfinite(c.mean) ||
+          !(c.weight > 0.0) || !std::isfinite(c.weight)) {
+        corrupt();
+      }
+      prevMean = c.mean;
+    }
+  }
+  uint64_t covered = 0;
+  for (size_t i = 0; i < summary.pathRanges.size(); i++) {
+    const PathRange &r = summary.pathRanges[i];
+    if (r.count == 0 || r.count > summary.numPaths - covered ||
+        r.first > std::numeric_limits<uint64_t>::max() - r.count) {
+      corrupt();
+    }
+    if (i > 0) {
+      const PathRange &prev = summary.pathRanges[i - 1];
+      if (r.first <= prev.first + prev.count) {
+        corrupt();
+      }
+    }
+    covered += r.count;
+  }
+  if (covered != summary.numPaths) {
+    corrupt();
+  }
+  return summary;
+}
+
+std::vector<double> PathSummary::getMean() const {
+  std::vector<double> out(numDays);
+  for (int d = 0; d < numDays; d++) {
+    out[d] = moments[d].count ? moments[d].mean
+                              : std::numeric_limits<double>::quiet_NaN();
+  }
+  return out;
+}
+
+std::vector<double> PathSummary::getVariance() const {
+  std::vector<double> out(numDays);
+  for (int d = 0; d < numDays; d++) {
+    out[d] = moments[d].variance();
+  }
+  return out;
+}
+
+std::vector<double> PathSummary::getQuantiles() const {
+  size_t nq = quantileLevels.size();
+  std::vector<double> out(static_cast<size_t>(numDays) * nq);
+  for (int d = 0; d < numDays; d++) {
+    for (size_t j = 0; j < nq; j++) {
+      out[d * nq + j] = digests[d].quantile(quantileLevels[j]);
+    }
+  }
+  return out;
+}
@@ -0,0 +1,115 @@
+#pragma once
+#include <cstdint>
+#include <string>
+#include <vector>
+
+// Running count/mean/variance (Welford), mergeable with Chan's formula.
+struct RunningMoments {
+  uint64_t count = 0;
+  double mean = 0.0;
+  double m2 = 0.0;
+
+  void add(double x);
+  void merge(const RunningMoments &other);
+  double variance() const; // sample variance, NaN for fewer than two values
+};
+
+// Merging t-digest quantile sketch. Values are buffered and periodically
+// folded into at most ~compression centroids, so memory stays bounded no
+// matter how many values are added. Digests merge by re-compressing the
+// union of their centroids.
+class TDigest {
+public:
+  struct Centroid {
+    double mean;
+    double weight;
+  };
+
+  explicit TDigest(double compression = 100.0);
+  // Restore a digest from its compressed centroids (sorted by mean).
+  TDigest(double compression, std::vector<Centroid> centroids);
+
+  void add(double x, double weight = 1.0);
+  void merge(const TDigest &other);
+  double quantile(double q) const;
+  double totalWeight() const;
+  double getCompression() const { return compression; }
+
+  // Compressed centroids, sorted by mean (flushes the buffer first).
+  const std::vector<Centroid> &getCentroids() const;
+
+private:
+  double compression;
+  mutable std::vector<Centroid> centroids;
+  mutable std::vector<Centroid> buffer;
+
+  void compress() const;
+};
+
+// Scalars summarizing one simulated mid-price path.
+struct PathScalars {
+  float maxDrawdown;        // largest peak-to-trough fall, as a fraction
+  float realizedVolatility; // sample std dev of daily log returns
+  float terminalReturn;     // last / first - 1
+};
+
+PathScalars computePathScalars(const float *mid, int n);
+
+// Per-day cross-path statistics of mid prices, accumulated one path at a
+// time so that only O(days) state is kept regardless of the path count.
+// Summaries of disjoint path sets of the same run merge associatively; the
+// per-path scalars are kept in path-index order.
+class PathSummary {
+public:
+  struct PathRange {
+    uint64_t first;
+    uint64_t count;
+  };
+
+  PathSummary(int numDays, std::vector<double> quantileLevels,
+              double compression = 100.0);
+
+  // Fold in one path of numDays mid prices; pathIndex is its index in the run.
+  void addPath(const float *mid, uint64_t pathIndex);
+  // Fold in another summary over the same days and quantile levels. Throws
+  // std::invalid_argument if the two cover overlapping paths.
+  void merge(const PathSummary &other);
+
+  // Compact binary form (host byte order) and its inverse.
+  std::string serialize() const;
+  static PathSummary deserialize(const std::string &bytes);
+
+  int getNumDays() const { return numDays; }
+  uint64_t getNumPaths() const { return numPaths; }
+  double getCompression() const { return compression; }
+  const std::vector<double> &getQuantileLevels() const {
+    return quantileLevels;
+  }
+  // Covered path indices as sorted, non-adjacent ranges
+  const std::vector<PathRange> &getPathRanges() const { return pathRanges; }
+
+  std::vector<double> getMean() const;
+  std::vector<double> getVariance() const;
+  // Row-major (days, quantiles)
+  std::vector<double> getQuantiles() const;
+
+  const std::vector<float> &getMaxDrawdown() const { return maxDrawdown; }
+  const std::vector<float> &getRealizedVolatility() const {
+    return realizedVolatility;
+  }
+  const std::vector<float> &getTerminalReturn() const {
+    return terminalReturn;
+  }
+
+private:
+  int numDays;
+  uint64_t numPaths;
+  double compression;
+  std::vector<double> quantileLevels;
+  std::vector<PathRange> pathRanges;
+  std::vector<RunningMoments> moments;
+  std::vector<TDigest> digests;
+  std::vector<float> maxDrawdown;
+  std::vector<float> realizedVolatility;
+  std::vector<float> terminalReturn;
+};
@@ -1,12 +1,203 @@
+#include "BatchIndicator.h"
+#include "Calibration.h"
 #include "MarketData.h"
+#include "MarketRegistry.h"
+#include "RegimeGenerator.h"
+#include "Simulation.h"
+#include <pybind11/numpy.h>
 #include <pybind11/pybind11.h>
 #include <pybind11/stl.h>
+#include <variant>
 
 #define STRINGIFY(x) #x
 #define MACRO_STRINGIFY(x) STRINGIFY(x)
 
 namespace py = pybind11;
 
+namespace {
+
+// Copy a flat row-major buffer into a NumPy array of the given shape.
+template <typename T>
+py::array_t<T> toArray(const std::vector<T> &data,
+                       std::vector<py::ssize_t> shape) {
+  py::array_t<T> out(shape);
+  std::copy(data.begin(), data.end(), out.mutable_data());
+  return out;
+}
+
+template <typename T> py::array_t<T> toArray(const std::vector<T> &data) {
+  return toArray(data, {static_cast<py::ssize_t>(data.size())});
+}
+
+// BlockRegime backed by a Python model: either an object with a
+// simulate(normals, start_price, days) method or a callable with that
+// signature. Called with the GIL held, once per run of days.
+class PyCustomRegime : public BlockRegime {
+public:
+  PyCustomRegime(py::object model, int drawsPerDay)
+      : BlockRegime(drawsPerDay), model(std::move(model)) {
+    if (!py::hasattr(this->model, "simulate") &&
+        !PyCallable_Check(this->model.ptr())) {
+      throw std::invalid_argument(
+          "Custom regime model must be callable or define simulate()");
+    }
+  }
+
+  ~PyCustomRegime() override {
+    py::gil_scoped_acquire acquire;
+    model = py::object();
+  }
+
+  const py::object &getModel() const { return model; }
+
+  void simulateBlock(const float *normals, const int *days, int count,
+                     float start, float *out) const override {
+    py::gil_scoped_acquire acquire;
+    py::array_t<float> normalsArray({static_cast<py::ssize_t>(count),
+                                     static_cast<py::ssize_t>(drawsPerDay())});
+    std::copy(normals, normals + static_cast<size_t>(count) * drawsPerDay(),
+              normalsArray.mutable_data());
+    py::array_t<int> daysArray(count);
+    std::copy(days, days + count, daysArray.mutable_data());
+
+    py::object fn = py::hasattr(model, "simulate") ? model.attr("simulate")
+                                                   : model;
+    auto prices = py::array_t<float, py::array::c_style | py::array::forcecast>(
+        fn(normalsArray, start, daysArray));
+    if (prices.ndim() != 1 || prices.shape(0) != count) {
+      throw std::invalid_argument(
+          "Custom regime must return one price per day (expected " +
+          std::to_string(count) + ")");
+    }
+    std::copy(prices.data(), prices.data() + count, out);
+  }
+
+private:
+  py::object model;
+};
+
+using FloatArray = py::array_t<float, py::array::c_style | py::array::forcecast>;
+
+// Keyword arguments of MarketData.events / nextEvent as indicator settings
+std::map<std::string, float> eventParams(const py::kwargs &kwargs) {
+  std::map<std::string, float> params;
+  for (const auto &item : kwargs) {
+    params[py::cast<std::string>(item.first)] = py::cast<float>(item.second);
+  }
+  return params;
+}
+
+std::vector<float> toVector(const FloatArray &values) {
+  if (values.ndim() != 1) {
+    throw std::invalid_argument("Expected a 1-D array of prices");
+  }
+  return std::vector<float>(values.data(), values.data() + values.size());
+}
+
+// Shape of a (paths, days) price matrix; throws for other ranks.
+std::pair<int, int> matrixShape(const FloatArray &prices) {
+  if (prices.ndim() != 2) {
+    throw std::invalid_argument("Expected a 2-D (paths, days) array of prices");
+  }
+  return {static_cast<int>(prices.shape(0)), static_cast<int>(prices.shape(1))};
+}
+
+// Uninitialized (paths, days) output for a batched indicator
+py::array_t<float> matrixLike(const std::pair<int, int> &shape) {
+  return py::array_t<float>({shape.first, shape.second});
+}
+
+// A regime schedule as accepted from Python: a compiled Scenario or a list
+// of RegimeAssignment.
+using Schedule =
+    std::variant<std::shared_ptr<Scenario>, std::vector<RegimeAssignment>>;
+
+std::vector<ScenarioSegment> segmentsOf(const Schedule &schedule) {
+  if (auto scenario = std::get_if<std::shared_ptr<Scenario>>(&schedule)) {
+    return (*scenario)->getSegments();
+  }
+  return segmentsFromAssignments(
+      std::get<std::vector<RegimeAssignment>>(schedule));
+}
+
+PathSummary summarize(float startBuyPrice, float startSellPrice,
+                      const Schedule &schedule, int numPaths,
+                      std::optional<unsigned int> seed,
+                      std::vector<double> quantiles, double compression,
+                      std::optional<SpreadModel> spread,
+                      const std::string &sampling,
+                      std::optional<ShardSpec> shard) {
+  PathGenerator generator(segmentsOf(schedule), startBuyPrice, startSellPrice,
+                          spread);
+  SamplingMode mode = parseSamplingMode(sampling);
+  if (!shard.has_value()) {
+    unsigned int runSeed = resolveSeed(seed);
+    py::gil_scoped_release release;
+    return simulateSummary(generator, numPaths, runSeed, std::move(quantiles),
+                           compression, mode);
+  }
+  if (seed.has_value()) {
+    throw std::invalid_argument("Pass either seed or shard, not both");
+  }
+  if (numPaths <= 0) {
+    throw std::invalid_argument("num_paths must be positive");
+  }
+  auto [first, end] = shard->pathRange(static_cast<uint64_t>(numPaths));
+  py::gil_scoped_release release;
+  return simulateSummary(generator, static_cast<int>(end - first), shard->seed,
+                         std::move(quantiles), compression, mode, first);
+}
+
+py::bytes summaryBytes(const PathSummary &summary) {
+  return py::bytes(summary.serialize());
+}
+
+py::array_t<float> sweep(float startBuyPrice, float startSellPrice,
+                         const Schedule &schedule,
+                         const std::vector<ParamOverrides> &variants,
+                         int numPaths, std::optional<unsigned int> seed,
+                         std::optional<SpreadModel> spread,
+                         const std::string &sampling) {
+  std::vector<ScenarioSegment> segments = segmentsOf(schedule);
+  SamplingMode mode = parseSamplingMode(sampling);
+  int totalDays = 0;
+  for (const auto &segment : segments) {
+    totalDays = std::max(totalDays, segment.endDay);
+  }
+  py::array_t<float> out({static_cast<py::ssize_t>(variants.size()),
+                          static_cast<py::ssize_t>(std::max(numPaths, 0)),
+                          static_cast<py::ssize_t>(totalDays + 1)});
+  float *data = out.mutable_data();
+  unsigned int runSeed = resolveSeed(seed);
+  py::gil_scoped_release release;
+  simulateSweep(segments, startBuyPrice, startSellPrice, spread, variants,
+                numPaths, runSeed, data, mode);
+  return out;
+}
+
+// A run prepared for chunked generation. The schedule, seed and sampling
+// mode are fixed up front so that every chunk belongs to the same run.
+struct PathRun {
+  PathGenerator generator;
+  unsigned int seed;
+  SamplingMode mode;
+
+  void fill(py::array_t<float, py::array::c_style> out,
+            uint64_t firstPath) const {
+    int n = generator.getTotalDays() + 1;
+    if (out.ndim() != 2 || out.shape(1) != n) {
+      throw std::invalid_argument("Output block must have shape (paths, " +
+                                  std::to_string(n) + ")");
+    }
+    int count = static_cast<int>(out.shape(0));
+    float *data = out.mutable_data();
+    py::gil_scoped_release release;
+    simulateMidPaths(generator, seed, mode, firstPath, count, data);
+  }
+};
+
+} // namespace
+
 PYBIND11_MODULE(_core, m) {
   m.doc() = "Market Price Simulator";
 
@@ -75,15 +266,50 @@ PYBIND11_MODULE(_core, m) {
            py::arg("continue_rate") = 0.2f, py::arg("num_days") = 30,
            py::arg("noise") = 0.02f);
 
+  py::class_<PyCustomRegime, Regime, std::shared_ptr<PyCustomRegime>>(
+      m, "CustomRegime")
+      .def(py::init<py::object, int>(), py::arg("model"),
+           py::arg("draws_per_day") = 1)
+      .def_property_readonly("model", &PyCustomRegime::getModel)
+      .def_property_readonly("draws_per_day", &PyCustomRegime::drawsPerDay);
+
   py::class_<RegimeAssignment>(m, "RegimeAssignment")
       .def(py::init<std::shared_ptr<Regime>, int, int>(), py::arg("regime"),
            py::arg("start_day"), py::arg("end_day"));
 
+  py::class_<Scenario, std::shared_ptr<Scenario>>(m, "Scenario")
+      .def_static("fromJson", &Scenario::fromJson, py::arg("text"))
+      .def_static("fromFile", &Scenario::fromFile, py::arg("path"))
+      .def_static("cacheSize", &Scenario::cacheSize)
+      .def_static("clearCache", &Scenario::clearCache)
+      .def("getName", &Scenario::getName)
+      .def("getTotalDays", &Scenario::getTotalDays)
+      .def("getHash", &Scenario::getHash)
+      .def("getNumSegments",
+           [](const Scenario &s) { return s.getSegments().size(); });
+
+  py::class_<SpreadModel>(m, "SpreadModel")
+      .def(py::init<std::optional<float>, float, float, float>(),
+           py::arg("mean") = py::none(), py::arg("reversion") = 0.2f,
+           py::arg("volatility") = 0.02f, py::arg("floor") = 0.01f)
+      .def_readonly("mean", &SpreadModel::mean)
+      .def_readonly("reversion", &SpreadModel::reversion)
+      .def_readonly("volatility", &SpreadModel::volatility)
+      .def_readonly("floor", &SpreadModel::floor);
+
   py::class_<MarketData>(m, "_MarketData")
       .def(py::init<float, float, std::vector<RegimeAssignment>,
-                    std::optional<unsigned int>>(),
+                    std::optional<unsigned int>,
+                    std::optional<SpreadModel>, bool>(),
+           py::arg("start_buy_price"), py::arg("start_sell_price"),
+           py::arg("regimes"), py::arg("seed") = py::none(),
+           py::arg("spread") = py::none(), py::arg("lean") = false)
+      .def(py::init<float, float, const Scenario &,
+                    std::optional<unsigned int>,
+                    std::optional<SpreadModel>, bool>(),
            py::arg("start_buy_price"), py::arg("start_sell_price"),
-           py::arg("regimes"), py::arg("seed") = py::none())
+           py::arg("scenario"), py::arg("seed") = py::none(),
+           py::arg("spread") = py::none(), py::arg("lean") = false)
       .def("getBuyPrices", &MarketData::getBuyPrices, py::arg("start") = 0,
            py::arg("end") = -1)
       .def("getSellPrices", &MarketData::getSellPrices, py::arg("start") = 0,
@@ -91,6 +317,14 @@ PYBIND11_MODULE(_core, m) {
       .def("getMidPrices", &MarketData::getMidPrices, py::arg("start") = 0,
            py::arg("end") = -1)
       .def("getTotalDays", &MarketData::getTotalDays)
+      // Sessions sharing the prices and indicator cache
+      .def("session", &MarketData::session, py::arg("revealed_day") = 0)
+      .def("getRevealedDay", &MarketData::getRevealedDay)
+      .def("reveal", &MarketData::reveal, py::arg("day"))
+      .def("advance", &MarketData::advance, py::arg("days") = 1)
+      .def("sharesMarket", &MarketData::sharesMarket, py::arg("other"))
+      .def("isLean", &MarketData::isLean)
+      .def("getMemoryBytes", &MarketData::getMemoryBytes)
       // SMA
       .def("getBuySMA", &MarketData::getBuySMA, py::arg("period") = 20,
            py::arg("start") = 0, py::arg("end") = -1)
@@ -139,7 +373,389 @@ PYBIND11_MODULE(_core, m) {
       // Mid Bollinger Bands
       .def("getMidBollingerBands", &MarketData::getMidBollingerBands,
            py::arg("period") = 20, py::arg("std_dev") = 2.0f,
-           py::arg("start") = 0, py::arg("end") = -1);
+           py::arg("start") = 0, py::arg("end") = -1)
+      // Buy range oscillators
+      .def("getBuyDonchian", &MarketData::getBuyDonchian,
+           py::arg("period") = 20, py::arg("start") = 0, py::arg("end") = -1)
+      .def("getBuyStochastic", &MarketData::getBuyStochastic,
+           py::arg("k_period") = 14, py::arg("d_period") = 3,
+           py::arg("start") = 0, py::arg("end") = -1)
+      .def("getBuyWilliamsR", &MarketData::getBuyWilliamsR,
+           py::arg("period") = 14, py::arg("start") = 0, py::arg("end") = -1)
+      // Sell range oscillators
+      .def("getSellDonchian", &MarketData::getSellDonchian,
+           py::arg("period") = 20, py::arg("start") = 0, py::arg("end") = -1)
+      .def("getSellStochastic", &MarketData::getSellStochastic,
+           py::arg("k_period") = 14, py::arg("d_period") = 3,
+           py::arg("start") = 0, py::arg("end") = -1)
+      .def("getSellWilliamsR", &MarketData::getSellWilliamsR,
+           py::arg("period") = 14, py::arg("start") = 0, py::arg("end") = -1)
+      // Mid range oscillators
+      .def("getMidDonchian", &MarketData::getMidDonchian,
+           py::arg("period") = 20, py::arg("start") = 0, py::arg("end") = -1)
+      .def("getMidStochastic", &MarketData::getMidStochastic,
+           py::arg("k_period") = 14, py::arg("d_period") = 3,
+           py::arg("start") = 0, py::arg("end") = -1)
+      .def("getMidWilliamsR", &MarketData::getMidWilliamsR,
+           py::arg("period") = 14, py::arg("start") = 0, py::arg("end") = -1)
+      // Resampling for charts
+      .def("getCachedSeries", &MarketData::getCachedSeries)
+      .def("getStrided", &MarketData::getStrided, py::arg("series"),
+           py::arg("step"), py::arg("start") = 0, py::arg("end") = -1)
+      .def("getOHLC", &MarketData::getOHLC, py::arg("series") = "mid",
+           py::arg("bucket_days") = 5, py::arg("start") = 0,
+           py::arg("end") = -1)
+      .def("getDecimated", &MarketData::getDecimated, py::arg("series"),
+           py::arg("points") = 1000, py::arg("start") = 0,
+           py::arg("end") = -1)
+      // Signal events
+      .def(
+          "events",
+          [](MarketData &md, const std::string &kind, int start, int end,
+             const std::string &series, const py::kwargs &params) {
+            return md.events(kind, start, end, series, eventParams(params));
+          },
+          py::arg("kind"), py::arg("start") = 0, py::arg("end") = -1,
+          py::arg("series") = "mid")
+      .def(
+          "nextEvent",
+          [](MarketData &md, const std::string &kind, int day,
+             const std::string &series, const py::kwargs &params) {
+            return md.nextEvent(kind, day, series, eventParams(params));
+          },
+          py::arg("kind"), py::arg("day") = -1, py::arg("series") = "mid");
+
+  py::class_<MarkovRegimeGenerator>(m, "MarkovRegimeGenerator")
+      .def(py::init<std::vector<std::pair<std::string, std::shared_ptr<Regime>>>,
+                    std::vector<std::vector<float>>,
+                    std::vector<std::pair<int, int>>,
+                    std::optional<std::vector<float>>>(),
+           py::arg("regimes"), py::arg("transitions"), py::arg("dwell_days"),
+           py::arg("initial") = py::none())
+      .def("getLabels", &MarkovRegimeGenerator::getLabels)
+      .def(
+          "simulate",
+          [](const MarkovRegimeGenerator &gen, float startBuyPrice,
+             float startSellPrice, int numDays,
+             std::optional<unsigned int> seed) {
+            auto result =
+                gen.simulate(startBuyPrice, startSellPrice, numDays, seed);
+            return py::make_tuple(py::cast(std::move(result.market)),
+                                  result.labels);
+          },
+          py::arg("start_buy_price"), py::arg("start_sell_price"),
+          py::arg("num_days"), py::arg("seed") = py::none());
+
+  py::class_<PathSummary>(m, "PathSummary")
+      .def("getNumPaths", &PathSummary::getNumPaths)
+      .def("getNumDays", &PathSummary::getNumDays)
+      .def("getQuantileLevels", &PathSummary::getQuantileLevels)
+      .def("getMean",
+           [](const PathSummary &s) { return toArray(s.getMean()); })
+      .def("getVariance",
+           [](const PathSummary &s) { return toArray(s.getVariance()); })
+      .def("getQuantiles",
+           [](const PathSummary &s) {
+             return toArray(
+                 s.getQuantiles(),
+                 {s.getNumDays(),
+                  static_cast<py::ssize_t>(s.getQuantileLevels().size())});
+           })
+      // (days, 2 + quantiles): mean, variance, then one column per quantile
+      .def("getStats",
+           [](const PathSummary &s) {
+             size_t nq = s.getQuantileLevels().size();
+             size_t cols = 2 + nq;
+             auto mean = s.getMean();
+             auto var = s.getVariance();
+             auto q = s.getQuantiles();
+             std::vector<double> stats(mean.size() * cols);
+             for (size_t d = 0; d < mean.size(); d++) {
+               stats[d * cols] = mean[d];
+               stats[d * cols + 1] = var[d];
+               for (size_t j = 0; j < nq; j++) {
+                 stats[d * cols + 2 + j] = q[d * nq + j];
+               }
+             }
+             return toArray(stats, {s.getNumDays(),
+                                    static_cast<py::ssize_t>(cols)});
+           })
+      .def("getMaxDrawdown",
+           [](const PathSummary &s) { return toArray(s.getMaxDrawdown()); })
+      .def("getRealizedVolatility",
+           [](const PathSummary &s) {
+             return toArray(s.getRealizedVolatility());
+           })
+      .def("getTerminalReturn",
+           [](const PathSummary &s) {
+             return toArray(s.getTerminalReturn());
+           })
+      // Sorted (first, count) blocks of path indices covered by the summary
+      .def("getPathRanges",
+           [](const PathSummary &s) {
+             std::vector<std::pair<uint64_t, uint64_t>> ranges;
+             for (const auto &r : s.getPathRanges()) {
+               ranges.emplace_back(r.first, r.count);
+             }
+             return ranges;
+           })
+      .def("merge", &PathSummary::merge, py::arg("other"))
+      .def("toBytes", &summaryBytes)
+      .def_static(
+          "fromBytes",
+          [](const py::bytes &data) {
+            return PathSummary::deserialize(std::string(data));
+          },
+          py::arg("data"))
+      .def("__copy__", [](const PathSummary &s) { return PathSummary(s); })
+      .def(
+          "__deepcopy__",
+          [](const PathSummary &s, const py::dict &) { return PathSummary(s); },
+          py::arg("memo"))
+      .def(py::pickle(&summaryBytes, [](const py::bytes &data) {
+        return PathSummary::deserialize(std::string(data));
+      }));
+
+  py::class_<ShardSpec>(m, "ShardSpec")
+      .def(py::init<unsigned int, int, int>(), py::arg("seed"),
+           py::arg("index"), py::arg("count"))
+      .def_readonly("seed", &ShardSpec::seed)
+      .def_readonly("index", &ShardSpec::index)
+      .def_readonly("count", &ShardSpec::count)
+      .def("pathRange", &ShardSpec::pathRange, py::arg("num_paths"))
+      .def("__repr__", [](const ShardSpec &s) {
+        return "ShardSpec(seed=" + std::to_string(s.seed) +
+               ", index=" + std::to_string(s.index) +
+               ", count=" + std::to_string(s.count) + ")";
+      });
+
+  py::class_<PathRun>(m, "_PathRun")
+      .def(py::init([](float startBuyPrice, float startSellPrice,
+                       const Schedule &schedule,
+                       std::optional<unsigned int> seed,
+                       std::optional<SpreadModel> spread,
+                       const std::string &sampling) {
+             return PathRun{PathGenerator(segmentsOf(schedule), startBuyPrice,
+                                          startSellPrice, spread),
+                            resolveSeed(seed), parseSamplingMode(sampling)};
+           }),
+           py::arg("start_buy_price"), py::arg("start_sell_price"),
+           py::arg("regimes"), py::arg("seed"), py::arg("spread"),
+           py::arg("sampling"))
+      .def("getTotalDays",
+           [](const PathRun &run) { return run.generator.getTotalDays(); })
+      .def("getSeed", [](const PathRun &run) { return run.seed; })
+      .def("fill", &PathRun::fill, py::arg("out").noconvert(),
+           py::arg("first_path"));
+
+  m.def(
+      "calibrate",
+      [](const FloatArray &prices, const std::string &regime) {
+        RegimeSpec spec = calibrate(toVector(prices), regime);
+        const auto &defs = regimeParamDefs(spec.type);
+        py::dict params;
+        for (size_t i = 0; i < defs.size(); i++) {
+          params[py::str(defs[i].name)] = spec.params[i];
+        }
+        return py::make_tuple(makeRegime(spec), params);
+      },
+      py::arg("prices"), py::arg("regime") = "GBM");
+  m.def(
+      "calibrate_rolling",
+      [](const FloatArray &prices, const std::string &regime, int window,
+         int step) {
+        RollingCalibration fit =
+            calibrateRolling(toVector(prices), regime, window, step);
+        auto numParams =
+            static_cast<py::ssize_t>(regimeParamDefs(regime).size());
+        auto numWindows = static_cast<py::ssize_t>(fit.windowEnds.size());
+        return py::make_tuple(toArray(fit.windowEnds),
+                              toArray(fit.params, {numWindows, numParams}));
+      },
+      py::arg("prices"), py::arg("regime"), py::arg("window"),
+      py::arg("step") = 1);
+
+  // Batched indicators over (paths, days) arrays
+  m.def(
+      "batch_sma",
+      [](const FloatArray &prices, int period, int threads) {
+        auto shape = matrixShape(prices);
+        auto out = matrixLike(shape);
+        const float *in = prices.data();
+        float *data = out.mutable_data();
+        py::gil_scoped_release release;
+        indicators::batch::sma(in, shape.first, shape.second, period, data,
+                               threads);
+        return out;
+      },
+      py::arg("prices"), py::arg("period") = 20, py::arg("threads") = 0);
+  m.def(
+      "batch_ema",
+      [](const FloatArray &prices, int period, int threads) {
+        auto shape = matrixShape(prices);
+        auto out = matrixLike(shape);
+        const float *in = prices.data();
+        float *data = out.mutable_data();
+        py::gil_scoped_release release;
+        indicators::batch::ema(in, shape.first, shape.second, period, data,
+                               threads);
+        return out;
+      },
+      py::arg("prices"), py::arg("period") = 20, py::arg("threads") = 0);
+  m.def(
+      "batch_rsi",
+      [](const FloatArray &prices, int period, int threads) {
+        auto shape = matrixShape(prices);
+        auto out = matrixLike(shape);
+        const float *in = prices.data();
+        float *data = out.mutable_data();
+        py::gil_scoped_release release;
+        indicators::batch::rsi(in, shape.first, shape.second, period, data,
+                               threads);
+        return out;
+      },
+      py::arg("prices"), py::arg("period") = 14, py::arg("threads") = 0);
+  m.def(
+      "batch_macd",
+      [](const FloatArray &prices, int fast, int slow, int signal,
+         int threads) {
+        auto shape = matrixShape(prices);
+        auto line = matrixLike(shape);
+        auto signalLine = matrixLike(shape);
+        auto histogram = matrixLike(shape);
+        const float *in = prices.data();
+        float *lineData = line.mutable_data();
+        float *signalData = signalLine.mutable_data();
+        float *histData = histogram.mutable_data();
+        {
+          py::gil_scoped_release release;
+          indicators::batch::macd(in, shape.first, shape.second, fast, slow,
+                                  signal, lineData, signalData, histData,
+                                  threads);
+        }
+        return py::make_tuple(line, signalLine, histogram);
+      },
+      py::arg("prices"), py::arg("fast") = 12, py::arg("slow") = 26,
+      py::arg("signal") = 9, py::arg("threads") = 0);
+  m.def(
+      "batch_bollinger_bands",
+      [](const FloatArray &prices, int period, float stdDev, int threads) {
+        auto shape = matrixShape(prices);
+        auto upper = matrixLike(shape);
+        auto middle = matrixLike(shape);
+        auto lower = matrixLike(shape);
+        const float *in = prices.data();
+        float *upperData = upper.mutable_data();
+        float *middleData = middle.mutable_data();
+        float *lowerData = lower.mutable_data();
+        {
+          py::gil_scoped_release release;
+          indicators::batch::bollinger(in, shape.first, shape.second, period,
+                                       stdDev, upperData, middleData,
+                                       lowerData, threads);
+        }
+        return py::make_tuple(upper, middle, lower);
+      },
+      py::arg("prices"), py::arg("period") = 20, py::arg("std_dev") = 2.0f,
+      py::arg("threads") = 0);
+  m.def(
+      "batch_atr",
+      [](const FloatArray &buyPrices, const FloatArray &sellPrices,
+         int period, int threads) {
+        auto shape = matrixShape(buyPrices);
+        if (matrixShape(sellPrices) != shape) {
+          throw std::invalid_argument(
+              "Buy and sell prices must have the same shape");
+        }
+        auto out = matrixLike(shape);
+        const float *buy = buyPrices.data();
+        const float *sell = sellPrices.data();
+        float *data = out.mutable_data();
+        py::gil_scoped_release release;
+        indicators::batch::atr(buy, sell, shape.first, shape.second, period,
+                               data, threads);
+        return out;
+      },
+      py::arg("buy_prices"), py::arg("sell_prices"), py::arg("period") = 14,
+      py::arg("threads") = 0);
+  m.def(
+      "batch_donchian",
+      [](const FloatArray &prices, int period, int threads) {
+        auto shape = matrixShape(prices);
+        auto upper = matrixLike(shape);
+        auto middle = matrixLike(shape);
+        auto lower = matrixLike(shape);
+        const float *in = prices.data();
+        float *upperData = upper.mutable_data();
+        float *middleData = middle.mutable_data();
+        float *lowerData = lower.mutable_data();
+        {
+          py::gil_scoped_release release;
+          indicators::batch::donchian(in, shape.first, shape.second, period,
+                                      upperData, middleData, lowerData,
+                                      threads);
+        }
+        return py::make_tuple(upper, middle, lower);
+      },
+      py::arg("prices"), py::arg("period") = 20, py::arg("threads") = 0);
+  m.def(
+      "batch_stochastic",
+      [](const FloatArray &prices, int kPeriod, int dPeriod, int threads) {
+        auto shape = matrixShape(prices);
+        auto k = matrixLike(shape);
+        auto d = matrixLike(shape);
+        const float *in = prices.data();
+        float *kData = k.mutable_data();
+        float *dData = d.mutable_data();
+        {
+          py::gil_scoped_release release;
+          indicators::batch::stochastic(in, shape.first, shape.second,
+                                        kPeriod, dPeriod, kData, dData,
+                                        threads);
+        }
+        return py::make_tuple(k, d);
+      },
+      py::arg("prices"), py::arg("k_period") = 14, py::arg("d_period") = 3,
+      py::arg("threads") = 0);
+  m.def(
+      "batch_williams_r",
+      [](const FloatArray &prices, int period, int threads) {
+        auto shape = matrixShape(prices);
+        auto out = matrixLike(shape);
+        const float *in = prices.data();
+        float *data = out.mutable_data();
+        py::gil_scoped_release release;
+        indicators::batch::williams_r(in, shape.first, shape.second, period,
+                                      data, threads);
+        return out;
+      },
+      py::arg("prices"), py::arg("period") = 14, py::arg("threads") = 0);
+
+  m.def(
+      "_shared_market",
+      [](float startBuyPrice, float startSellPrice, const Schedule &schedule,
+         unsigned int seed, std::optional<SpreadModel> spread, bool lean,
+         int revealedDay) {
+        std::vector<ScenarioSegment> segments = segmentsOf(schedule);
+        py::gil_scoped_release release;
+        return MarketRegistry::instance().acquire(
+            startBuyPrice, startSellPrice, segments, seed, spread, lean,
+            revealedDay);
+      },
+      py::arg("start_buy_price"), py::arg("start_sell_price"),
+      py::arg("regimes"), py::arg("seed"), py::arg("spread"), py::arg("lean"),
+      py::arg("revealed_day"));
+  m.def("shared_market_count",
+        [] { return MarketRegistry::instance().size(); });
+
+  m.def("_simulate_summary", &summarize, py::arg("start_buy_price"),
+        py::arg("start_sell_price"), py::arg("regimes"), py::arg("num_paths"),
+        py::arg("seed"), py::arg("quantiles"), py::arg("compression"),
+        py::arg("spread"), py::arg("sampling"), py::arg("shard"));
+  m.def("_simulate_sweep", &sweep, py::arg("start_buy_price"),
+        py::arg("start_sell_price"), py::arg("regimes"), py::arg("variants"),
+        py::arg("num_paths"), py::arg("seed"), py::arg("spread"),
+        py::arg("sampling"));
 
 #ifdef VERSION_INFO
   m.attr("__version__") = MACRO_STRINGIFY(VERSION_INFO);
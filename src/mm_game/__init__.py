@@ -1,22 +1,50 @@
 from __future__ import annotations
 
+import copy
+import itertools
+from collections.abc import Mapping
+
+import numpy as np
+
 from ._core import (
     __doc__,
     __version__,
     _MarketData,
+    _PathRun,
+    _shared_market,
+    _simulate_summary,
+    _simulate_sweep,
+    batch_atr,
+    batch_bollinger_bands,
+    batch_donchian,
+    batch_ema,
+    batch_macd,
+    batch_rsi,
+    batch_sma,
+    batch_stochastic,
+    batch_williams_r,
+    calibrate,
+    calibrate_rolling,
+    CustomRegime,
     DeadCatBounce,
     Drop,
     Earnings,
     GBM,
     InverseDeadCatBounce,
     JumpDiffusion,
+    MarkovRegimeGenerator,
     MeanReversion,
     Momentum,
+    PathSummary,
     RandomWalk,
     RegimeAssignment,
     Regime,
+    Scenario,
+    ShardSpec,
     SineWave,
+    shared_market_count,
     Spike,
+    SpreadModel,
     TrendingMeanReversion,
 )
 from .presets import (
@@ -33,38 +61,334 @@ from .presets import (
 )
 
 
-def MarketData(start_buy_price, start_sell_price, regimes, seed=None):
+def MarketData(
+    start_buy_price, start_sell_price, regimes, seed=None, spread=None, lean=False
+):
     """Create a MarketData price simulator with configurable regimes.
 
     Args:
         start_buy_price: Initial buy price.
         start_sell_price: Initial sell price.
-        regimes: List of (regime, day_range) tuples.
+        regimes: List of (regime, day_range) tuples, or a compiled
+            ``Scenario`` (see ``load_scenario``).
+        seed: Optional RNG seed for reproducibility.
+        spread: Optional ``SpreadModel``. When given, regimes drive the mid
+            price and the spread follows its own mean-reverting process;
+            by default buy and sell are updated independently.
+        lean: If True, mid prices are not stored but derived from buy and
+            sell on demand, trading a little CPU for memory when many
+            instances are alive.
+    """
+    return _MarketData(
+        start_buy_price, start_sell_price, _schedule(regimes), seed, spread, lean
+    )
+
+
+def shared_market(
+    start_buy_price,
+    start_sell_price,
+    regimes,
+    seed,
+    spread=None,
+    lean=False,
+    revealed_day=0,
+):
+    """Get a session on an interned market shared across the process.
+
+    Calls with the same start prices, schedule, seed, ``spread`` and ``lean``
+    share one simulation and one indicator cache; each call returns its own
+    lightweight ``MarketData`` handle that reveals days
+    ``[0, revealed_day]`` and can be moved forward with ``reveal`` or
+    ``advance``. A market is freed once its last session is gone.
+
+    Args:
+        start_buy_price: Initial buy price.
+        start_sell_price: Initial sell price.
+        regimes: List of (regime, day_range) tuples, or a ``Scenario``.
+        seed: RNG seed; required, since it identifies the market.
+        spread: Optional ``SpreadModel`` (see ``MarketData``).
+        lean: Derive mid prices on demand (see ``MarketData``).
+        revealed_day: Last day visible to the new session.
+    """
+    return _shared_market(
+        start_buy_price,
+        start_sell_price,
+        _schedule(regimes),
+        seed,
+        spread,
+        lean,
+        revealed_day,
+    )
+
+
+def simulate_summary(
+    start_buy_price,
+    start_sell_price,
+    regimes,
+    num_paths,
+    seed=None,
+    quantiles=(0.05, 0.25, 0.5, 0.75, 0.95),
+    compression=100.0,
+    spread=None,
+    sampling="pseudo",
+    shard=None,
+):
+    """Simulate many paths and reduce them to per-day statistics on the fly.
+
+    Paths are generated one at a time and folded into running moments and a
+    t-digest quantile sketch per day, so memory is O(days) rather than
+    O(paths * days). Statistics are over mid prices.
+
+    With ``shard``, only that shard's slice of the ``num_paths`` paths is
+    simulated. Summaries of all shards combine with ``merge_summaries`` into
+    the summary of the unsharded run.
+
+    Args:
+        start_buy_price: Initial buy price.
+        start_sell_price: Initial sell price.
+        regimes: List of (regime, day_range) tuples, or a ``Scenario``.
+        num_paths: Number of paths to simulate.
         seed: Optional RNG seed for reproducibility.
+        quantiles: Quantile levels to estimate for each day.
+        compression: t-digest compression; higher is more accurate.
+        spread: Optional ``SpreadModel`` (see ``MarketData``).
+        sampling: ``"pseudo"`` (independent streams), ``"antithetic"``
+            (paths in pairs with mirrored draws) or ``"sobol"`` (scrambled
+            Sobol normals). See the README for details.
+        shard: Optional ``ShardSpec(seed, index, count)``; replaces ``seed``.
+
+    Returns:
+        A ``PathSummary``: ``getStats()`` is a ``(days, 2 + len(quantiles))``
+        array of mean, variance and quantiles, and ``getMaxDrawdown()``,
+        ``getRealizedVolatility()`` and ``getTerminalReturn()`` give one
+        value per path.
+    """
+    return _simulate_summary(
+        start_buy_price,
+        start_sell_price,
+        _schedule(regimes),
+        num_paths,
+        seed,
+        list(quantiles),
+        compression,
+        spread,
+        sampling,
+        shard,
+    )
+
+
+def merge_summaries(summaries):
+    """Combine summaries of disjoint path sets of the same run.
+
+    Merging is associative and order-independent: counts, per-path scalars
+    and path ranges match a single run exactly, moments to rounding and
+    quantiles to t-digest accuracy. The inputs are left unchanged.
+
+    Args:
+        summaries: Iterable of ``PathSummary`` objects (or the bytes from
+            ``PathSummary.toBytes()``) over the same days and quantiles.
+
+    Returns:
+        A new ``PathSummary``.
+    """
+    merged = None
+    for item in summaries:
+        summary = (
+            PathSummary.fromBytes(bytes(item))
+            if isinstance(item, (bytes, bytearray))
+            else item
+        )
+        if merged is None:
+            merged = copy.copy(summary)
+        else:
+            merged.merge(summary)
+    if merged is None:
+        msg = "At least one summary is required"
+        raise ValueError(msg)
+    return merged
+
+
+def iter_paths(
+    start_buy_price,
+    start_sell_price,
+    regimes,
+    num_paths,
+    chunk_size=1024,
+    seed=None,
+    spread=None,
+    sampling="pseudo",
+    out=None,
+):
+    """Generate mid-price paths in blocks of at most ``chunk_size`` paths.
+
+    Memory stays bounded by one block unless ``out`` is given, in which case
+    every block is written straight into it (an ``np.memmap`` works, so the
+    full path set never has to fit in RAM). Path ``i`` depends only on the
+    seed and ``i``, so the output is identical for any ``chunk_size``.
+
+    Args:
+        start_buy_price: Initial buy price.
+        start_sell_price: Initial sell price.
+        regimes: List of (regime, day_range) tuples, or a ``Scenario``.
+        num_paths: Total number of paths.
+        chunk_size: Maximum number of paths per block.
+        seed: Optional RNG seed; when omitted one is drawn once for the run.
+        spread: Optional ``SpreadModel`` (see ``MarketData``).
+        sampling: Sampling mode, as for ``simulate_summary``.
+        out: Optional writable, C-contiguous float32 array of shape
+            ``(num_paths, days + 1)``.
+
+    Returns:
+        An iterator over float32 arrays of shape ``(paths_in_block, days + 1)``
+        in path order; views into ``out`` when it is given.
+    """
+    if num_paths <= 0:
+        msg = "num_paths must be positive"
+        raise ValueError(msg)
+    if chunk_size <= 0:
+        msg = "chunk_size must be positive"
+        raise ValueError(msg)
+    run = _PathRun(
+        start_buy_price, start_sell_price, _schedule(regimes), seed, spread, sampling
+    )
+    shape = (num_paths, run.getTotalDays() + 1)
+    if out is not None and (
+        out.shape != shape
+        or out.dtype != np.float32
+        or not out.flags.c_contiguous
+        or not out.flags.writeable
+    ):
+        msg = f"out must be a writable C-contiguous float32 array of shape {shape}"
+        raise ValueError(msg)
+    return _iter_blocks(run, shape, chunk_size, out)
+
+
+def _iter_blocks(run, shape, chunk_size, out):
+    num_paths, width = shape
+    for first in range(0, num_paths, chunk_size):
+        count = min(chunk_size, num_paths - first)
+        if out is not None:
+            block = out[first : first + count]
+        else:
+            block = np.empty((count, width), dtype=np.float32)
+        run.fill(block, first)
+        yield block
+
+
+def simulate_sweep(
+    start_buy_price,
+    start_sell_price,
+    regimes,
+    grid,
+    num_paths,
+    seed=None,
+    spread=None,
+    sampling="pseudo",
+):
+    """Simulate a schedule under several parameter variants with common random numbers.
+
+    Each path draws its random stream once and replays it for every variant,
+    so differences between variants reflect the parameters rather than
+    sampling noise, and far fewer paths are needed to resolve them.
+
+    Args:
+        start_buy_price: Initial buy price.
+        start_sell_price: Initial sell price.
+        regimes: List of (regime, day_range) tuples, or a ``Scenario``.
+        grid: Either a list of ``{param: value}`` dicts, one per variant, or
+            a dict of ``{param: [values...]}`` expanded to the cartesian
+            product in ``itertools.product`` order. An override applies to
+            every regime in the schedule that has a parameter of that name.
+        num_paths: Number of paths per variant.
+        seed: Optional RNG seed for reproducibility.
+        spread: Optional ``SpreadModel`` (see ``MarketData``).
+        sampling: Sampling mode, as for ``simulate_summary``.
+
+    Returns:
+        A float32 array of mid prices with shape
+        ``(variants, num_paths, days + 1)``.
+    """
+    return _simulate_sweep(
+        start_buy_price,
+        start_sell_price,
+        _schedule(regimes),
+        _variants(grid),
+        num_paths,
+        seed,
+        spread,
+        sampling,
+    )
+
+
+def _variants(grid):
+    if isinstance(grid, Mapping):
+        names = list(grid)
+        grid = [
+            dict(zip(names, values)) for values in itertools.product(*grid.values())
+        ]
+    return [list(overrides.items()) for overrides in grid]
+
+
+def _schedule(regimes):
+    """Convert (regime, day_range) tuples to RegimeAssignments.
+
+    A compiled ``Scenario`` is passed through unchanged.
+    """
+    if isinstance(regimes, Scenario):
+        return regimes
+    return [RegimeAssignment(regime, days.start, days.stop) for regime, days in regimes]
+
+
+def load_scenario(path):
+    """Load a JSON scenario file into a compiled, cached ``Scenario``.
+
+    Parsing and validation happen in C++; loading a file whose contents were
+    already compiled returns the cached object.
     """
-    assignments = []
-    for regime, days in regimes:
-        assignments.append(RegimeAssignment(regime, days.start, days.stop))
-    return _MarketData(start_buy_price, start_sell_price, assignments, seed)
+    return Scenario.fromFile(str(path))
 
 
 __all__ = [
     "__doc__",
     "__version__",
     "MarketData",
+    "batch_atr",
+    "batch_bollinger_bands",
+    "batch_donchian",
+    "batch_ema",
+    "batch_macd",
+    "batch_rsi",
+    "batch_sma",
+    "batch_stochastic",
+    "batch_williams_r",
+    "calibrate",
+    "calibrate_rolling",
+    "iter_paths",
+    "load_scenario",
+    "merge_summaries",
+    "shared_market",
+    "shared_market_count",
+    "simulate_summary",
+    "simulate_sweep",
+    "CustomRegime",
     "DeadCatBounce",
     "Drop",
     "Earnings",
     "GBM",
     "InverseDeadCatBounce",
     "JumpDiffusion",
+    "MarkovRegimeGenerator",
     "MeanReversion",
     "Momentum",
+    "PathSummary",
     "RandomWalk",
     "RegimeAssignment",
     "Regime",
+    "Scenario",
+    "ShardSpec",
     "SineWave",
     "Spike",
+    "SpreadModel",
     "TrendingMeanReversion",
     "BullQuiet",
     "BullVolatile",
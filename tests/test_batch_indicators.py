@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from mm_game import (
+    GBM,
+    Crisis,
+    MarketData,
+    batch_atr,
+    batch_bollinger_bands,
+    batch_donchian,
+    batch_ema,
+    batch_macd,
+    batch_rsi,
+    batch_sma,
+    batch_stochastic,
+    batch_williams_r,
+)
+
+SEED = 42
+NUM_DAYS = 120
+NUM_PATHS = 37  # not a multiple of the lane width
+REGIMES = [(GBM(), range(80)), (Crisis(), range(80, NUM_DAYS))]
+
+
+@pytest.fixture(scope="module")
+def markets():
+    return [MarketData(100.0, 99.0, REGIMES, seed=SEED + p) for p in range(NUM_PATHS)]
+
+
+@pytest.fixture(scope="module")
+def mids(markets):
+    return np.stack([md.getMidPrices() for md in markets])
+
+
+def _rows(markets, getter):
+    results = [getter(md) for md in markets]
+    if isinstance(results[0], tuple):
+        return tuple(np.stack(parts) for parts in zip(*results))
+    return np.stack(results)
+
+
+class TestBatchIndicators:
+    @pytest.mark.parametrize(
+        ("batch", "getter"),
+        [
+            (lambda x: batch_sma(x, 10), lambda md: md.getMidSMA(10)),
+            (lambda x: batch_ema(x, 10), lambda md: md.getMidEMA(10)),
+            (lambda x: batch_rsi(x, 14), lambda md: md.getMidRSI(14)),
+            (lambda x: batch_macd(x, 12, 26, 9), lambda md: md.getMidMACD(12, 26, 9)),
+            (lambda x: batch_macd(x, 26, 12, 5), lambda md: md.getMidMACD(26, 12, 5)),
+            (
+                lambda x: batch_bollinger_bands(x, 20, 2.0),
+                lambda md: md.getMidBollingerBands(20, 2.0),
+            ),
+            (lambda x: batch_donchian(x, 20), lambda md: md.getMidDonchian(20)),
+            (
+                lambda x: batch_stochastic(x, 14, 3),
+                lambda md: md.getMidStochastic(14, 3),
+            ),
+            (lambda x: batch_williams_r(x, 14), lambda md: md.getMidWilliamsR(14)),
+        ],
+    )
+    def test_matches_single_series(self, markets, mids, batch, getter):
+        expected = _rows(markets, getter)
+        result = batch(mids)
+        if not isinstance(expected, tuple):
+            expected, result = (expected,), (result,)
+        for got, want in zip(result, expected):
+            assert got.shape == (NUM_PATHS, NUM_DAYS + 1)
+            assert got.dtype == np.float32
+            np.testing.assert_array_equal(got, want)
+
+    def test_atr_matches_single_series(self, markets):
+        buy = np.stack([md.getBuyPrices() for md in markets])
+        sell = np.stack([md.getSellPrices() for md in markets])
+        expected = _rows(markets, lambda md: md.getATR(14))
+        np.testing.assert_array_equal(batch_atr(buy, sell, 14), expected)
+
+    @pytest.mark.parametrize("threads", [1, 2, 5])
+    def test_independent_of_threads(self, mids, threads):
+        np.testing.assert_array_equal(batch_rsi(mids, threads=threads), batch_rsi(mids))
+        for got, want in zip(batch_macd(mids, threads=threads), batch_macd(mids)):
+            np.testing.assert_array_equal(got, want)
+
+    def test_short_series_all_nan(self, mids):
+        short = mids[:, :5]
+        assert np.isnan(batch_sma(short, 10)).all()
+        assert np.isnan(batch_rsi(short, 5)).all()
+        assert all(np.isnan(part).all() for part in batch_macd(short))
+
+    def test_nan_rows_do_not_leak(self, mids):
+        data = mids.copy()
+        data[3, 50] = np.nan
+        clean = batch_macd(mids)
+        dirty = batch_macd(data)
+        rows = [p for p in range(NUM_PATHS) if p != 3]
+        for got, want in zip(dirty, clean):
+            np.testing.assert_array_equal(got[rows], want[rows])
+        assert np.isnan(batch_ema(data, 10)[3, 50:]).all()
+
+    def test_rejects_wrong_rank(self, mids):
+        with pytest.raises(ValueError, match="2-D"):
+            batch_sma(mids[0])
+        with pytest.raises(ValueError, match="same shape"):
+            batch_atr(mids, mids[:, :-1])
+
+    def test_empty(self):
+        assert batch_ema(np.zeros((0, 10), dtype=np.float32)).shape == (0, 10)
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from mm_game import (
+    GBM,
+    JumpDiffusion,
+    MarketData,
+    MeanReversion,
+    SpreadModel,
+    calibrate,
+    calibrate_rolling,
+)
+
+SEED = 42
+NUM_DAYS = 20000
+
+
+def _mid_path(regime, num_days=NUM_DAYS, start=100.0):
+    # Zero spread volatility makes the mid follow the regime exactly
+    md = MarketData(
+        start,
+        start,
+        [(regime, range(num_days))],
+        seed=SEED,
+        spread=SpreadModel(volatility=0.0),
+    )
+    return np.array(md.getMidPrices(), dtype=np.float32)
+
+
+def _params(prices, regime):
+    return list(calibrate(prices, regime)[1].values())
+
+
+class TestCalibrate:
+    def test_gbm(self):
+        prices = _mid_path(GBM(mu=0.001, sigma=0.015))
+        regime, params = calibrate(prices, "GBM")
+        assert isinstance(regime, GBM)
+        assert list(params) == ["mu", "sigma"]
+        assert params["sigma"] == pytest.approx(0.015, rel=0.03)
+        assert params["mu"] == pytest.approx(0.001, abs=3e-4)
+
+    def test_mean_reversion(self):
+        prices = _mid_path(MeanReversion(mu=50.0, theta=0.05, sigma=0.8))
+        regime, params = calibrate(prices, "MeanReversion")
+        assert isinstance(regime, MeanReversion)
+        assert params["mu"] == pytest.approx(50.0, abs=1.0)
+        assert params["theta"] == pytest.approx(0.05, rel=0.15)
+        assert params["sigma"] == pytest.approx(0.8, rel=0.03)
+
+    @pytest.mark.parametrize("jump_size", [-0.05, 0.08])
+    def test_jump_diffusion(self, jump_size):
+        # Offset the drift so the path neither explodes nor vanishes
+        mu = -0.05 * np.log1p(jump_size)
+        regime = JumpDiffusion(
+            mu=mu, sigma=0.01, jump_intensity=0.05, jump_size=jump_size
+        )
+        prices = _mid_path(regime, num_days=50000)
+        fitted, params = calibrate(prices, "JumpDiffusion")
+        assert isinstance(fitted, JumpDiffusion)
+        assert params["sigma"] == pytest.approx(0.01, rel=0.1)
+        assert params["jump_intensity"] == pytest.approx(0.05, rel=0.3)
+        assert params["jump_size"] == pytest.approx(jump_size, rel=0.3)
+
+    def test_jump_diffusion_without_jumps(self):
+        prices = _mid_path(GBM(mu=0.0005, sigma=0.02), num_days=50000)
+        _, sigma, intensity, _ = _params(prices, "JumpDiffusion")
+        assert intensity < 1e-3
+        assert sigma == pytest.approx(0.02, rel=0.03)
+
+    def test_jump_diffusion_falls_back_to_diffusion(self):
+        """A symmetric, light-tailed sample has no jump signature."""
+        prices = 100.0 * np.exp(np.cumsum(np.tile([0.01, -0.01], 50)))
+        prices = np.concatenate([[100.0], prices]).astype(np.float32)
+        _, sigma, intensity, size = _params(prices, "JumpDiffusion")
+        assert intensity == 0.0
+        assert size == pytest.approx(0.05)
+        assert sigma == pytest.approx(0.01, rel=1e-3)
+
+    def test_fitted_regime_is_usable(self):
+        prices = _mid_path(GBM(mu=0.001, sigma=0.015), num_days=500)
+        regime, params = calibrate(prices)
+        md = MarketData(100.0, 99.0, [(regime, range(50))], seed=SEED)
+        rebuilt = MarketData(100.0, 99.0, [(GBM(**params), range(50))], seed=SEED)
+        assert md.getTotalDays() == 50
+        assert md.getMidPrices() == rebuilt.getMidPrices()
+
+    def test_matches_full_window(self):
+        prices = _mid_path(MeanReversion(mu=50.0, theta=0.05, sigma=0.8), num_days=300)
+        _, rolling = calibrate_rolling(prices, "MeanReversion", window=len(prices))
+        np.testing.assert_allclose(
+            _params(prices, "MeanReversion"), rolling[0], rtol=1e-6
+        )
+
+    def test_invalid_inputs_raise(self):
+        with pytest.raises(ValueError, match="at least 3 prices"):
+            calibrate([100.0, 101.0], "GBM")
+        with pytest.raises(ValueError, match="Prices must be positive"):
+            calibrate([100.0, -1.0, 102.0, 103.0], "GBM")
+        with pytest.raises(ValueError, match="not Momentum"):
+            calibrate([100.0, 101.0, 102.0, 103.0], "Momentum")
+
+
+class TestCalibrateRolling:
+    @pytest.mark.parametrize("regime", ["GBM", "MeanReversion", "JumpDiffusion"])
+    def test_matches_independent_fits(self, regime):
+        prices = _mid_path(GBM(), num_days=400)
+        window, step = 60, 7
+        ends, params = calibrate_rolling(prices, regime, window=window, step=step)
+        assert list(ends) == list(range(window - 1, len(prices), step))
+        assert params.shape[0] == len(ends)
+        for end, row in zip(ends, params):
+            expected = _params(prices[end - window + 1 : end + 1], regime)
+            np.testing.assert_allclose(row, expected, rtol=1e-3, atol=1e-6)
+
+    def test_short_series_has_no_windows(self):
+        ends, params = calibrate_rolling([100.0, 101.0, 102.0], "GBM", window=10)
+        assert len(ends) == 0
+        assert params.shape == (0, 2)
+
+    def test_invalid_arguments_raise(self):
+        prices = _mid_path(GBM(), num_days=100)
+        with pytest.raises(ValueError, match="at least 3 prices"):
+            calibrate_rolling(prices, "GBM", window=2)
+        with pytest.raises(ValueError, match="step must be positive"):
+            calibrate_rolling(prices, "GBM", window=10, step=0)
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from mm_game import GBM, Crisis, SpreadModel, iter_paths, simulate_summary
+
+SEED = 42
+NUM_DAYS = 60
+NUM_PATHS = 50
+REGIMES = [(GBM(), range(40)), (Crisis(), range(40, NUM_DAYS))]
+
+
+def _collect(**kwargs):
+    return np.concatenate(
+        list(iter_paths(100.0, 99.0, REGIMES, NUM_PATHS, seed=SEED, **kwargs))
+    )
+
+
+class TestIterPaths:
+    def test_block_shapes(self):
+        blocks = list(
+            iter_paths(100.0, 99.0, REGIMES, NUM_PATHS, chunk_size=16, seed=SEED)
+        )
+        assert [b.shape for b in blocks] == [
+            (16, NUM_DAYS + 1),
+            (16, NUM_DAYS + 1),
+            (16, NUM_DAYS + 1),
+            (2, NUM_DAYS + 1),
+        ]
+        assert all(b.dtype == np.float32 for b in blocks)
+
+    @pytest.mark.parametrize("sampling", ["pseudo", "antithetic", "sobol"])
+    def test_independent_of_chunk_size(self, sampling):
+        reference = _collect(chunk_size=NUM_PATHS, sampling=sampling)
+        for chunk_size in (1, 3, 7, 16, 1000):
+            np.testing.assert_array_equal(
+                _collect(chunk_size=chunk_size, sampling=sampling), reference
+            )
+
+    def test_matches_summary(self):
+        paths = _collect(chunk_size=8, spread=SpreadModel())
+        summary = simulate_summary(
+            100.0, 99.0, REGIMES, num_paths=NUM_PATHS, seed=SEED, spread=SpreadModel()
+        )
+        np.testing.assert_allclose(paths.mean(axis=0), summary.getMean(), rtol=1e-5)
+        np.testing.assert_allclose(
+            paths[:, -1] / paths[:, 0] - 1.0, summary.getTerminalReturn(), rtol=1e-4
+        )
+
+    def test_writes_into_buffer(self):
+        out = np.zeros((NUM_PATHS, NUM_DAYS + 1), dtype=np.float32)
+        blocks = list(
+            iter_paths(
+                100.0, 99.0, REGIMES, NUM_PATHS, chunk_size=16, seed=SEED, out=out
+            )
+        )
+        assert all(np.shares_memory(b, out) for b in blocks)
+        np.testing.assert_array_equal(out, _collect(chunk_size=NUM_PATHS))
+
+    def test_writes_into_memmap(self, tmp_path):
+        path = tmp_path / "paths.f32"
+        out = np.memmap(
+            path, dtype=np.float32, mode="w+", shape=(NUM_PATHS, NUM_DAYS + 1)
+        )
+        for _ in iter_paths(
+            100.0, 99.0, REGIMES, NUM_PATHS, chunk_size=10, seed=SEED, out=out
+        ):
+            pass
+        out.flush()
+        del out
+        stored = np.fromfile(path, dtype=np.float32).reshape(NUM_PATHS, NUM_DAYS + 1)
+        np.testing.assert_array_equal(stored, _collect(chunk_size=NUM_PATHS))
+
+    def test_invalid_arguments_raise(self):
+        with pytest.raises(ValueError, match="num_paths must be positive"):
+            iter_paths(100.0, 99.0, REGIMES, 0)
+        with pytest.raises(ValueError, match="chunk_size must be positive"):
+            iter_paths(100.0, 99.0, REGIMES, 10, chunk_size=0)
+        with pytest.raises(ValueError, match="float32 array of shape"):
+            iter_paths(
+                100.0, 99.0, REGIMES, 10, out=np.zeros((10, 5), dtype=np.float32)
+            )
+        with pytest.raises(ValueError, match="float32 array of shape"):
+            iter_paths(100.0, 99.0, REGIMES, 10, out=np.zeros((10, NUM_DAYS + 1)))
@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from mm_game import (
+    GBM,
+    CustomRegime,
+    MarketData,
+    MarkovRegimeGenerator,
+    SpreadModel,
+    simulate_summary,
+)
+
+SEED = 42
+NUM_DAYS = 100
+
+
+class LogNormal:
+    """GBM written against the block protocol, counting calls."""
+
+    def __init__(self, mu=0.0005, sigma=0.02):
+        self.mu = mu
+        self.sigma = sigma
+        self.calls = []
+
+    def simulate(self, normals, start_price, days):
+        self.calls.append((normals.shape, start_price, days.copy()))
+        return start_price * np.exp(np.cumsum(self.mu + self.sigma * normals[:, 0]))
+
+
+class TestCustomRegime:
+    def test_one_call_per_segment_and_side(self):
+        model = LogNormal()
+        md = MarketData(
+            100.0, 99.0, [(CustomRegime(model), range(NUM_DAYS))], seed=SEED
+        )
+        assert len(model.calls) == 2  # buy, then sell
+        shape, start, days = model.calls[0]
+        assert shape == (NUM_DAYS, 1)
+        assert start == 100.0
+        np.testing.assert_array_equal(days, np.arange(NUM_DAYS))
+        assert model.calls[1][1] == 99.0
+        assert len(md.getBuyPrices()) == NUM_DAYS + 1
+
+    def test_receives_segment_day_indices(self):
+        model = LogNormal()
+        regimes = [
+            (GBM(), range(30)),
+            (CustomRegime(model), range(30, 60)),
+            (GBM(), range(60, 90)),
+        ]
+        md = MarketData(100.0, 99.0, regimes, seed=SEED)
+        _, start, days = model.calls[0]
+        np.testing.assert_array_equal(days, np.arange(30, 60))
+        assert start == pytest.approx(md.getBuyPrices()[30])
+
+    def test_prices_come_from_model(self):
+        def flat(_normals, start_price, days):
+            return np.full(len(days), start_price + 1.0)
+
+        md = MarketData(100.0, 99.0, [(CustomRegime(flat), range(10))], seed=SEED)
+        assert md.getBuyPrices()[1:] == [101.0] * 10
+        assert md.getSellPrices()[1:] == [100.0] * 10
+
+    def test_ask_stays_above_bid(self):
+        def invert(_normals, start_price, days):
+            return np.full(len(days), 200.0 - start_price)
+
+        md = MarketData(100.0, 99.0, [(CustomRegime(invert), range(5))], seed=SEED)
+        for b, s in zip(md.getBuyPrices(), md.getSellPrices()):
+            assert b >= s
+
+    def test_multiple_draws_per_day(self):
+        shapes = []
+
+        def model(normals, start_price, days):
+            shapes.append(normals.shape)
+            return np.full(len(days), start_price)
+
+        MarketData(
+            100.0, 99.0, [(CustomRegime(model, draws_per_day=3), range(20))], seed=SEED
+        )
+        assert shapes == [(20, 3), (20, 3)]
+
+    def test_reproducible(self):
+        regimes = [(CustomRegime(LogNormal()), range(NUM_DAYS))]
+        a = MarketData(100.0, 99.0, regimes, seed=SEED)
+        b = MarketData(100.0, 99.0, regimes, seed=SEED)
+        assert a.getBuyPrices() == b.getBuyPrices()
+
+    def test_spread_mode_calls_once(self):
+        model = LogNormal()
+        MarketData(
+            100.0,
+            99.0,
+            [(CustomRegime(model), range(NUM_DAYS))],
+            seed=SEED,
+            spread=SpreadModel(),
+        )
+        assert len(model.calls) == 1
+        assert model.calls[0][1] == pytest.approx(99.5)
+
+    def test_monte_carlo_and_markov(self):
+        model = LogNormal()
+        summary = simulate_summary(
+            100.0,
+            99.0,
+            [(CustomRegime(model), range(NUM_DAYS))],
+            num_paths=50,
+            seed=SEED,
+        )
+        assert len(model.calls) == 100
+        assert summary.getStats().shape[0] == NUM_DAYS + 1
+
+        gen = MarkovRegimeGenerator(
+            [("custom", CustomRegime(LogNormal())), ("gbm", GBM())],
+            transitions=[[0.0, 1.0], [1.0, 0.0]],
+            dwell_days=[(5, 10), (5, 10)],
+        )
+        md, labels = gen.simulate(100.0, 99.0, num_days=NUM_DAYS, seed=SEED)
+        assert "custom" in labels
+        assert md.getTotalDays() == NUM_DAYS
+
+
+class TestCustomRegimeErrors:
+    def test_wrong_length_raises(self):
+        def short(_normals, _start_price, days):
+            return np.zeros(len(days) - 1)
+
+        with pytest.raises(ValueError, match="one price per day"):
+            MarketData(100.0, 99.0, [(CustomRegime(short), range(10))], seed=SEED)
+
+    def test_model_exception_propagates(self):
+        def broken(_normals, _start_price, _days):
+            msg = "boom"
+            raise RuntimeError(msg)
+
+        with pytest.raises(RuntimeError, match="boom"):
+            MarketData(100.0, 99.0, [(CustomRegime(broken), range(10))], seed=SEED)
+
+    def test_invalid_model_raises(self):
+        with pytest.raises(ValueError, match="must be callable or define simulate"):
+            CustomRegime(42)
+        with pytest.raises(ValueError, match="draws_per_day must be non-negative"):
+            CustomRegime(LogNormal(), draws_per_day=-1)
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from mm_game import GBM, Crisis, MarketData
+
+SEED = 42
+NUM_DAYS = 300
+
+
+def _market():
+    return MarketData(
+        100.0, 99.0, [(GBM(), range(200)), (Crisis(), range(200, NUM_DAYS))], seed=SEED
+    )
+
+
+def _crossings(a, b, direction):
+    diff = np.asarray(a) - np.asarray(b)
+    prev, cur = diff[:-1], diff[1:]
+    up = (prev <= 0) & (cur > 0)
+    down = (prev >= 0) & (cur < 0)
+    mask = {"up": up, "down": down, "either": up | down}[direction]
+    return list(np.nonzero(mask)[0] + 1)
+
+
+class TestEvents:
+    def test_rsi_crossings_match_scan(self):
+        md = _market()
+        rsi = md.getMidRSI(14)
+        assert md.events("rsi_below") == _crossings(rsi, 30.0, "down")
+        assert md.events("rsi_above") == _crossings(rsi, 70.0, "up")
+        assert md.events("rsi_below", level=45.0) == _crossings(rsi, 45.0, "down")
+
+    @pytest.mark.parametrize(
+        ("kind", "direction"),
+        [
+            ("macd_cross", "either"),
+            ("macd_cross_up", "up"),
+            ("macd_cross_down", "down"),
+        ],
+    )
+    def test_macd_crossings_match_scan(self, kind, direction):
+        md = _market()
+        line, signal, _ = md.getBuyMACD(5, 10, 3)
+        expected = _crossings(line, signal, direction)
+        assert expected
+        assert md.events(kind, series="buy", fast=5, slow=10, signal=3) == expected
+
+    def test_bollinger_outside_matches_scan(self):
+        md = _market()
+        mid = np.asarray(md.getMidPrices())
+        upper, _, lower = (
+            np.asarray(band) for band in md.getMidBollingerBands(10, 1.5)
+        )
+        above = list(np.nonzero(mid > upper)[0])
+        below = list(np.nonzero(mid < lower)[0])
+        assert md.events("bollinger_above", period=10, std_dev=1.5) == above
+        assert md.events("bollinger_below", period=10, std_dev=1.5) == below
+        assert md.events("bollinger_outside", period=10, std_dev=1.5) == sorted(
+            above + below
+        )
+
+    def test_range_and_next_event(self):
+        md = _market()
+        days = md.events("macd_cross")
+        assert md.events("macd_cross", 50, 150) == [d for d in days if 50 <= d < 150]
+        assert md.nextEvent("macd_cross") == days[0]
+        assert md.nextEvent("macd_cross", days[2]) == days[3]
+        assert md.nextEvent("macd_cross", days[-1]) is None
+
+    def test_nearby_levels_not_confused(self):
+        md = _market()
+        rsi = np.asarray(md.getMidRSI(14), dtype=np.float32)
+        day = next(d for d in range(20, NUM_DAYS) if rsi[d - 1] > rsi[d] + 1.0)
+        level = rsi[day]
+        above = np.nextafter(level, np.float32(np.inf))
+        assert day in md.events("rsi_below", level=float(above))
+        assert md.events("rsi_below", level=float(level)) == _crossings(
+            rsi, level, "down"
+        )
+        assert day not in md.events("rsi_below", level=float(level))
+
+    def test_nearby_std_devs_not_confused(self):
+        md = _market()
+        mid = np.asarray(md.getMidPrices())
+        upper, middle, _ = (
+            np.asarray(band) for band in md.getMidBollingerBands(10, 1.5)
+        )
+        # Width in standard deviations at which each day leaves the band
+        width = np.abs(mid - middle) / ((upper - middle) / 1.5)
+        # Two widths either side of the threshold that agree to two decimals
+        day = next(
+            d
+            for d in range(10, NUM_DAYS)
+            if 1.5 < width[d] < 3.0
+            and round(width[d] - 0.002, 2) == round(width[d] + 0.002, 2)
+        )
+        inside, outside = float(width[day] - 0.002), float(width[day] + 0.002)
+        assert day in md.events("bollinger_outside", period=10, std_dev=inside)
+        assert day not in md.events("bollinger_outside", period=10, std_dev=outside)
+
+    def test_index_cached_per_parameter_set(self):
+        md = _market()
+        md.events("rsi_below")
+        before = md.getMemoryBytes()
+        md.events("rsi_below", 10, 100)
+        assert md.getMemoryBytes() == before
+        md.events("rsi_below", period=7)
+        assert md.getMemoryBytes() > before
+        assert "mid_rsi_7" in md.getCachedSeries()
+
+    def test_session_sees_revealed_events_only(self):
+        md = _market()
+        days = md.events("macd_cross")
+        view = md.session(days[3])
+        assert view.events("macd_cross") == days[:4]
+        assert view.nextEvent("macd_cross", days[2]) == days[3]
+        assert view.nextEvent("macd_cross", days[3]) is None
+        with pytest.raises(IndexError, match="not yet revealed"):
+            view.events("macd_cross", 0, NUM_DAYS + 1)
+
+    def test_invalid_arguments(self):
+        md = _market()
+        with pytest.raises(ValueError, match="Unknown event kind"):
+            md.events("golden_cross")
+        with pytest.raises(ValueError, match="Unknown price series"):
+            md.events("macd_cross", series="close")
+        with pytest.raises(ValueError, match="Unknown parameter"):
+            md.events("rsi_below", std_dev=2.0)
+        with pytest.raises(ValueError, match="positive integer"):
+            md.events("rsi_below", period=0)
@@ -219,6 +219,99 @@ class TestATR:
         assert _lists_equal(md1.getATR(), md2.getATR())
 
 
+class TestDonchian:
+    def test_matches_naive_window(self):
+        md = MarketData(100.0, 99.0, [(GBM(), range(NUM_DAYS))], seed=SEED)
+        prices = md.getBuyPrices()
+        upper, middle, lower = md.getBuyDonchian(period=10)
+        for i in range(9):
+            assert math.isnan(upper[i])
+        for i in range(9, len(prices)):
+            window = prices[i - 9 : i + 1]
+            assert upper[i] == max(window)
+            assert lower[i] == min(window)
+            assert abs(middle[i] - (max(window) + min(window)) / 2) < 1e-4
+
+    def test_mid_and_sell(self):
+        md = MarketData(100.0, 99.0, [(GBM(), range(NUM_DAYS))], seed=SEED)
+        upper, _, lower = md.getMidDonchian(period=5)
+        assert upper[4] == max(md.getMidPrices()[:5])
+        upper, _, lower = md.getSellDonchian(period=5)
+        assert lower[4] == min(md.getSellPrices()[:5])
+
+    def test_range_slicing(self):
+        md = MarketData(100.0, 99.0, [(GBM(), range(NUM_DAYS))], seed=SEED)
+        full_u, full_m, full_l = md.getBuyDonchian()
+        sl_u, sl_m, sl_l = md.getBuyDonchian(start=25, end=50)
+        assert sl_u == full_u[25:50]
+        assert sl_m == full_m[25:50]
+        assert sl_l == full_l[25:50]
+
+
+class TestStochastic:
+    def test_k_matches_naive_window(self):
+        md = MarketData(100.0, 99.0, [(GBM(), range(NUM_DAYS))], seed=SEED)
+        prices = md.getMidPrices()
+        k, _ = md.getMidStochastic(k_period=14, d_period=3)
+        for i in range(13):
+            assert math.isnan(k[i])
+        for i in range(13, len(prices)):
+            window = prices[i - 13 : i + 1]
+            expected = 100 * (prices[i] - min(window)) / (max(window) - min(window))
+            assert abs(k[i] - expected) < 1e-3
+
+    def test_d_is_sma_of_k(self):
+        md = MarketData(100.0, 99.0, [(GBM(), range(NUM_DAYS))], seed=SEED)
+        k, d = md.getBuyStochastic(k_period=14, d_period=3)
+        for i in range(15):
+            assert math.isnan(d[i])
+        for i in range(15, len(k)):
+            assert abs(d[i] - sum(k[i - 2 : i + 1]) / 3) < 1e-3
+
+    def test_bounded_0_100(self):
+        md = MarketData(100.0, 99.0, [(GBM(), range(NUM_DAYS))], seed=SEED)
+        k, d = md.getSellStochastic()
+        for val in k + d:
+            if not math.isnan(val):
+                assert 0.0 <= val <= 100.0
+
+    def test_flat_window_is_midpoint(self):
+        md = MarketData(100.0, 99.0, [(GBM(mu=0.0, sigma=0.0), range(20))], seed=SEED)
+        k, _ = md.getBuyStochastic(k_period=5)
+        assert k[10] == 50.0
+
+    def test_range_slicing(self):
+        md = MarketData(100.0, 99.0, [(GBM(), range(NUM_DAYS))], seed=SEED)
+        full_k, full_d = md.getBuyStochastic()
+        sl_k, sl_d = md.getBuyStochastic(start=20, end=40)
+        assert sl_k == full_k[20:40]
+        assert sl_d == full_d[20:40]
+
+
+class TestWilliamsR:
+    def test_mirrors_stochastic_k(self):
+        md = MarketData(100.0, 99.0, [(GBM(), range(NUM_DAYS))], seed=SEED)
+        k, _ = md.getBuyStochastic(k_period=14)
+        wr = md.getBuyWilliamsR(period=14)
+        for kv, wv in zip(k, wr):
+            if math.isnan(kv):
+                assert math.isnan(wv)
+            else:
+                assert abs(wv - (kv - 100.0)) < 1e-3
+
+    def test_bounded(self):
+        md = MarketData(100.0, 99.0, [(GBM(), range(NUM_DAYS))], seed=SEED)
+        for val in md.getMidWilliamsR() + md.getSellWilliamsR():
+            if not math.isnan(val):
+                assert -100.0 <= val <= 0.0
+
+    def test_range_slicing(self):
+        md = MarketData(100.0, 99.0, [(GBM(), range(NUM_DAYS))], seed=SEED)
+        full = md.getMidWilliamsR(period=14)
+        sliced = md.getMidWilliamsR(period=14, start=20, end=40)
+        assert sliced == full[20:40]
+
+
 class TestIndicatorEdgeCases:
     def test_period_greater_than_days(self):
         """All values should be NaN when period exceeds total days."""
@@ -240,3 +333,48 @@ class TestIndicatorEdgeCases:
         rsi1 = md.getBuyRSI(period=14)
         rsi2 = md.getBuyRSI(period=14)
         assert _lists_equal(rsi1, rsi2)
+
+
+class TestLeanMode:
+    def _pair(self):
+        regimes = [(GBM(), range(NUM_DAYS))]
+        full = MarketData(100.0, 99.0, regimes, seed=SEED)
+        lean = MarketData(100.0, 99.0, regimes, seed=SEED, lean=True)
+        return full, lean
+
+    def test_flag(self):
+        full, lean = self._pair()
+        assert not full.isLean()
+        assert lean.isLean()
+
+    def test_identical_prices(self):
+        full, lean = self._pair()
+        assert lean.getBuyPrices() == full.getBuyPrices()
+        assert lean.getSellPrices() == full.getSellPrices()
+        assert lean.getMidPrices() == full.getMidPrices()
+        assert lean.getMidPrices(10, 30) == full.getMidPrices(10, 30)
+
+    def test_identical_indicators(self):
+        full, lean = self._pair()
+        assert _lists_equal(lean.getMidSMA(20), full.getMidSMA(20))
+        assert _lists_equal(lean.getMidRSI(14), full.getMidRSI(14))
+        for a, b in zip(lean.getMidMACD(), full.getMidMACD()):
+            assert _lists_equal(a, b)
+        for a, b in zip(lean.getMidBollingerBands(), full.getMidBollingerBands()):
+            assert _lists_equal(a, b)
+        assert _lists_equal(lean.getMidWilliamsR(), full.getMidWilliamsR())
+        assert _lists_equal(lean.getATR(14), full.getATR(14))
+
+    def test_warmup_nans_preserved_in_slices(self):
+        _, lean = self._pair()
+        sliced = lean.getMidSMA(period=20, start=10, end=30)
+        assert len(sliced) == 20
+        assert all(math.isnan(v) for v in sliced[:9])
+        assert not any(math.isnan(v) for v in sliced[9:])
+
+    def test_uses_less_memory(self):
+        full, lean = self._pair()
+        for md in (full, lean):
+            md.getMidSMA(20)
+            md.getMidEMA(20)
+        assert lean.getMemoryBytes() < full.getMemoryBytes()
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import pytest
+
+from mm_game import (
+    GBM,
+    BullQuiet,
+    ChopZone,
+    Crisis,
+    MarkovRegimeGenerator,
+)
+
+SEED = 42
+NUM_DAYS = 200
+
+
+def _generator():
+    return MarkovRegimeGenerator(
+        [("bull", BullQuiet()), ("crisis", Crisis()), ("chop", ChopZone())],
+        transitions=[[0.0, 0.5, 0.5], [0.7, 0.0, 0.3], [0.5, 0.5, 0.0]],
+        dwell_days=[(10, 30), (3, 8), (5, 15)],
+    )
+
+
+def _runs(labels):
+    """Collapse per-day labels into [label, length] runs."""
+    runs = []
+    for label in labels:
+        if runs and runs[-1][0] == label:
+            runs[-1][1] += 1
+        else:
+            runs.append([label, 1])
+    return runs
+
+
+class TestMarkovGenerator:
+    def test_shapes(self):
+        md, labels = _generator().simulate(100.0, 99.0, NUM_DAYS, seed=SEED)
+        assert md.getTotalDays() == NUM_DAYS
+        assert len(labels) == NUM_DAYS
+        assert len(md.getBuyPrices()) == NUM_DAYS + 1
+        assert set(labels) <= {"bull", "crisis", "chop"}
+
+    def test_reproducible(self):
+        gen = _generator()
+        md1, labels1 = gen.simulate(100.0, 99.0, NUM_DAYS, seed=SEED)
+        md2, labels2 = gen.simulate(100.0, 99.0, NUM_DAYS, seed=SEED)
+        assert labels1 == labels2
+        assert md1.getBuyPrices() == md2.getBuyPrices()
+
+    def test_different_seeds_differ(self):
+        gen = _generator()
+        _, labels1 = gen.simulate(100.0, 99.0, NUM_DAYS, seed=1)
+        _, labels2 = gen.simulate(100.0, 99.0, NUM_DAYS, seed=2)
+        assert labels1 != labels2
+
+    def test_dwell_times_respected(self):
+        _, labels = _generator().simulate(100.0, 99.0, 2000, seed=SEED)
+        bounds = {"bull": (10, 30), "crisis": (3, 8), "chop": (5, 15)}
+        runs = _runs(labels)
+        # The final run may be truncated by the horizon
+        for label, length in runs[:-1]:
+            lo, hi = bounds[label]
+            assert lo <= length <= hi
+
+    def test_zero_probability_transition_never_taken(self):
+        gen = MarkovRegimeGenerator(
+            [("a", GBM()), ("b", GBM()), ("c", GBM())],
+            transitions=[[0.0, 1.0, 0.0], [0.0, 0.0, 1.0], [1.0, 0.0, 0.0]],
+            dwell_days=[(1, 1), (1, 1), (1, 1)],
+            initial=[1.0, 0.0, 0.0],
+        )
+        _, labels = gen.simulate(100.0, 99.0, 9, seed=SEED)
+        assert labels == ["a", "b", "c"] * 3
+
+    def test_single_state_covers_horizon(self):
+        gen = MarkovRegimeGenerator(
+            [("only", GBM(mu=0.0, sigma=0.01))],
+            transitions=[[1.0]],
+            dwell_days=[(5, 5)],
+        )
+        md, labels = gen.simulate(100.0, 99.0, 20, seed=SEED)
+        assert labels == ["only"] * 20
+        assert all(p > 0 for p in md.getSellPrices())
+
+    @pytest.mark.parametrize(
+        ("transitions", "dwell", "message"),
+        [
+            ([[1.0, 0.0]], [(1, 2), (1, 2)], "one row per regime"),
+            ([[1.0, 0.0], [0.0]], [(1, 2), (1, 2)], "must be square"),
+            ([[-1.0, 2.0], [0.5, 0.5]], [(1, 2), (1, 2)], "negative probability"),
+            ([[0.0, 0.0], [0.5, 0.5]], [(1, 2), (1, 2)], "no positive probability"),
+            ([[0.5, 0.5], [0.5, 0.5]], [(0, 2), (1, 2)], "Dwell times must satisfy"),
+            ([[0.5, 0.5], [0.5, 0.5]], [(3, 2), (1, 2)], "Dwell times must satisfy"),
+        ],
+    )
+    def test_invalid_inputs_raise(self, transitions, dwell, message):
+        with pytest.raises(ValueError, match=message):
+            MarkovRegimeGenerator(
+                [("a", GBM()), ("b", Crisis())],
+                transitions=transitions,
+                dwell_days=dwell,
+            )
@@ -1,5 +1,10 @@
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
 from mm_game import (
     MarketData,
     DeadCatBounce,
@@ -9,9 +14,13 @@ from mm_game import (
     InverseDeadCatBounce,
     JumpDiffusion,
     MeanReversion,
+    Momentum,
     RandomWalk,
     SineWave,
     Spike,
+    SpreadModel,
+    TrendingMeanReversion,
+    simulate_summary,
 )
 
 SEED = 42
@@ -151,6 +160,56 @@ class TestRangeQuery:
             assert b >= s
 
 
+class TestSpreadModel:
+    def test_default_mode_unchanged(self):
+        regimes = [(GBM(), range(NUM_DAYS))]
+        md1 = MarketData(100.0, 99.0, regimes, seed=SEED)
+        md2 = MarketData(100.0, 99.0, regimes, seed=SEED, spread=None)
+        assert md1.getBuyPrices() == md2.getBuyPrices()
+
+    def test_spread_bounded_by_floor(self):
+        regimes = [(GBM(mu=0.0, sigma=0.05), range(NUM_DAYS))]
+        spread = SpreadModel(mean=0.5, reversion=0.3, volatility=0.2, floor=0.1)
+        md = MarketData(100.0, 99.5, regimes, seed=SEED, spread=spread)
+        for b, s in zip(md.getBuyPrices(), md.getSellPrices()):
+            assert b - s >= 0.1 - 1e-4
+
+    def test_zero_volatility_spread_converges_to_mean(self):
+        regimes = [(GBM(), range(NUM_DAYS))]
+        spread = SpreadModel(mean=2.0, reversion=0.5, volatility=0.0)
+        md = MarketData(100.0, 99.5, regimes, seed=SEED, spread=spread)
+        buys = md.getBuyPrices()
+        sells = md.getSellPrices()
+        assert abs((buys[-1] - sells[-1]) - 2.0) < 1e-3
+
+    def test_mean_defaults_to_start_spread(self):
+        regimes = [(GBM(), range(NUM_DAYS))]
+        spread = SpreadModel(volatility=0.0)
+        md = MarketData(100.0, 99.0, regimes, seed=SEED, spread=spread)
+        for b, s in zip(md.getBuyPrices(), md.getSellPrices()):
+            assert abs((b - s) - 1.0) < 1e-3
+
+    def test_mid_follows_single_regime_path(self):
+        """With a flat spread, mid moves exactly as the regime drives it."""
+        regimes = [(Drop(rate=0.0), range(10))]
+        spread = SpreadModel(volatility=0.0)
+        md = MarketData(100.0, 99.0, regimes, seed=SEED, spread=spread)
+        mids = md.getMidPrices()
+        assert all(abs(m - 99.5) < 1e-4 for m in mids)
+
+    def test_reproducible(self):
+        regimes = [(GBM(), range(NUM_DAYS))]
+        md1 = MarketData(100.0, 99.0, regimes, seed=SEED, spread=SpreadModel())
+        md2 = MarketData(100.0, 99.0, regimes, seed=SEED, spread=SpreadModel())
+        assert md1.getSellPrices() == md2.getSellPrices()
+
+    def test_invalid_parameters_raise(self):
+        with pytest.raises(ValueError, match="reversion must be in"):
+            SpreadModel(reversion=1.5)
+        with pytest.raises(ValueError, match="floor must be non-negative"):
+            SpreadModel(floor=-1.0)
+
+
 class TestDefaultParams:
     def test_gbm_defaults(self):
         md = MarketData(100.0, 99.0, [(GBM(), range(0, 10))], seed=SEED)
@@ -254,3 +313,49 @@ class TestInverseDeadCatBounce:
     def test_defaults(self):
         md = MarketData(100.0, 99.0, [(InverseDeadCatBounce(), range(0, 30))], seed=SEED)
         assert all(p > 0 for p in md.getBuyPrices())
+
+
+class TestRegimeState:
+    def test_instance_reusable_across_markets(self):
+        regime = Momentum(momentum=0.5)
+        md1 = MarketData(100.0, 99.0, [(regime, range(NUM_DAYS))], seed=SEED)
+        md2 = MarketData(100.0, 99.0, [(regime, range(NUM_DAYS))], seed=SEED)
+        assert md1.getBuyPrices() == md2.getBuyPrices()
+        assert md1.getSellPrices() == md2.getSellPrices()
+
+    def test_shared_instance_matches_separate_instances(self):
+        shared = Earnings(num_days=20)
+        md1 = MarketData(100.0, 99.0, [(shared, range(20)), (shared, range(20, 40))], seed=SEED)
+        md2 = MarketData(100.0, 99.0, [(Earnings(num_days=20), range(20)),
+                                       (Earnings(num_days=20), range(20, 40))], seed=SEED)
+        assert md1.getBuyPrices() == md2.getBuyPrices()
+
+    def test_buy_and_sell_keep_separate_state(self):
+        regime = TrendingMeanReversion(mu=100.0, drift=1.0, theta=1.0, sigma=0.0)
+        md = MarketData(100.0, 99.0, [(regime, range(10))], seed=SEED)
+        expected = [100.0 + k for k in range(10)]
+        assert md.getBuyPrices()[1:] == pytest.approx(expected)
+        assert md.getSellPrices()[1:] == pytest.approx(expected)
+
+    @pytest.mark.parametrize("regime", [Earnings(80.0, 120.0, 10, 0.01), DeadCatBounce(), InverseDeadCatBounce()])
+    def test_event_shared_by_buy_and_sell(self, regime):
+        spreads = []
+        for seed in range(50):
+            md = MarketData(100.0, 99.0, [(regime, range(20))], seed=seed)
+            spreads.extend(np.subtract(md.getBuyPrices(), md.getSellPrices()))
+        # Both sides follow one event, so the spread stays near its start of 1
+        assert np.median(spreads) < 2.0
+        assert np.percentile(spreads, 90) < 5.0
+
+    def test_concurrent_runs_share_regimes(self):
+        regimes = [(Momentum(momentum=0.5), range(50)), (Earnings(num_days=50), range(50, NUM_DAYS))]
+
+        def run(seed):
+            return simulate_summary(100.0, 99.0, regimes, 20, seed=seed).getMean()
+
+        seeds = list(range(8))
+        serial = [run(seed) for seed in seeds]
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            parallel = list(pool.map(run, seeds))
+        for got, want in zip(parallel, serial):
+            np.testing.assert_array_equal(got, want)
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import math
+
+import pytest
+
+from mm_game import GBM, Drop, MarketData, Spike
+
+SEED = 42
+NUM_DAYS = 500
+
+
+def _market():
+    return MarketData(100.0, 99.0, [(GBM(), range(NUM_DAYS))], seed=SEED)
+
+
+class TestStrided:
+    def test_every_nth_day(self):
+        md = _market()
+        days, values = md.getStrided("mid", step=10)
+        prices = md.getMidPrices()
+        assert days == list(range(0, NUM_DAYS + 1, 10))
+        assert values == [prices[d] for d in days]
+
+    def test_range(self):
+        md = _market()
+        days, values = md.getStrided("buy", step=7, start=100, end=200)
+        assert days[0] == 100
+        assert days[-1] < 200
+        assert values == md.getBuyPrices(100, 200)[::7]
+
+
+class TestOHLC:
+    def test_buckets_aligned_to_absolute_days(self):
+        md = _market()
+        days, opens, highs, lows, closes = md.getOHLC(
+            "mid", bucket_days=5, start=3, end=23
+        )
+        assert days == [3, 5, 10, 15, 20]
+        prices = md.getMidPrices()
+        assert opens[0] == prices[3]
+        assert closes[0] == prices[4]
+        assert opens[1] == prices[5]
+        assert highs[1] == max(prices[5:10])
+        assert lows[1] == min(prices[5:10])
+        assert closes[-1] == prices[22]
+
+    def test_bounds(self):
+        md = _market()
+        _, opens, highs, lows, closes = md.getOHLC("sell", bucket_days=21)
+        for o, h, low, c in zip(opens, highs, lows, closes):
+            assert low <= o <= h
+            assert low <= c <= h
+
+    def test_indicator_warmup_nans(self):
+        md = _market()
+        md.getMidSMA(period=20)
+        _, opens, _, _, closes = md.getOHLC("mid_sma_20", bucket_days=5)
+        # Days 0-14 are all NaN; the bucket holding day 19 is partly valid
+        assert all(math.isnan(v) for v in opens[:3])
+        assert opens[3] == md.getMidSMA(period=20)[19]
+        assert not any(math.isnan(v) for v in closes[3:])
+
+
+class TestDecimated:
+    def test_point_count_and_endpoints(self):
+        md = _market()
+        days, values = md.getDecimated("mid", points=50)
+        assert len(days) == 50
+        assert days[0] == 0
+        assert days[-1] == NUM_DAYS
+        assert days == sorted(days)
+        prices = md.getMidPrices()
+        assert values == [prices[d] for d in days]
+
+    def test_keeps_isolated_spike(self):
+        regimes = [
+            (GBM(mu=0.0, sigma=0.0), range(NUM_DAYS)),
+            (Spike(rate=0.5), range(250, 251)),
+            (Drop(rate=1.0 / 3.0), range(251, 252)),
+        ]
+        md = MarketData(100.0, 100.0, regimes, seed=SEED)
+        days, values = md.getDecimated("mid", points=20)
+        assert 251 in days
+        assert max(values) == max(md.getMidPrices())
+
+    def test_short_series_returned_whole(self):
+        md = _market()
+        days, values = md.getDecimated("mid", points=100, start=10, end=60)
+        assert days == list(range(10, 60))
+        assert values == md.getMidPrices(10, 60)
+
+    def test_cached_indicator_skips_nans(self):
+        md = _market()
+        md.getMidMACD()
+        days, values = md.getDecimated("mid_macd_12_26_9_signal", points=40)
+        assert len(days) == 40
+        assert days[0] == 33
+        assert not any(math.isnan(v) for v in values)
+
+
+class TestResampleErrors:
+    def test_uncached_series_raises(self):
+        md = _market()
+        with pytest.raises(ValueError, match="uncached series"):
+            md.getDecimated("mid_sma_20", points=50)
+        md.getMidSMA(period=20)
+        assert "mid_sma_20" in md.getCachedSeries()
+        md.getDecimated("mid_sma_20", points=50)
+
+    def test_invalid_arguments_raise(self):
+        md = _market()
+        with pytest.raises(ValueError, match="step must be positive"):
+            md.getStrided("mid", step=0)
+        with pytest.raises(ValueError, match="bucket_days must be positive"):
+            md.getOHLC("mid", bucket_days=0)
+        with pytest.raises(ValueError, match="at least 3"):
+            md.getDecimated("mid", points=2)
+        with pytest.raises(IndexError):
+            md.getOHLC("mid", start=10, end=5)
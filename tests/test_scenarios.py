@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from mm_game import (
+    GBM,
+    Crisis,
+    MarketData,
+    MeanReversion,
+    Scenario,
+    load_scenario,
+)
+
+SEED = 42
+
+SPEC = {
+    "name": "calm-then-crash",
+    "regimes": [
+        {"regime": "GBM", "params": {"mu": 0.001, "sigma": 0.01}, "days": [0, 50]},
+        {"preset": "Crisis", "params": {"scale": 1.0}, "days": [50, 80]},
+        {"regime": "MeanReversion", "days": [80, 100]},
+    ],
+}
+
+
+class TestScenarioParsing:
+    def test_basic_fields(self):
+        scenario = Scenario.fromJson(json.dumps(SPEC))
+        assert scenario.getName() == "calm-then-crash"
+        assert scenario.getTotalDays() == 100
+        assert scenario.getNumSegments() == 3
+
+    def test_matches_python_schedule(self):
+        scenario = Scenario.fromJson(json.dumps(SPEC))
+        regimes = [
+            (GBM(mu=0.001, sigma=0.01), range(50)),
+            (Crisis(), range(50, 80)),
+            (MeanReversion(), range(80, 100)),
+        ]
+        md1 = MarketData(100.0, 99.0, scenario, seed=SEED)
+        md2 = MarketData(100.0, 99.0, regimes, seed=SEED)
+        assert md1.getBuyPrices() == md2.getBuyPrices()
+        assert md1.getSellPrices() == md2.getSellPrices()
+
+    def test_reuse_across_simulations(self):
+        spec = {"regimes": [{"regime": "Earnings", "days": [0, 20]}]}
+        scenario = Scenario.fromJson(json.dumps(spec))
+        md1 = MarketData(100.0, 99.0, scenario, seed=SEED)
+        md2 = MarketData(100.0, 99.0, scenario, seed=SEED)
+        # Each simulation gets fresh regime state
+        assert md1.getBuyPrices() == md2.getBuyPrices()
+
+    @pytest.mark.parametrize(
+        ("spec", "message"),
+        [
+            ({"regimes": []}, "non-empty 'regimes' array"),
+            ({"regimes": [{"regime": "Nope", "days": [0, 10]}]}, "Unknown regime type"),
+            ({"regimes": [{"preset": "Nope", "days": [0, 10]}]}, "Unknown preset"),
+            (
+                {"regimes": [{"regime": "GBM", "params": {"nu": 1}, "days": [0, 10]}]},
+                "Unknown parameter 'nu'",
+            ),
+            ({"regimes": [{"regime": "GBM", "days": [10, 5]}]}, "empty day range"),
+            (
+                {"regimes": [{"regime": "GBM", "days": [-1, 5]}]},
+                "non-negative integers",
+            ),
+            (
+                {"regimes": [{"regime": "GBM", "preset": "Crisis", "days": [0, 5]}]},
+                "exactly one of 'regime' or 'preset'",
+            ),
+            ({"regimes": [{"regime": "GBM"}]}, "'days' must be"),
+            ({"regimes": [], "extra": 1}, "Unknown key 'extra'"),
+        ],
+    )
+    def test_invalid_specs_raise(self, spec, message):
+        with pytest.raises(ValueError, match=message):
+            Scenario.fromJson(json.dumps(spec))
+
+    def test_malformed_json_raises(self):
+        with pytest.raises(ValueError, match="unexpected end of input"):
+            Scenario.fromJson('{"regimes": [')
+
+    @pytest.mark.parametrize(
+        "params",
+        [
+            '{"sigma": NaN}',
+            '{"sigma": inf}',
+            '{"sigma": -Infinity}',
+            '{"sigma": 0x10}',
+            '{"sigma": +1}',
+            '{"sigma": 01}',
+            '{"sigma": 1.}',
+            '{"sigma": .5}',
+            '{"sigma": 1e999}',
+            '{"sigma": 1e300}',
+            '{"sigma": 0.1, "sigma": 0.2}',
+        ],
+    )
+    def test_non_json_numbers_and_duplicates_raise(self, params):
+        text = (
+            f'{{"regimes": [{{"regime": "GBM", "params": {params}, "days": [0, 10]}}]}}'
+        )
+        with pytest.raises(
+            ValueError, match=r"Invalid scenario JSON|must be a finite number"
+        ):
+            Scenario.fromJson(text)
+
+    @pytest.mark.parametrize(
+        "name",
+        [r"\x41", r"\u12", r"\u00g1", r"\ud800", r"\udc00x", "tab\there"],
+    )
+    def test_malformed_strings_raise(self, name):
+        text = (
+            f'{{"name": "{name}", "regimes": [{{"regime": "GBM", "days": [0, 10]}}]}}'
+        )
+        with pytest.raises(ValueError, match=r"escape|surrogate|control character"):
+            Scenario.fromJson(text)
+
+    def test_string_escapes_decoded(self):
+        spec = {
+            "name": 'caf\u00e9 "\U0001f4c8"/\\',
+            "regimes": [{"regime": "GBM", "days": [0, 10]}],
+        }
+        assert Scenario.fromJson(json.dumps(spec)).getName() == spec["name"]
+
+    def test_duplicate_days_raise(self):
+        with pytest.raises(ValueError, match="duplicate key"):
+            Scenario.fromJson(
+                '{"regimes": [{"regime": "GBM", "days": [0, 10], "days": [0, 20]}]}'
+            )
+
+    def test_integer_params_must_be_integral(self):
+        spec = {
+            "regimes": [
+                {"regime": "Earnings", "params": {"num_days": 2.7}, "days": [0, 10]}
+            ]
+        }
+        with pytest.raises(ValueError, match="must be an integer"):
+            Scenario.fromJson(json.dumps(spec))
+        spec["regimes"][0]["params"]["num_days"] = 3.0
+        assert Scenario.fromJson(json.dumps(spec)).getTotalDays() == 10
+
+    def test_strict_numbers_accepted(self):
+        spec = '{"regimes": [{"regime": "GBM", "params": {"mu": -0.0, "sigma": 2E-2}, "days": [0, 1e1]}]}'
+        assert Scenario.fromJson(spec).getTotalDays() == 10
+
+
+class TestScenarioCache:
+    def test_same_content_same_object(self, tmp_path):
+        text = json.dumps(SPEC)
+        path_a = tmp_path / "a.json"
+        path_b = tmp_path / "b.json"
+        path_a.write_text(text)
+        path_b.write_text(text)
+        a = load_scenario(path_a)
+        b = load_scenario(path_b)
+        assert a is b
+        assert a.getHash() == b.getHash()
+
+    def test_clear_cache(self):
+        Scenario.clearCache()
+        Scenario.fromJson(json.dumps(SPEC))
+        assert Scenario.cacheSize() == 1
+        Scenario.clearCache()
+        assert Scenario.cacheSize() == 0
+
+    def test_missing_file_raises(self, tmp_path):
+        with pytest.raises(RuntimeError):
+            load_scenario(tmp_path / "missing.json")
@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import gc
+import subprocess
+import sys
+import textwrap
+
+import numpy as np
+import pytest
+
+from mm_game import (
+    GBM,
+    Crisis,
+    CustomRegime,
+    MarketData,
+    SpreadModel,
+    shared_market,
+    shared_market_count,
+)
+
+SEED = 42
+NUM_DAYS = 60
+
+
+def _regimes():
+    return [(GBM(), range(40)), (Crisis(), range(40, NUM_DAYS))]
+
+
+class TestSessions:
+    def test_session_shares_market(self):
+        md = MarketData(100.0, 99.0, _regimes(), seed=SEED)
+        view = md.session(10)
+        assert view.sharesMarket(md)
+        assert view.getRevealedDay() == 10
+        assert md.getRevealedDay() == NUM_DAYS
+        np.testing.assert_array_equal(view.getBuyPrices(), md.getBuyPrices(0, 11))
+
+    def test_unrevealed_days_raise(self):
+        view = MarketData(100.0, 99.0, _regimes(), seed=SEED).session(10)
+        with pytest.raises(IndexError, match="not yet revealed"):
+            view.getMidPrices(0, 12)
+        with pytest.raises(IndexError, match="not yet revealed"):
+            view.getMidSMA(5, 0, 20)
+        with pytest.raises(IndexError, match="Invalid day range"):
+            view.getMidPrices(5, 3)
+
+    def test_reveal_and_advance(self):
+        md = MarketData(100.0, 99.0, _regimes(), seed=SEED)
+        view = md.session()
+        assert len(view.getBuyPrices()) == 1
+        view.advance()
+        view.advance(4)
+        assert view.getRevealedDay() == 5
+        view.reveal(20)
+        np.testing.assert_array_equal(view.getMidEMA(5), md.getMidEMA(5, 0, 21))
+        with pytest.raises(ValueError, match="cannot be hidden again"):
+            view.reveal(10)
+        with pytest.raises(ValueError, match=r"must be in \[0, total days\]"):
+            view.reveal(NUM_DAYS + 1)
+        with pytest.raises(ValueError, match=r"must be in \[0, total days\]"):
+            md.session(-1)
+
+    def test_indicator_cache_shared(self):
+        md = MarketData(100.0, 99.0, _regimes(), seed=SEED)
+        view = md.session(30)
+        view.getMidRSI(14)
+        assert "mid_rsi_14" in md.getCachedSeries()
+        days, _ = view.getStrided("mid_rsi_14", 5)
+        assert days[-1] <= 30
+
+    def test_prefix_matches_full_indicators(self):
+        md = MarketData(100.0, 99.0, _regimes(), seed=SEED)
+        view = md.session(25)
+        full_line, full_signal, _ = md.getMidMACD(5, 10, 3)
+        line, signal, _ = view.getMidMACD(5, 10, 3)
+        np.testing.assert_array_equal(line, full_line[:26])
+        np.testing.assert_array_equal(signal, full_signal[:26])
+
+
+class TestSharedMarket:
+    def test_same_key_shares_market(self):
+        a = shared_market(100.0, 99.0, _regimes(), SEED)
+        b = shared_market(100.0, 99.0, _regimes(), SEED, revealed_day=5)
+        assert a.sharesMarket(b)
+        assert a.getRevealedDay() == 0
+        assert b.getRevealedDay() == 5
+        a.advance(10)
+        assert b.getRevealedDay() == 5
+
+    def test_matches_fresh_market(self):
+        view = shared_market(100.0, 99.0, _regimes(), SEED, revealed_day=NUM_DAYS)
+        md = MarketData(100.0, 99.0, _regimes(), seed=SEED)
+        np.testing.assert_array_equal(view.getBuyPrices(), md.getBuyPrices())
+        np.testing.assert_array_equal(view.getSellPrices(), md.getSellPrices())
+
+    @pytest.mark.parametrize(
+        "kwargs",
+        [
+            {"seed": SEED + 1},
+            {"start_buy_price": 101.0},
+            {"spread": SpreadModel()},
+            {"lean": True},
+            {
+                "regimes": [
+                    (GBM(sigma=0.03), range(40)),
+                    (Crisis(), range(40, NUM_DAYS)),
+                ]
+            },
+        ],
+    )
+    def test_different_key_separate_market(self, kwargs):
+        base = {
+            "start_buy_price": 100.0,
+            "start_sell_price": 99.0,
+            "regimes": _regimes(),
+            "seed": SEED,
+        }
+        a = shared_market(**base)
+        b = shared_market(**{**base, **kwargs})
+        assert not a.sharesMarket(b)
+
+    def test_market_freed_with_last_session(self):
+        gc.collect()
+        before = shared_market_count()
+        a = shared_market(100.0, 99.0, _regimes(), 12345)
+        b = shared_market(100.0, 99.0, _regimes(), 12345)
+        assert shared_market_count() == before + 1
+        del a
+        assert shared_market_count() == before + 1
+        del b
+        gc.collect()
+        assert shared_market_count() == before
+
+    def test_distinct_custom_regimes_not_shared(self):
+        def flat(level):
+            return lambda _normals, _start, days: np.full(
+                len(days), level, dtype=np.float32
+            )
+
+        sessions = []
+        for level in range(1, 21):
+            regime = CustomRegime(flat(float(level)))
+            sessions.append(
+                shared_market(100.0, 99.0, [(regime, range(10))], SEED, revealed_day=10)
+            )
+            del regime
+            gc.collect()
+        for level, session in enumerate(sessions, start=1):
+            assert session.getBuyPrices()[1:] == [float(level)] * 10
+
+    def test_concurrent_build_does_not_block(self):
+        # A thread simulating a custom regime must not hold the registry while
+        # Python runs other threads; a deadlock would hang the interpreter, so
+        # the check runs in a subprocess.
+        code = textwrap.dedent(
+            """
+            import threading
+
+            import numpy as np
+
+            from mm_game import CustomRegime, shared_market
+
+            started, finished = threading.Event(), threading.Event()
+            calls = []
+
+            def model(normals, start, days):
+                calls.append(start)
+                if len(calls) == 1:
+                    started.set()
+                    assert finished.wait(timeout=30)
+                return np.full(len(days), start, dtype=np.float32)
+
+            schedule = [(CustomRegime(model), range(0, 10))]
+            result = {}
+
+            def build():
+                result["first"] = shared_market(100.0, 99.0, schedule, 7)
+
+            worker = threading.Thread(target=build)
+            worker.start()
+            assert started.wait(timeout=30)
+            second = shared_market(100.0, 99.0, schedule, 7)
+            finished.set()
+            worker.join()
+            assert result["first"].sharesMarket(second)
+            """
+        )
+        subprocess.run([sys.executable, "-c", code], check=True, timeout=60)
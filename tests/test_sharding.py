@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import pickle
+import struct
+
+import numpy as np
+import pytest
+
+from mm_game import (
+    GBM,
+    Crisis,
+    PathSummary,
+    ShardSpec,
+    merge_summaries,
+    simulate_summary,
+)
+
+SEED = 42
+NUM_DAYS = 40
+NUM_PATHS = 203
+REGIMES = [(GBM(), range(25)), (Crisis(), range(25, NUM_DAYS))]
+
+
+def _shard(index, count, **kwargs):
+    return simulate_summary(
+        100.0, 99.0, REGIMES, NUM_PATHS, shard=ShardSpec(SEED, index, count), **kwargs
+    )
+
+
+def _full(**kwargs):
+    return simulate_summary(100.0, 99.0, REGIMES, NUM_PATHS, seed=SEED, **kwargs)
+
+
+def _assert_matches(merged, full):
+    assert merged.getNumPaths() == full.getNumPaths()
+    assert merged.getPathRanges() == [(0, NUM_PATHS)]
+    np.testing.assert_array_equal(merged.getMaxDrawdown(), full.getMaxDrawdown())
+    np.testing.assert_array_equal(
+        merged.getRealizedVolatility(), full.getRealizedVolatility()
+    )
+    np.testing.assert_array_equal(merged.getTerminalReturn(), full.getTerminalReturn())
+    np.testing.assert_allclose(merged.getMean(), full.getMean(), rtol=1e-12)
+    np.testing.assert_allclose(merged.getVariance(), full.getVariance(), rtol=1e-9)
+    np.testing.assert_allclose(merged.getQuantiles(), full.getQuantiles(), rtol=0.02)
+
+
+class TestShardSpec:
+    def test_ranges_partition_run(self):
+        ranges = [ShardSpec(SEED, i, 4).pathRange(NUM_PATHS) for i in range(4)]
+        assert ranges[0][0] == 0
+        assert ranges[-1][1] == NUM_PATHS
+        assert all(a[1] == b[0] for a, b in zip(ranges, ranges[1:]))
+
+    @pytest.mark.parametrize(
+        ("index", "count", "message"),
+        [
+            (0, 0, "count must be positive"),
+            (-1, 2, "index must be in"),
+            (2, 2, "index must be in"),
+        ],
+    )
+    def test_invalid_spec(self, index, count, message):
+        with pytest.raises(ValueError, match=message):
+            ShardSpec(SEED, index, count)
+
+    def test_seed_and_shard_conflict(self):
+        with pytest.raises(ValueError, match="either seed or shard"):
+            simulate_summary(
+                100.0, 99.0, REGIMES, NUM_PATHS, seed=1, shard=ShardSpec(SEED, 0, 2)
+            )
+
+    def test_too_many_shards(self):
+        with pytest.raises(ValueError, match="at least the shard count"):
+            simulate_summary(100.0, 99.0, REGIMES, 3, shard=ShardSpec(SEED, 0, 4))
+
+
+class TestMergeSummaries:
+    @pytest.mark.parametrize("sampling", ["pseudo", "antithetic", "sobol"])
+    def test_shards_match_single_run(self, sampling):
+        shards = [_shard(i, 5, sampling=sampling) for i in range(5)]
+        _assert_matches(merge_summaries(shards), _full(sampling=sampling))
+
+    def test_order_and_grouping_independent(self):
+        shards = [_shard(i, 4) for i in range(4)]
+        left = merge_summaries(
+            [
+                merge_summaries([shards[3], shards[1]]),
+                merge_summaries([shards[2], shards[0]]),
+            ]
+        )
+        _assert_matches(left, _full())
+
+    def test_partial_merge_keeps_gaps(self):
+        shards = [_shard(i, 4) for i in range(4)]
+        merged = merge_summaries([shards[2], shards[0]])
+        assert merged.getPathRanges() == [
+            shards[0].getPathRanges()[0],
+            shards[2].getPathRanges()[0],
+        ]
+        np.testing.assert_array_equal(
+            merged.getTerminalReturn(),
+            np.concatenate(
+                [shards[0].getTerminalReturn(), shards[2].getTerminalReturn()]
+            ),
+        )
+
+    def test_inputs_unchanged(self):
+        shards = [_shard(i, 2) for i in range(2)]
+        merge_summaries(shards)
+        assert shards[0].getNumPaths() + shards[1].getNumPaths() == NUM_PATHS
+        assert len(shards[0].getPathRanges()) == 1
+
+    def test_overlap_rejected(self):
+        shard = _shard(0, 2)
+        with pytest.raises(ValueError, match="overlapping"):
+            merge_summaries([shard, shard])
+
+    def test_mismatched_quantiles_rejected(self):
+        with pytest.raises(ValueError, match="same days and quantile levels"):
+            merge_summaries([_shard(0, 2), _shard(1, 2, quantiles=(0.5,))])
+
+    def test_empty(self):
+        with pytest.raises(ValueError, match="At least one summary"):
+            merge_summaries([])
+
+
+class TestSerialization:
+    def test_round_trip(self):
+        summary = _shard(1, 3)
+        restored = PathSummary.fromBytes(summary.toBytes())
+        assert restored.getPathRanges() == summary.getPathRanges()
+        assert restored.getQuantileLevels() == summary.getQuantileLevels()
+        np.testing.assert_array_equal(restored.getStats(), summary.getStats())
+        np.testing.assert_array_equal(
+            restored.getMaxDrawdown(), summary.getMaxDrawdown()
+        )
+
+    def test_merge_from_bytes(self):
+        blobs = [_shard(i, 3).toBytes() for i in range(3)]
+        _assert_matches(merge_summaries(blobs), _full())
+
+    def test_pickle(self):
+        summary = _shard(0, 2)
+        restored = pickle.loads(pickle.dumps(summary))
+        np.testing.assert_array_equal(restored.getStats(), summary.getStats())
+
+    def test_corrupt_data_rejected(self):
+        data = _shard(0, 2).toBytes()
+        with pytest.raises(ValueError, match="Corrupt or truncated"):
+            PathSummary.fromBytes(data[:-3])
+        with pytest.raises(ValueError, match="Not a serialized PathSummary"):
+            PathSummary.fromBytes(b"XXXX" + data[4:])
+
+    @pytest.mark.parametrize(
+        "field", ["range_count", "moment_count", "centroid_weight", "compression"]
+    )
+    def test_inconsistent_data_rejected(self, field):
+        summary = _shard(0, 2)
+        data = bytearray(summary.toBytes())
+        num_paths = summary.getNumPaths()
+        levels = len(summary.getQuantileLevels())
+        day0 = 32 + 8 * levels  # first day's moments, after the header
+        if field == "range_count":
+            struct.pack_into("=Q", data, len(data) - 12 * num_paths - 8, 10**9)
+        elif field == "moment_count":
+            struct.pack_into("=Q", data, day0, num_paths + 1)
+        elif field == "centroid_weight":
+            struct.pack_into("=d", data, day0 + 28 + 8, -1.0)
+        else:
+            struct.pack_into("=d", data, 12, 0.0)
+        with pytest.raises(ValueError, match="Corrupt or truncated"):
+            PathSummary.fromBytes(bytes(data))
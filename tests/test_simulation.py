@@ -0,0 +1,316 @@
+from __future__ import annotations
+
+import json
+import math
+
+import numpy as np
+import pytest
+
+from mm_game import (
+    GBM,
+    Drop,
+    Earnings,
+    JumpDiffusion,
+    MeanReversion,
+    Scenario,
+    SpreadModel,
+    iter_paths,
+    simulate_summary,
+    simulate_sweep,
+)
+
+SEED = 42
+NUM_DAYS = 50
+
+
+class TestSimulateSummary:
+    def test_shapes(self):
+        summary = simulate_summary(
+            100.0, 99.0, [(GBM(), range(NUM_DAYS))], num_paths=200, seed=SEED
+        )
+        assert summary.getNumPaths() == 200
+        assert summary.getNumDays() == NUM_DAYS + 1
+        assert summary.getStats().shape == (NUM_DAYS + 1, 7)
+        assert summary.getQuantiles().shape == (NUM_DAYS + 1, 5)
+        assert summary.getMaxDrawdown().shape == (200,)
+        assert summary.getRealizedVolatility().shape == (200,)
+        assert summary.getTerminalReturn().shape == (200,)
+
+    def test_reproducible(self):
+        regimes = [(GBM(), range(NUM_DAYS))]
+        a = simulate_summary(100.0, 99.0, regimes, num_paths=100, seed=SEED)
+        b = simulate_summary(100.0, 99.0, regimes, num_paths=100, seed=SEED)
+        np.testing.assert_array_equal(a.getStats(), b.getStats())
+        np.testing.assert_array_equal(a.getTerminalReturn(), b.getTerminalReturn())
+
+    def test_deterministic_paths(self):
+        """With zero volatility every path is identical."""
+        summary = simulate_summary(
+            100.0,
+            100.0,
+            [(GBM(mu=0.001, sigma=0.0), range(NUM_DAYS))],
+            num_paths=50,
+            seed=SEED,
+        )
+        stats = summary.getStats()
+        assert np.allclose(stats[:, 1], 0.0, atol=1e-9)
+        for col in range(2, stats.shape[1]):
+            np.testing.assert_allclose(stats[:, col], stats[:, 0], rtol=1e-6)
+        assert np.allclose(summary.getMaxDrawdown(), 0.0)
+        expected = math.exp(0.001 * NUM_DAYS) - 1.0
+        np.testing.assert_allclose(summary.getTerminalReturn(), expected, rtol=1e-3)
+
+    def test_quantiles_ordered_and_bracket_mean(self):
+        summary = simulate_summary(
+            100.0,
+            100.0,
+            [(GBM(mu=0.0, sigma=0.02), range(NUM_DAYS))],
+            num_paths=5000,
+            seed=SEED,
+        )
+        q = summary.getQuantiles()
+        assert np.all(np.diff(q[1:], axis=1) > 0)
+        mean = summary.getMean()
+        assert np.all(q[1:, 0] < mean[1:])
+        assert np.all(q[1:, -1] > mean[1:])
+        # Median of a driftless GBM stays close to the start price
+        assert abs(q[-1, 2] - 100.0) < 2.0
+
+    def test_drawdown_of_falling_market(self):
+        summary = simulate_summary(
+            100.0,
+            99.0,
+            [(Drop(rate=0.02), range(NUM_DAYS))],
+            num_paths=20,
+            seed=SEED,
+        )
+        assert np.all(summary.getMaxDrawdown() > 0.3)
+        assert np.all(summary.getTerminalReturn() < 0)
+
+    def test_accepts_scenario(self):
+        spec = {"regimes": [{"regime": "GBM", "days": [0, NUM_DAYS]}]}
+        scenario = Scenario.fromJson(json.dumps(spec))
+        a = simulate_summary(100.0, 99.0, scenario, num_paths=20, seed=SEED)
+        b = simulate_summary(
+            100.0, 99.0, [(GBM(), range(NUM_DAYS))], num_paths=20, seed=SEED
+        )
+        np.testing.assert_array_equal(a.getStats(), b.getStats())
+
+    def test_invalid_arguments_raise(self):
+        regimes = [(GBM(), range(NUM_DAYS))]
+        with pytest.raises(ValueError, match="num_paths must be positive"):
+            simulate_summary(100.0, 99.0, regimes, num_paths=0)
+        with pytest.raises(ValueError, match="Quantile levels must be in"):
+            simulate_summary(100.0, 99.0, regimes, num_paths=10, quantiles=[1.5])
+
+
+class TestSimulateSweep:
+    def test_shape(self):
+        out = simulate_sweep(
+            100.0,
+            99.0,
+            [(GBM(), range(NUM_DAYS))],
+            [{"sigma": 0.01}, {"sigma": 0.03}],
+            num_paths=20,
+            seed=SEED,
+        )
+        assert out.shape == (2, 20, NUM_DAYS + 1)
+        assert out.dtype == np.float32
+        assert np.allclose(out[:, :, 0], 99.5)
+
+    def test_grid_dict_is_cartesian_product(self):
+        regimes = [(GBM(), range(NUM_DAYS))]
+        grid = {"mu": [0.0, 0.001], "sigma": [0.01, 0.02, 0.03]}
+        out = simulate_sweep(100.0, 99.0, regimes, grid, num_paths=10, seed=SEED)
+        assert out.shape[0] == 6
+        single = simulate_sweep(
+            100.0,
+            99.0,
+            regimes,
+            [{"mu": 0.001, "sigma": 0.01}],
+            num_paths=10,
+            seed=SEED,
+        )
+        np.testing.assert_array_equal(out[3], single[0])
+
+    def test_common_random_numbers(self):
+        """Variants replay the same stream, so a no-op override is identical."""
+        out = simulate_sweep(
+            100.0,
+            99.0,
+            [(GBM(), range(NUM_DAYS))],
+            [{}, {"sigma": 0.02}, {"sigma": 0.04}],
+            num_paths=50,
+            seed=SEED,
+        )
+        np.testing.assert_array_equal(out[0], out[1])
+        # Same shocks scaled up: log returns keep their sign and grow
+        r1 = np.log(out[1, :, -1] / out[1, :, 0])
+        r2 = np.log(out[2, :, -1] / out[2, :, 0])
+        assert np.corrcoef(r1, r2)[0, 1] > 0.95
+        assert r2.std() > r1.std()
+
+    def test_jump_intensity_keeps_streams_aligned(self):
+        out = simulate_sweep(
+            100.0,
+            99.0,
+            [(JumpDiffusion(), range(200))],
+            [{"jump_intensity": 0.30}, {"jump_intensity": 0.31}],
+            num_paths=50,
+            seed=SEED,
+        )
+        returns = np.diff(np.log(out), axis=2)
+        late = np.corrcoef(returns[0, :, -50:].ravel(), returns[1, :, -50:].ravel())[
+            0, 1
+        ]
+        assert late > 0.95
+
+    def test_jump_sizes_drawn_only_on_jumps(self):
+        """The recording variant takes the same draws as a standalone run."""
+        regimes = [(JumpDiffusion(jump_intensity=0.3), range(NUM_DAYS))]
+        out = simulate_sweep(
+            100.0, 99.0, regimes, [{}, {"jump_intensity": 0.3}], num_paths=8, seed=SEED
+        )
+        paths = np.concatenate(
+            list(iter_paths(100.0, 99.0, regimes, num_paths=8, seed=SEED))
+        )
+        np.testing.assert_array_equal(out[0], paths)
+        np.testing.assert_array_equal(out[1], paths)
+
+    def test_variants_independent_of_grid(self):
+        regimes = [(MeanReversion(), range(NUM_DAYS))]
+        a = simulate_sweep(
+            100.0, 99.0, regimes, [{"theta": 0.2}], num_paths=10, seed=SEED
+        )
+        b = simulate_sweep(
+            100.0,
+            99.0,
+            regimes,
+            [{"theta": 0.5}, {"theta": 0.2}],
+            num_paths=10,
+            seed=SEED,
+        )
+        np.testing.assert_array_equal(a[0], b[1])
+
+    def test_override_applies_to_matching_regimes_only(self):
+        regimes = [(GBM(), range(20)), (Drop(), range(20, NUM_DAYS))]
+        out = simulate_sweep(
+            100.0,
+            99.0,
+            regimes,
+            [{"rate": 0.0}, {"rate": 0.05}],
+            num_paths=5,
+            seed=SEED,
+        )
+        np.testing.assert_array_equal(out[0, :, :21], out[1, :, :21])
+        assert np.all(out[1, :, -1] < out[0, :, -1])
+
+    def test_invalid_arguments_raise(self):
+        regimes = [(GBM(), range(NUM_DAYS))]
+        with pytest.raises(ValueError, match="has parameter theta"):
+            simulate_sweep(100.0, 99.0, regimes, [{"theta": 0.1}], num_paths=5)
+        with pytest.raises(ValueError, match="At least one variant"):
+            simulate_sweep(100.0, 99.0, regimes, [], num_paths=5)
+        with pytest.raises(ValueError, match="num_paths must be positive"):
+            simulate_sweep(100.0, 99.0, regimes, [{}], num_paths=0)
+
+    def test_integer_override_must_be_integral(self):
+        regimes = [(Earnings(), range(NUM_DAYS))]
+        with pytest.raises(ValueError, match=r"num_days.*must be an integer"):
+            simulate_sweep(100.0, 99.0, regimes, [{"num_days": 10.5}], num_paths=2)
+        out = simulate_sweep(100.0, 99.0, regimes, [{"num_days": 10.0}], num_paths=2)
+        assert out.shape == (1, 2, NUM_DAYS + 1)
+
+
+class TestSamplingModes:
+    # Zero spread volatility makes the mid a pure GBM path
+    REGIMES = ((GBM(mu=0.0005, sigma=0.02), range(NUM_DAYS)),)
+    SPREAD = SpreadModel(volatility=0.0)
+
+    def _summary(self, sampling, seed=SEED, num_paths=256):
+        return simulate_summary(
+            100.0,
+            100.0,
+            self.REGIMES,
+            num_paths=num_paths,
+            seed=seed,
+            spread=self.SPREAD,
+            sampling=sampling,
+        )
+
+    @pytest.mark.parametrize("sampling", ["pseudo", "antithetic", "sobol"])
+    def test_reproducible(self, sampling):
+        a = self._summary(sampling)
+        b = self._summary(sampling)
+        np.testing.assert_array_equal(a.getStats(), b.getStats())
+        c = self._summary(sampling, seed=SEED + 1)
+        assert not np.array_equal(a.getTerminalReturn(), c.getTerminalReturn())
+
+    def test_pseudo_is_default(self):
+        a = simulate_summary(100.0, 99.0, self.REGIMES, num_paths=20, seed=SEED)
+        b = simulate_summary(
+            100.0, 99.0, self.REGIMES, num_paths=20, seed=SEED, sampling="pseudo"
+        )
+        np.testing.assert_array_equal(a.getStats(), b.getStats())
+
+    def test_antithetic_pairs_mirror_shocks(self):
+        summary = self._summary("antithetic", num_paths=20)
+        log_returns = np.log1p(summary.getTerminalReturn())
+        drift = (0.0005 - 0.5 * 0.02**2) * NUM_DAYS
+        pair_sums = log_returns[0::2] + log_returns[1::2]
+        np.testing.assert_allclose(pair_sums, 2 * drift, atol=1e-4)
+        assert not np.allclose(log_returns[0::2], drift, atol=1e-3)
+
+    @pytest.mark.parametrize("sampling", ["antithetic", "sobol"])
+    def test_reduces_error_of_mean(self, sampling):
+        expected = 100.0 * math.exp(0.0005 * NUM_DAYS)
+
+        def rmse(mode):
+            errors = [
+                self._summary(mode, seed=s).getMean()[-1] - expected for s in range(12)
+            ]
+            return math.sqrt(np.mean(np.square(errors)))
+
+        assert rmse(sampling) < 0.7 * rmse("pseudo")
+
+    def test_sobol_table_limit(self):
+        """Two normals per day: 555 days fit the table, 556 do not."""
+        summary = simulate_summary(
+            100.0,
+            99.0,
+            [(GBM(), range(555))],
+            num_paths=8,
+            seed=SEED,
+            sampling="sobol",
+        )
+        assert np.all(np.isfinite(summary.getStats()))
+        with pytest.raises(ValueError, match="sobol"):
+            simulate_summary(
+                100.0,
+                99.0,
+                [(GBM(), range(556))],
+                num_paths=8,
+                seed=SEED,
+                sampling="sobol",
+            )
+
+    def test_sweep_accepts_sampling(self):
+        out = simulate_sweep(
+            100.0,
+            100.0,
+            self.REGIMES,
+            [{}],
+            num_paths=4,
+            seed=SEED,
+            spread=self.SPREAD,
+            sampling="antithetic",
+        )
+        log_returns = np.log(out[0, :, -1] / out[0, :, 0])
+        drift = (0.0005 - 0.5 * 0.02**2) * NUM_DAYS
+        np.testing.assert_allclose(
+            log_returns[0::2] + log_returns[1::2], 2 * drift, atol=1e-4
+        )
+
+    def test_unknown_mode_raises(self):
+        with pytest.raises(ValueError, match="Unknown sampling mode: halton"):
+            simulate_summary(100.0, 99.0, self.REGIMES, num_paths=4, sampling="halton")